@@ -1,11 +1,11 @@
-import json
 from typing import Dict
 from app.config.azure_config import AzureAIConfig
 
 class BrandEnforcer:
     def __init__(self, azure_config: AzureAIConfig):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("brand_enforcer")
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("brand_enforcer")
         self.brand_voice = self._load_prompt("prompts/ing_brand_voice.txt")
         self.enforcement_prompt = self._load_prompt("prompts/brand_enforcer.txt")
     
@@ -26,11 +26,10 @@ class BrandEnforcer:
             validation_criteria="tone, language, product positioning, customer focus"
         )
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        return await self.llm.complete_json(
+            "brand_enforcer",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
             max_tokens=800
-        )
-        
-        return json.loads(response.choices[0].message.content)
\ No newline at end of file
+        )
\ No newline at end of file
@@ -2,13 +2,13 @@
 """
 Analyzes competitor content gaps for strategic opportunities
 """
-import json
 from typing import List, Dict
 
 class CompetitiveGapAnalyzer:
     def __init__(self, azure_config):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("competitive_analyzer")
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("competitive_analyzer")
     
     async def find_opportunities(self, extracted_intents: List[Dict], tracked_keywords: List[str]) -> List[Dict]:
         """Identify competitive content gaps"""
@@ -16,7 +16,7 @@ class CompetitiveGapAnalyzer:
         prompt = f"""
         Analyze competitive gaps for ING Bank content strategy:
         
-        EXTRACTED INTENTS: {json.dumps(extracted_intents, indent=2)}
+        EXTRACTED INTENTS: {self.llm.payloads.build("competitive_analyzer", extracted_intents, model=self.model)}
         TRACKED KEYWORDS: {', '.join(tracked_keywords)}
         
         Identify opportunities where:
@@ -25,14 +25,14 @@ class CompetitiveGapAnalyzer:
         3. Complex financial topics needing expert explanation
         4. ING has unique product/service advantages
         
-        Return JSON array of opportunities with gap analysis.
+        Return JSON array of opportunities, each with: potential_headline, urgency_score (0-100),
+        target_keywords (list), recommended_angle, competitor_weakness, traffic_potential.
         """
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        return await self.llm.complete_json(
+            "competitive_analyzer",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.4,
             max_tokens=1500
-        )
-        
-        return json.loads(response.choices[0].message.content)
\ No newline at end of file
+        )
\ No newline at end of file
@@ -2,14 +2,15 @@
 # agents/content_evaluator.py - AI Overview Inclusion Predictor
 # ================================
 
-import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.config.azure_config import AzureAIConfig
+from app.utils.prompt_payload import PAYLOAD_FIELDS
 
 class ContentEvaluator:
     def __init__(self, azure_config: AzureAIConfig):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("content_evaluator") 
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("content_evaluator")
         self.prompt_template = self._load_prompt("prompts/content_evaluator.txt")
     
     def _load_prompt(self, filepath: str) -> str:
@@ -20,36 +21,49 @@ class ContentEvaluator:
         except FileNotFoundError:
             return f"Default prompt for {filepath}"
     
-    async def evaluate_content(self, keywords: List[str], competitor_snippets: List[Dict]) -> Dict:
+    async def evaluate_content(self, keywords: List[str], competitor_snippets: List[Dict],
+                               ing_content: Optional[List[Dict]] = None) -> Dict:
         """Evaluate ING content vs AI Overview winners"""
         
-        # Get current ING content for keywords
-        ing_content = await self._get_ing_content_for_keywords(keywords)
+        # ING's pages as the SERP currently shows them (citations and organic snippets)
+        ing_content = ing_content or []
         
         prompt = self.prompt_template.format(
             target_keywords=", ".join(keywords),
-            ing_current_content=json.dumps(ing_content, indent=2),
-            competitor_snippets=json.dumps(competitor_snippets, indent=2),
+            ing_current_content=self.llm.payloads.build(
+                "content_evaluator", ing_content, budget_share=0.4, model=self.model
+            ),
+            competitor_snippets=self.llm.payloads.build(
+                "content_evaluator", competitor_snippets, PAYLOAD_FIELDS["competitor_snippets"],
+                budget_share=0.6, model=self.model
+            ),
             evaluation_criteria="AI Overview inclusion factors"
         )
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        return await self.llm.complete_json(
+            "content_evaluator",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
             max_tokens=1800
         )
-        
-        return json.loads(response.choices[0].message.content)
     
     async def predict_inclusion_probability(self, content: Dict, competitors: List[Dict], keywords: List[str]) -> Dict:
         """Predict AI Overview inclusion probability using LLM reasoning"""
         
+        content_payload = self.llm.payloads.build(
+            "content_evaluator", content, budget_share=0.5, model=self.model
+        )
+        competitors_payload = self.llm.payloads.build(
+            "content_evaluator", competitors, PAYLOAD_FIELDS["competitor_snippets"],
+            budget_share=0.5, model=self.model
+        )
+        
         prediction_prompt = f"""
         Analyze this optimized content for AI Overview inclusion probability:
         
-        CONTENT: {json.dumps(content, indent=2)}
-        COMPETITORS: {json.dumps(competitors, indent=2)}
+        CONTENT: {content_payload}
+        COMPETITORS: {competitors_payload}
         TARGET KEYWORDS: {', '.join(keywords)}
         
         Provide:
@@ -57,15 +71,18 @@ class ContentEvaluator:
         2. Specific strengths vs competitors
         3. Remaining weaknesses to address
         4. Confidence level in prediction
+        5. Per target keyword: its own inclusion probability and confidence level
         
-        Return structured JSON response.
+        Return structured JSON with overall_inclusion_probability, confidence_level, strengths,
+        weaknesses and a "keywords" object mapping each target keyword to
+        {{"inclusion_probability": 0-100, "confidence_level": ...}}.
         """
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        return await self.llm.complete_json(
+            "content_evaluator",
+            schema="inclusion_prediction",
+            model=self.model,
             messages=[{"role": "user", "content": prediction_prompt}],
             temperature=0.1,  # Low temperature for consistent predictions
             max_tokens=1200
-        )
-        
-        return json.loads(response.choices[0].message.content)
\ No newline at end of file
+        )
\ No newline at end of file
@@ -1,11 +1,12 @@
-import json
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 from app.config.azure_config import AzureAIConfig
+from app.utils.prompt_payload import PAYLOAD_FIELDS
 
 class ContentOptimizer:
     def __init__(self, azure_config: AzureAIConfig):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("content_optimizer")
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("content_optimizer")
         self.prompt_template = self._load_prompt("prompts/content_optimizer.txt")
         self.brand_voice = self._load_prompt("prompts/ing_brand_voice.txt")
     
@@ -22,30 +23,66 @@ class ContentOptimizer:
         
         prompt = self.prompt_template.format(
             optimization_type="targeted",
-            current_content=json.dumps(content_analysis, indent=2),
-            competitor_analysis=json.dumps(competitor_snippets, indent=2),
+            current_content=self.llm.payloads.build(
+                "content_optimizer", content_analysis, budget_share=0.5, model=self.model
+            ),
+            competitor_analysis=self.llm.payloads.build(
+                "content_optimizer", competitor_snippets, PAYLOAD_FIELDS["competitor_snippets"],
+                budget_share=0.5, model=self.model
+            ),
             brand_guidelines=self.brand_voice,
             optimization_goal="Improve AI Overview inclusion while maintaining ING brand voice"
         )
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o",  # Use full model for content generation
+        return await self.llm.complete_json(
+            "content_optimizer",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.5,
             max_tokens=2500
         )
-        
-        return json.loads(response.choices[0].message.content)
     
+    async def stream_article(self, brief: Dict) -> AsyncIterator[str]:
+        """Write a full article for a content brief, yielding text as it is generated"""
+
+        prompt = f"""
+        Write an ING Bank article for this content brief:
+
+        BRIEF: {self.llm.payloads.build("content_optimizer", brief, model=self.model)}
+
+        BRAND VOICE: {self.brand_voice}
+
+        Write in Markdown: a title line, a short introduction, sections with headings that
+        each answer one search sub-intent, and a conclusion with a natural ING call to action.
+        Return only the article text.
+        """
+
+        async for token in self.llm.stream(
+            "content_optimizer",
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.6,
+            max_tokens=3000
+        ):
+            yield token
+
     async def comprehensive_rewrite(self, keywords: List[str], competitor_snippets: List[Dict], analysis: Dict) -> Dict:
         """Comprehensive content rewrite for major optimization"""
         
+        competitor_payload = self.llm.payloads.build(
+            "content_optimizer", competitor_snippets, PAYLOAD_FIELDS["competitor_snippets"],
+            budget_share=0.5, model=self.model
+        )
+        analysis_payload = self.llm.payloads.build(
+            "content_optimizer", analysis, budget_share=0.5, model=self.model
+        )
+        
         prompt = f"""
         Comprehensive content rewrite for ING Bank:
         
         TARGET KEYWORDS: {', '.join(keywords)}
-        COMPETITOR ANALYSIS: {json.dumps(competitor_snippets, indent=2)}
-        CURRENT CONTENT GAPS: {json.dumps(analysis, indent=2)}
+        COMPETITOR ANALYSIS: {competitor_payload}
+        CURRENT CONTENT GAPS: {analysis_payload}
         
         BRAND VOICE: {self.brand_voice}
         
@@ -58,11 +95,11 @@ class ContentOptimizer:
         Return complete optimized content with metadata.
         """
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o",
+        return await self.llm.complete_json(
+            "content_optimizer",
+            schema="content_rewrite",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.6,
             max_tokens=3000
-        )
-        
-        return json.loads(response.choices[0].message.content)
\ No newline at end of file
+        )
\ No newline at end of file
@@ -2,15 +2,16 @@
 # agents/intent_extractor.py - Search Intent Analysis Agent
 # ================================
 
-import json
 from datetime import datetime
 from typing import List, Dict
 from app.config.azure_config import AzureAIConfig
+from app.utils.prompt_payload import PAYLOAD_FIELDS
 
 class IntentExtractor:
     def __init__(self, azure_config: AzureAIConfig):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("intent_extractor")
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("intent_extractor")
         self.prompt_template = self._load_prompt("prompts/intent_extractor.txt")
     
     def _load_prompt(self, filepath: str) -> str:
@@ -25,17 +26,18 @@ class IntentExtractor:
         """Extract search intents from relevant news articles"""
         
         prompt = self.prompt_template.format(
-            news_articles=json.dumps(relevant_news, indent=2),
+            news_articles=self.llm.payloads.build(
+                "intent_extractor", relevant_news, PAYLOAD_FIELDS["relevant_news"], model=self.model
+            ),
             current_date=datetime.now().strftime("%Y-%m-%d"),
             market_context="Dutch banking market"
         )
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        result = await self.llm.complete_json(
+            "intent_extractor",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.4,
             max_tokens=1200
         )
-        
-        result = json.loads(response.choices[0].message.content)
         return result.get("extracted_intents", [])
\ No newline at end of file
@@ -2,15 +2,23 @@
 # agents/news_scanner.py - News Relevance Analysis Agent
 # ================================
 
-import json
+import asyncio
 from datetime import datetime
 from typing import List, Dict
 from ..config.azure_config import AzureAIConfig
+from ..utils.prompt_payload import PAYLOAD_FIELDS, compact_json, project
+from ..utils.token_counter import count_tokens
 
 class NewsScanner:
+    # Completion tokens reserved per article in a batch, plus fixed overhead
+    OUTPUT_TOKENS_PER_ARTICLE = 120
+    OUTPUT_TOKENS_BASE = 200
+    
     def __init__(self, azure_config: AzureAIConfig):
         self.azure_config = azure_config
-        self.client = azure_config.get_client("news_scanner")
+        self.settings = azure_config.settings
+        self.llm = azure_config.get_gateway()
+        self.model = azure_config.get_model_for_agent("news_scanner")
         self.prompt_template = self._load_prompt("prompts/news_scanner.txt")
         self.brand_voice = self._load_prompt("prompts/ing_brand_voice.txt")
     
@@ -23,22 +31,60 @@ class NewsScanner:
             return self._get_fallback_prompt(filepath)
     
     async def analyze_relevance(self, rss_articles: List[Dict], tracked_keywords: List[str]) -> List[Dict]:
-        """Analyze RSS articles for ING content relevance"""
+        """Analyze RSS articles for ING content relevance in concurrently scored batches"""
+        batches = self._split_into_batches(rss_articles)
+        
+        # Batches run concurrently; the LLM gateway caps how many are in flight
+        results = await asyncio.gather(
+            *(self._score_batch(batch, tracked_keywords) for batch in batches),
+            return_exceptions=True
+        )
         
+        scored = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"Relevance scoring failed for batch of {len(batch)} articles: {result}")
+                continue
+            scored.extend(result)
+        
+        threshold = self.settings.news_relevance_threshold
+        relevant = [a for a in scored if (a.get("relevance_score") or 0) >= threshold]
+        return sorted(relevant, key=lambda a: a.get("relevance_score") or 0, reverse=True)
+    
+    def _split_into_batches(self, rss_articles: List[Dict]) -> List[List[Dict]]:
+        """Greedily pack articles into batches that fit the per-batch token budget"""
+        budget = self.settings.news_batch_token_budget
+        max_articles = self.settings.news_batch_max_articles
+        projected = project(rss_articles, PAYLOAD_FIELDS["rss_articles"])
+        
+        batches, current, current_tokens = [], [], 0
+        for article, item in zip(rss_articles, projected):
+            tokens = count_tokens(compact_json(item), self.model)
+            if current and (current_tokens + tokens > budget or len(current) >= max_articles):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(article)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _score_batch(self, batch: List[Dict], tracked_keywords: List[str]) -> List[Dict]:
+        """Score one batch of articles with a single LLM call"""
         prompt = self.prompt_template.format(
-            rss_articles=json.dumps(rss_articles, indent=2),
+            rss_articles=self.llm.payloads.build(
+                "news_scanner", batch, PAYLOAD_FIELDS["rss_articles"], model=self.model
+            ),
             tracked_keywords=", ".join(tracked_keywords),
             ing_brand_voice=self.brand_voice,
             analysis_timestamp=datetime.now().isoformat()
         )
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
+        # Articles are kept as they stream in, so a truncated answer still scores most of the batch
+        return [article async for article in self.llm.stream_json(
+            "news_scanner",
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
-            max_tokens=1500
-        )
-        
-        # Parse JSON response
-        result = json.loads(response.choices[0].message.content)
-        return result.get("relevant_articles", [])
\ No newline at end of file
+            max_tokens=self.OUTPUT_TOKENS_BASE + self.OUTPUT_TOKENS_PER_ARTICLE * len(batch)
+        )]
\ No newline at end of file
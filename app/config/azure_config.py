@@ -3,34 +3,87 @@
 # config/azure_config.py - Azure AI Foundry Configuration
 # ================================
 
-import os
+import httpx
+from typing import Dict, Optional, Tuple
 from openai import AsyncAzureOpenAI
+from app.config.settings import DashboardSettings
+
+try:
+    import h2  # noqa: F401 - httpx only negotiates HTTP/2 when h2 is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 class AzureAIConfig:
     """Azure AI Foundry configuration for LLM agents"""
-    
-    def __init__(self):
-        self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        self.api_version = "2024-02-01"
-        
-        # Model assignments for different agents
+
+    # Process-wide clients keyed by (endpoint, api_version), shared by every agent
+    _clients: Dict[Tuple[str, str], AsyncAzureOpenAI] = {}
+    _gateway = None
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.endpoint = self.settings.azure_openai_endpoint
+        self.api_key = self.settings.azure_openai_api_key
+        self.api_version = self.settings.azure_openai_api_version
+
+        # Deployment assignments for different agents
+        mini = self.settings.azure_openai_mini_deployment
+        full = self.settings.azure_openai_full_deployment
         self.agent_models = {
-            "news_scanner": "gpt-4o-mini",
-            "intent_extractor": "gpt-4o-mini",
-            "content_evaluator": "gpt-4o-mini", 
-            "content_optimizer": "gpt-4o",
-            "brand_enforcer": "gpt-4o-mini"
+            "news_scanner": mini,
+            "intent_extractor": mini,
+            "competitive_analyzer": mini,
+            "content_evaluator": mini,
+            "content_optimizer": full,
+            "brand_enforcer": mini
         }
-    
+
     def get_client(self, agent_name: str) -> AsyncAzureOpenAI:
-        """Get Azure OpenAI client for specific agent"""
-        return AsyncAzureOpenAI(
-            azure_endpoint=self.endpoint,
-            api_key=self.api_key,
-            api_version=self.api_version
+        """Get the shared Azure OpenAI client; agents differ only by deployment"""
+        key = (self.endpoint, self.api_version)
+        client = AzureAIConfig._clients.get(key)
+        if client is None:
+            client = AsyncAzureOpenAI(
+                azure_endpoint=self.endpoint,
+                api_key=self.api_key,
+                api_version=self.api_version,
+                http_client=self._create_http_client(),
+                max_retries=0  # retries go through LLMGateway so they respect the rate limiter
+            )
+            AzureAIConfig._clients[key] = client
+        return client
+
+    def get_gateway(self):
+        """Get the process-wide LLM gateway that rate-limits all agent calls"""
+        if AzureAIConfig._gateway is None:
+            from app.services.llm_gateway import LLMGateway
+            AzureAIConfig._gateway = LLMGateway(self)
+        return AzureAIConfig._gateway
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive transport, using HTTP/2 when available"""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.settings.azure_max_connections,
+                max_keepalive_connections=self.settings.azure_max_keepalive_connections,
+                keepalive_expiry=self.settings.azure_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.settings.azure_request_timeout, connect=10.0),
+            http2=self.settings.azure_enable_http2 and HTTP2_AVAILABLE
         )
-    
+
+    @classmethod
+    async def close_clients(cls):
+        """Close all shared clients, their connection pools and the gateway"""
+        if cls._gateway is not None:
+            await cls._gateway.close()
+            cls._gateway = None
+        clients = list(cls._clients.values())
+        cls._clients.clear()
+        for client in clients:
+            await client.close()
+
     def get_model_for_agent(self, agent_name: str) -> str:
-        """Get appropriate model for agent"""
-        return self.agent_models.get(agent_name, "gpt-4o-mini")
\ No newline at end of file
+        """Get appropriate deployment for agent"""
+        return self.agent_models.get(agent_name, self.settings.azure_openai_mini_deployment)
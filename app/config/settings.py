@@ -3,6 +3,7 @@
 # ================================
 
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class DashboardSettings(BaseSettings):
@@ -12,25 +13,155 @@ class DashboardSettings(BaseSettings):
     azure_openai_endpoint: str = ""
     azure_openai_api_key: str = ""
     azure_openai_api_version: str = "2024-02-01"
+    azure_openai_mini_deployment: str = "gpt-4o-mini"
+    azure_openai_full_deployment: str = "gpt-4o"
+    azure_max_connections: int = 50
+    azure_max_keepalive_connections: int = 20
+    azure_keepalive_expiry: float = 30.0  # seconds
+    azure_request_timeout: float = 120.0  # seconds
+    azure_enable_http2: bool = True
+    
+    # LLM Rate Limiting (per deployment)
+    # Keyed by "full"/"mini" (the deployments configured above) or by a deployment name
+    llm_requests_per_minute: Dict[str, int] = {"full": 60, "mini": 300}
+    llm_tokens_per_minute: Dict[str, int] = {"full": 60000, "mini": 200000}
+    llm_default_requests_per_minute: int = 60
+    llm_default_tokens_per_minute: int = 60000
+    llm_max_concurrent_requests: int = 8
+    llm_max_retries: int = 4
+    llm_backoff_base: float = 1.0  # seconds
+    llm_backoff_max: float = 30.0  # seconds
+    llm_json_mode_deployments: List[str] = ["gpt-4o", "gpt-4o-mini"]  # support response_format
+    llm_json_max_reasks: int = 1  # cheap repair calls before a malformed output fails the node
+    
+    # LLM Response Cache
+    llm_cache_backend: str = "memory"  # "memory" or "sqlite" (uses database_url)
+    llm_cache_max_entries: int = 2000
+    llm_cache_max_temperature: float = 0.2
+    llm_cache_ttls: Dict[str, int] = {  # seconds; agents not listed are never cached
+        "content_evaluator": 3600,
+        "brand_enforcer": 86400
+    }
+    
+    # Prompt Payloads
+    prompt_max_field_chars: int = 600
+    prompt_savings_stats: bool = False  # tokenize raw inputs to report compaction savings in /api/cache-stats
+    prompt_token_budgets: Dict[str, int] = {  # tokens per serialized prompt input
+        "news_scanner": 6000,
+        "intent_extractor": 4000,
+        "competitive_analyzer": 3000,
+        "content_evaluator": 4000,
+        "content_optimizer": 5000
+    }
     
     # SerpBear Configuration
     serpbear_base_url: str = ""
     serpbear_api_key: str = ""
+    serpbear_domain: str = ""  # domain whose keywords are read; empty lets SerpBear return all
+    serpbear_request_timeout: float = 5.0  # seconds for the whole request
+    serpbear_connect_timeout: float = 2.0  # seconds
+    serpbear_connection_pool_size: int = 10
+    serpbear_cache_ttl: int = 300  # seconds the keyword list is fresh
+    serpbear_stale_ttl: int = 3600  # seconds a stale list is served while refreshing
     
     # RSS Configuration
     rss_fetch_interval: int = 90  # seconds
-    rss_max_articles_per_source: int = 5
+    rss_max_articles_per_source: int = 20
+    rss_max_articles: int = 200  # articles per fetch cycle across all sources
+    rss_max_concurrent_fetches: int = 4
+    rss_request_timeout: int = 10  # seconds per feed
+    rss_fetch_deadline: int = 15  # seconds for the whole fetch cycle
+    rss_connection_pool_size: int = 20
+    rss_keepalive_timeout: int = 60  # seconds
+    rss_seen_index_size: int = 5000  # entry IDs remembered across polls
     
     # LangGraph Configuration
     max_workflow_timeout: int = 300  # seconds
     enable_workflow_logging: bool = True
+    news_result_cache_ttl: int = 300  # seconds an identical news analysis is reused
+    news_opportunity_max_age: int = 21600  # seconds an opportunity is carried into later snapshots
+    news_batch_token_budget: int = 3000  # prompt tokens of articles per scoring call
+    news_batch_max_articles: int = 25
+    news_relevance_threshold: int = 60  # minimum relevance_score passed to intent extraction
+    news_prefilter_min_score: float = 1.0  # local BM25 score needed to reach the LLM
+    news_prefilter_max_candidates: int = 60
+    news_prefilter_min_candidates: int = 5  # top matches forwarded even below the minimum score
+    news_prefilter_background_docs: int = 200  # IDF smoothing so one dominant story keeps its weight
+    news_prefilter_phrase_weight: float = 2.0
+    news_cluster_similarity: float = 0.5  # estimated Jaccard to merge into a story
+    news_cluster_num_perm: int = 64
+    news_cluster_bands: int = 16
+    news_cluster_max_clusters: int = 5000
+    news_cluster_max_members: int = 200  # entry IDs and URLs kept per story
+    news_cluster_entry_index_size: int = 50000  # entry IDs remembered across polls, overflow included
+    geo_keyword_concurrency: int = 4  # keywords scraped/analyzed in parallel per GEO run
+    geo_priority_keywords: int = 10  # top-ranked keywords optimized per GEO run
+    geo_result_store_path: str = "./ing_geo_results.json"
+    geo_result_max_age: int = 604800  # seconds an unchanged keyword's result is reused
+    geo_content_version: str = "1"  # bump after an ING site release to re-optimize every keyword
+    
+    # Keyword Prioritization
+    keyword_rank_weights: Dict[str, float] = {
+        "position_decline": 0.3,
+        "volume": 0.3,
+        "top3_distance": 0.25,
+        "ai_overview": 0.15
+    }
+    keyword_rank_trend_days: int = 7  # history entries back for the position delta
+    keyword_rank_decline_scale: float = 10.0  # positions lost that count as a full decline
+    keyword_rank_striking_distance: int = 20  # worst position still worth pushing into the top 3
+    keyword_rank_unranked_position: int = 101  # position assumed when SerpBear reports none
+    
+    # SERP Acquisition
+    serp_provider: str = "search_page"  # see SERP_PROVIDERS in services/serp_service.py
+    serp_search_url: str = "https://www.google.com/search"
+    serp_proxy_url: str = ""  # scraping API endpoint for the scraping_proxy provider
+    serp_proxy_api_key: str = ""
+    serp_language: str = "nl"
+    serp_country: str = "nl"
+    serp_user_agent: str = "Mozilla/5.0 (compatible; ING-Content-Dashboard/1.0)"
+    serp_concurrency: int = 4  # results pages downloaded at once
+    serp_host_rate: float = 0.5  # requests per second per host
+    serp_host_burst: int = 2
+    serp_max_retries: int = 2  # retries after 429/503, honouring Retry-After
+    serp_request_timeout: float = 15.0
+    serp_connect_timeout: float = 5.0
+    serp_connection_pool_size: int = 10
+    serp_cache_dir: str = "./serp_cache"
+    serp_cache_ttl: int = 21600  # seconds a fetched results page is reused
+    serp_parsed_cache_size: int = 500
+    serp_snippet_max_chars: int = 300
     
     # Dashboard Configuration
     dashboard_refresh_interval: int = 60  # seconds
+    geo_refresh_interval: int = 300  # seconds
+    competitive_alerts_interval: int = 600  # seconds
+    job_workers: int = 2  # concurrent user-triggered workflow jobs
+    job_history_size: int = 200
+    job_poll_interval: int = 2  # seconds between status polls from the UI
+    scheduler_jitter_ratio: float = 0.1  # +/- fraction of each interval
+    enable_background_scheduler: bool = True
     enable_real_time_alerts: bool = True
     
-    # Database Configuration (if using persistent storage)
-    database_url: str = "sqlite:///./ing_dashboard.db"
+    # Database Configuration
+    database_url: str = "sqlite:///./ing_dashboard.db"  # async driver is selected automatically
+    storage_batch_size: int = 200
+    storage_flush_interval: float = 0.5  # seconds the writer waits to fill a batch
+    storage_write_queue_size: int = 10000
+    metrics_window_hours: int = 24
+    ai_overview_win_probability: float = 85.0
+    enable_workflow_checkpoints: bool = True
+    checkpoint_db_path: str = "./ing_workflow_checkpoints.db"
+    checkpoint_resume_window: int = 3600  # seconds an interrupted run stays resumable
+    
+    # Ranking History and Competitor Alerts
+    ranking_store_path: str = "./ing_rankings.log"
+    ranking_retention_days: int = 180
+    ranking_downsample_after_days: int = 14  # older changes keep one point per day
+    ranking_compaction_interval: int = 86400  # seconds between log rewrites
+    ranking_alert_min_position_change: int = 3  # smaller moves are stored but not alerted
+    ranking_alert_history: int = 50  # alerts kept for the dashboard
+    ranking_own_domains: List[str] = ["ing.nl", "ing.com"]
     
     class Config:
         env_file = ".env"
\ No newline at end of file
@@ -5,6 +5,7 @@ import json
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
+from urllib.parse import urlencode
 import aiohttp
 import feedparser
 from dataclasses import dataclass
@@ -16,26 +17,156 @@ from app.workflows.content_generation import ContentGenerationWorkflow
 from app.services.rss_service import RSSService
 from app.services.serpbear_service import SerpBearService
 from app.services.content_service import ContentService
+from app.services.workflow_scheduler import WorkflowScheduler
+from app.services.story_clusterer import StoryClusterer
+from app.services.storage_service import StorageService
+from app.services.checkpoint_store import CheckpointStore
+from app.services.ranking_store import RankingStore
+from app.services.geo_result_store import GEOResultStore
+from app.services.serp_service import SerpService
+from app.services.job_queue import JobQueue
 from app.ui.dashboard import create_ing_dashboard
 from app.ui.components import *
 from app.config.azure_config import AzureAIConfig
+from app.config.settings import DashboardSettings
+from app.utils.metrics import METRICS
+
+# ================================
+# Service Lifecycle
+# ================================
+
+async def startup_services():
+    """Open long-lived connection pools and start background workflows"""
+    await rss_service.start()
+    await serpbear_service.start()
+    await serp_service.start()
+    await storage_service.start()
+    await ranking_store.start()
+    await geo_result_store.start()
+    await job_queue.start()
+    if settings.enable_workflow_checkpoints:
+        await checkpoint_store.start()
+        geo_workflow.enable_checkpointing(checkpoint_store)
+        content_workflow.enable_checkpointing(checkpoint_store)
+    if settings.enable_background_scheduler:
+        await workflow_scheduler.start()
+
+async def shutdown_services():
+    """Stop background workflows and release pooled connections"""
+    await workflow_scheduler.stop()
+    await job_queue.stop()
+    await rss_service.close()
+    await serpbear_service.close()
+    await serp_service.close()
+    await storage_service.close()
+    await checkpoint_store.close()
+    await AzureAIConfig.close_clients()
 
 # FastHTML app with MonsterUI theme
 app, rt = fast_app(
-    hdrs=Theme.orange.headers(daisy=True, highlightjs=True),
-    static_dir="static"
+    hdrs=(*Theme.orange.headers(daisy=True, highlightjs=True),
+          Script(src="https://cdn.jsdelivr.net/npm/htmx-ext-sse@2.2.2/sse.js")),
+    static_dir="static",
+    on_startup=[startup_services],
+    on_shutdown=[shutdown_services]
 )
 
 # Global services
-rss_service = RSSService()
-serpbear_service = SerpBearService()
+settings = DashboardSettings()
+rss_service = RSSService(settings)
+serpbear_service = SerpBearService(settings)
+serp_service = SerpService(settings)
 content_service = ContentService()
-azure_config = AzureAIConfig()
+story_clusterer = StoryClusterer(settings)
+storage_service = StorageService(settings)
+checkpoint_store = CheckpointStore(settings)
+ranking_store = RankingStore(settings)
+geo_result_store = GEOResultStore(settings)
+job_queue = JobQueue(settings)
+azure_config = AzureAIConfig(settings)
 
 # Workflow instances
-news_workflow = NewsIntelligenceWorkflow(azure_config)
-geo_workflow = GEOOptimizationWorkflow(azure_config)  
-content_workflow = ContentGenerationWorkflow(azure_config)
+news_workflow = NewsIntelligenceWorkflow(azure_config, settings)
+geo_workflow = GEOOptimizationWorkflow(azure_config, settings, serp_service)
+geo_workflow.enable_change_tracking(ranking_store)
+geo_workflow.enable_result_reuse(geo_result_store)
+content_workflow = ContentGenerationWorkflow(azure_config, settings)
+
+# ================================
+# Scheduled Workflow Runs
+# ================================
+
+async def run_news_intelligence() -> Dict:
+    """Fetch feeds and analyze only new entries, merged with the previous snapshot's opportunities"""
+    started_at = datetime.now()
+    rss_articles = await rss_service.fetch_all_feeds()
+    new_articles = rss_service.unseen_articles(rss_articles)
+
+    previous = workflow_scheduler.get_snapshot("news_intelligence")
+    if not new_articles and previous is not None:
+        return previous.result
+
+    # Analyze each new story once, however many feeds carried it
+    stories = story_clusterer.cluster(new_articles)
+    tracked_keywords = await serpbear_service.get_tracked_keywords()
+    result = await news_workflow.analyze_news_opportunities({
+        "rss_articles": stories,
+        "tracked_keywords": tracked_keywords,
+        "timestamp": datetime.now().isoformat()
+    })
+    storage_service.record_news_run(result, stories, started_at)
+    if previous is not None:
+        result = news_workflow.merge_results(previous.result, result)
+    # A failed run leaves these unseen, so the next cycle analyzes them again
+    rss_service.mark_seen(article["entry_id"] for article in new_articles)
+    return result
+
+async def ing_content_versions() -> Dict[str, str]:
+    """ING landing page SerpBear tracks per keyword; a new page means new content to evaluate"""
+    return {record["keyword"]: record.get("url") or "" for record in await serpbear_service.get_keyword_data()}
+
+async def run_geo_optimization() -> Dict:
+    """Run GEO optimization for the current priority keywords"""
+    started_at = datetime.now()
+    # Keywords whose last run found an AI Overview rank higher
+    previous = workflow_scheduler.get_snapshot("geo_optimization")
+    ai_overview = {
+        keyword: 1.0 for keyword, overview in (previous.result.get("ai_overview_data") or {}).items() if overview
+    } if previous is not None else None
+    priority_keywords = await serpbear_service.get_priority_keywords(ai_overview=ai_overview)
+    result = await geo_workflow.optimize_for_ai_overview({
+        "target_keywords": priority_keywords,
+        "content_versions": await ing_content_versions(),
+        "timestamp": datetime.now().isoformat()
+    })
+    storage_service.record_geo_run(result, started_at)
+    return result
+
+async def run_competitive_alerts() -> List[Dict]:
+    """Check competitor AI Overview changes"""
+    keyword_records = await serpbear_service.get_keyword_data()
+    return await geo_workflow.monitor_competitor_changes(keyword_records)
+
+async def run_dashboard_metrics() -> Dict:
+    """Collect headline dashboard metrics from the persistent store"""
+    ai_overview_wins, active_optimizations, rss_alerts, content_pipeline = await asyncio.gather(
+        storage_service.count_ai_overview_wins(),
+        storage_service.count_active_optimizations(),
+        storage_service.count_urgent_opportunities(),
+        storage_service.count_pipeline_items()
+    )
+    return {
+        "ai_overview_wins": ai_overview_wins,
+        "active_optimizations": active_optimizations,
+        "rss_alerts": rss_alerts,
+        "content_pipeline": content_pipeline
+    }
+
+workflow_scheduler = WorkflowScheduler(settings)
+workflow_scheduler.register("news_intelligence", run_news_intelligence, settings.rss_fetch_interval)
+workflow_scheduler.register("geo_optimization", run_geo_optimization, settings.geo_refresh_interval)
+workflow_scheduler.register("competitive_alerts", run_competitive_alerts, settings.competitive_alerts_interval)
+workflow_scheduler.register("dashboard_metrics", run_dashboard_metrics, settings.dashboard_refresh_interval)
 
 # ================================
 # Main Dashboard Route
@@ -52,66 +183,61 @@ async def dashboard():
 
 @rt("/api/news-intelligence")
 async def news_intelligence():
-    """Real-time news analysis using LangGraph workflow"""
-    try:
-        # Get fresh RSS data
-        rss_articles = await rss_service.fetch_all_feeds()
-        tracked_keywords = await serpbear_service.get_tracked_keywords()
-        
-        # Run news intelligence workflow
-        result = await news_workflow.analyze_news_opportunities({
-            "rss_articles": rss_articles,
-            "tracked_keywords": tracked_keywords,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Render news intelligence cards
-        return render_news_intel_cards(result)
-        
-    except Exception as e:
-        return Alert(f"News analysis error: {str(e)}", cls=AlertT.error)
+    """Real-time news analysis served from the latest scheduled run"""
+    snapshot = await workflow_scheduler.get_latest("news_intelligence")
+    if snapshot is None:
+        return render_pending_snapshot("News analysis", "/api/news-intelligence",
+                                       workflow_scheduler.get_error("news_intelligence"))
+    return render_news_intel_cards(snapshot.result)
 
 @rt("/api/geo-optimization") 
 async def geo_optimization():
-    """AI Overview optimization pipeline"""
-    try:
-        # Get optimization targets
-        priority_keywords = await serpbear_service.get_priority_keywords()
-        
-        # Run GEO optimization workflow
-        result = await geo_workflow.optimize_for_ai_overview({
-            "target_keywords": priority_keywords,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return render_geo_optimization_cards(result)
-        
-    except Exception as e:
-        return Alert(f"GEO optimization error: {str(e)}", cls=AlertT.error)
+    """AI Overview optimization pipeline served from the latest scheduled run"""
+    snapshot = await workflow_scheduler.get_latest("geo_optimization")
+    if snapshot is None:
+        return render_pending_snapshot("GEO optimization", "/api/geo-optimization",
+                                       workflow_scheduler.get_error("geo_optimization"))
+    return render_geo_optimization_cards(snapshot.result)
 
 @rt("/api/generate-content")
 async def generate_content(opportunity_id: str):
-    """Generate optimized content from opportunity"""
-    try:
-        # Run content generation workflow
-        result = await content_workflow.generate_optimized_article({
-            "opportunity_id": opportunity_id,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return render_generated_content(result)
-        
-    except Exception as e:
-        return Alert(f"Content generation error: {str(e)}", cls=AlertT.error)
+    """Start streaming content generation for an opportunity into the workspace"""
+    return render_content_stream("/api/content-stream?" + urlencode({"opportunity_id": opportunity_id}))
+
+@rt("/api/content-stream")
+async def content_stream(opportunity_id: str = "", headline: str = ""):
+    """Server-Sent Events for one content generation run: progress, tokens, final article"""
+    input_state = {
+        "opportunity_id": opportunity_id or f"news:{headline}",
+        "news_headline": headline,
+        "generation_type": "news_response" if headline else "opportunity",
+        "timestamp": datetime.now().isoformat()
+    }
+    
+    async def events():
+        started_at = datetime.now()
+        async for event, data in content_workflow.stream_article(input_state):
+            if event == "token":
+                yield sse_message(Span(data), "token")
+            elif event == "progress":
+                yield sse_message(render_stream_progress(data), "progress")
+            elif event == "error":
+                # Terminal like done: the client must not reconnect and rerun the generation
+                yield sse_message(render_stream_progress(data, error=True), "done")
+            elif event == "done":
+                storage_service.record_generated_article(data, started_at)
+                yield sse_message(render_generated_content(data), "done")
+    
+    return EventStream(events())
 
 @rt("/api/competitive-alerts")
 async def competitive_alerts():
-    """Real-time competitor AI Overview monitoring"""
-    try:
-        alerts = await geo_workflow.monitor_competitor_changes()
-        return render_competitive_alerts(alerts)
-    except Exception as e:
-        return Alert(f"Monitoring error: {str(e)}", cls=AlertT.error)
+    """Competitor AI Overview monitoring served from the latest scheduled run"""
+    snapshot = await workflow_scheduler.get_latest("competitive_alerts")
+    if snapshot is None:
+        return render_pending_snapshot("Competitor monitoring", "/api/competitive-alerts",
+                                       workflow_scheduler.get_error("competitive_alerts"))
+    return render_competitive_alerts(snapshot.result)
     
 # ================================
 # Enhanced API Routes and Workflow Triggers
@@ -146,53 +272,80 @@ async def content_pipeline():
     except Exception as e:
         return Alert(f"Pipeline error: {str(e)}", cls=AlertT.error)
 
+async def run_keyword_optimization(keyword: str) -> Dict:
+    """GEO optimization for one keyword, persisted like scheduled runs"""
+    started_at = datetime.now()
+    result = await geo_workflow.optimize_single_keyword({
+        "keyword": keyword,
+        "content_versions": await ing_content_versions(),
+        "timestamp": started_at.isoformat()
+    })
+    storage_service.record_geo_run(result, started_at)
+    return result
+
 @rt("/api/trigger-geo-optimization", methods=["POST"])
 async def trigger_geo_optimization(keyword: str):
-    """Trigger immediate GEO optimization for specific keyword"""
-    try:
-        # Run GEO workflow for specific keyword
-        result = await geo_workflow.optimize_single_keyword({
-            "keyword": keyword,
-            "priority": "urgent",
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return Alert(f"🚀 GEO optimization started for '{keyword}'", cls=AlertT.success)
-        
-    except Exception as e:
-        return Alert(f"Optimization failed: {str(e)}", cls=AlertT.error)
+    """Queue GEO optimization for a keyword and return a polling status card"""
+    job = job_queue.submit(
+        "geo_optimization",
+        lambda: run_keyword_optimization(keyword),
+        dedupe_key=f"geo:{keyword.strip().lower()}",
+        expected_steps=5  # scrape, competitors, evaluate, optimize, predict
+    )
+    return render_job_status(job, settings.job_poll_interval)
+
+@rt("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Current state of a queued workflow job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return Alert("Job not found or expired", cls=AlertT.warning)
+    return render_job_status(job, settings.job_poll_interval)
 
 @rt("/api/generate-from-news", methods=["POST"]) 
 async def generate_from_news(headline: str):
-    """Generate content from news opportunity"""
-    try:
-        # Trigger content generation workflow
-        result = await content_workflow.generate_from_news_trigger({
-            "news_headline": headline,
-            "generation_type": "news_response",
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return render_content_generation_status(result)
-        
-    except Exception as e:
-        return Alert(f"Generation failed: {str(e)}", cls=AlertT.error)
+    """Start streaming content generation from a news headline into the workspace"""
+    return render_content_stream("/api/content-stream?" + urlencode({"headline": headline}))
 
 @rt("/api/dashboard-metrics")
 async def dashboard_metrics():
     """Real-time dashboard metrics"""
-    try:
-        metrics = {
-            "ai_overview_wins": await geo_workflow.count_ai_overview_wins(),
-            "active_optimizations": await geo_workflow.count_active_optimizations(),
-            "rss_alerts": await news_workflow.count_urgent_opportunities(),
-            "content_pipeline": await content_workflow.count_pipeline_items()
-        }
-        
-        return json.dumps(metrics)
-        
-    except Exception as e:
-        return json.dumps({"error": str(e)})
+    snapshot = await workflow_scheduler.get_latest("dashboard_metrics")
+    if snapshot is None:
+        return json.dumps({"error": workflow_scheduler.get_error("dashboard_metrics") or "metrics not ready"})
+    return json.dumps(snapshot.result)
+
+@rt("/metrics")
+async def metrics():
+    """Workflow node and LLM call instrumentation in Prometheus text format"""
+    return Response(METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@rt("/api/latency-panel")
+async def latency_panel():
+    """Slowest workflow nodes and agent calls by p95"""
+    return render_latency_panel(
+        METRICS.summarize("workflow_node_duration_seconds"),
+        METRICS.summarize("llm_request_duration_seconds")
+    )
+
+@rt("/api/cache-stats")
+async def cache_stats():
+    """Cache counters, LLM queue depth and prompt token savings"""
+    return json.dumps({
+        "news_intelligence": news_workflow.result_cache.get_stats(),
+        "news_prefilter": news_workflow.prefilter.get_stats(),
+        "serpbear_keywords": serpbear_service.get_stats(),
+        "serp_pages": serp_service.get_stats(),
+        "story_clusters": story_clusterer.get_stats(),
+        "storage_writes": storage_service.get_stats(),
+        "workflow_checkpoints": checkpoint_store.get_stats(),
+        "ranking_history": ranking_store.get_stats(),
+        "geo_results": geo_result_store.get_stats(),
+        "jobs": job_queue.get_stats(),
+        "llm_rate_limiter": azure_config.get_gateway().rate_limiter.get_stats(),
+        "llm_responses": azure_config.get_gateway().response_cache.get_stats(),
+        "prompt_payloads": azure_config.get_gateway().payloads.get_stats()
+    })
 
 # ================================
 # Server Startup and Configuration
@@ -0,0 +1,93 @@
+# ================================
+# models/agent_schemas.py - Expected JSON Output per Agent Call
+# ================================
+
+from typing import Dict
+
+# JSON Schema subset understood by utils.json_parser.validate_json. Only fields the
+# workflows read are required so harmless prompt drift does not trigger a re-ask.
+SCORE = {"type": "number", "minimum": 0, "maximum": 100}
+
+AGENT_SCHEMAS: Dict[str, Dict] = {
+    "news_scanner": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": ["headline", "relevance_score"],
+            "properties": {
+                "headline": {"type": "string"},
+                "relevance_score": SCORE,
+                "seo_opportunity": SCORE,
+                "urgency_level": {"type": "string"},
+                "target_keywords": {"type": "array", "items": {"type": "string"}}
+            }
+        }
+    },
+    "intent_extractor": {
+        "type": "object",
+        "required": ["extracted_intents"],
+        "properties": {
+            "extracted_intents": {"type": "array", "items": {"type": "object"}}
+        }
+    },
+    "competitive_analyzer": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": [
+                "potential_headline", "urgency_score", "target_keywords",
+                "recommended_angle", "competitor_weakness", "traffic_potential"
+            ],
+            "properties": {
+                "potential_headline": {"type": "string"},
+                "urgency_score": SCORE,
+                "target_keywords": {"type": "array", "items": {"type": "string"}},
+                "recommended_angle": {"type": "string"},
+                "competitor_weakness": {"type": "string"},
+                "traffic_potential": {"type": ["string", "number"]}
+            }
+        }
+    },
+    "content_evaluator": {
+        "type": "object",
+        "required": ["overall_inclusion_probability"],
+        "properties": {
+            "overall_inclusion_probability": SCORE,
+            "strengths": {"type": "array"},
+            "weaknesses": {"type": "array"},
+            "optimization_recommendations": {"type": "array"},
+            "confidence_level": SCORE
+        }
+    },
+    "inclusion_prediction": {
+        "type": "object",
+        "required": ["overall_inclusion_probability", "confidence_level"],
+        "properties": {
+            "overall_inclusion_probability": SCORE,
+            "confidence_level": {"type": ["string", "number"]},
+            "keywords": {"type": "object"}
+        }
+    },
+    "content_optimizer": {
+        "type": "object",
+        "required": ["optimized_content"],
+        "properties": {
+            "optimized_content": {"type": "object"},
+            "optimization_notes": {"type": "object"},
+            "expected_improvements": {"type": "object"}
+        }
+    },
+    "content_rewrite": {
+        "type": "object"
+    },
+    "brand_enforcer": {
+        "type": "object",
+        "required": ["brand_compliance_score", "approved_for_publication"],
+        "properties": {
+            "brand_compliance_score": SCORE,
+            "approved_for_publication": {"type": "boolean"},
+            "compliance_issues": {"type": "array"},
+            "revision_notes": {"type": "string"}
+        }
+    }
+}
@@ -0,0 +1,86 @@
+# ================================
+# models/storage_models.py - Persistent Storage Tables
+# ================================
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+class Base(DeclarativeBase):
+    pass
+
+class WorkflowRun(Base):
+    """One execution of a scheduled or on-demand workflow"""
+    __tablename__ = "workflow_runs"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    workflow: Mapped[str] = mapped_column(String(64), index=True)
+    status: Mapped[str] = mapped_column(String(16))
+    started_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    duration: Mapped[float] = mapped_column(Float, default=0.0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+class Article(Base):
+    """RSS article as fetched, keyed by its feed entry ID"""
+    __tablename__ = "articles"
+
+    entry_id: Mapped[str] = mapped_column(String(512), primary_key=True)
+    headline: Mapped[str] = mapped_column(Text)
+    summary: Mapped[str] = mapped_column(Text, default="")
+    url: Mapped[str] = mapped_column(Text, default="")
+    source: Mapped[str] = mapped_column(String(64), index=True)
+    published_date: Mapped[str] = mapped_column(String(64), default="")
+    cluster_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+class Opportunity(Base):
+    """Content opportunity produced by the news intelligence workflow"""
+    __tablename__ = "opportunities"
+    __table_args__ = (Index("ix_opportunities_urgency_created", "urgency_level", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(ForeignKey("workflow_runs.id"), index=True)
+    headline: Mapped[str] = mapped_column(Text)
+    priority: Mapped[float] = mapped_column(Float, default=0.0)
+    urgency_level: Mapped[str] = mapped_column(String(16))
+    keywords: Mapped[list] = mapped_column(JSON, default=list)
+    content_angle: Mapped[str] = mapped_column(Text, default="")
+    estimated_traffic: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+class GEORun(Base):
+    """GEO optimization outcome for one keyword"""
+    __tablename__ = "geo_runs"
+    __table_args__ = (Index("ix_geo_runs_keyword_created", "keyword", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(ForeignKey("workflow_runs.id"), index=True)
+    keyword: Mapped[str] = mapped_column(String(256))
+    optimization_strategy: Mapped[str] = mapped_column(String(32), index=True)
+    average_inclusion_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+class InclusionPrediction(Base):
+    """Predicted AI Overview inclusion probability for a keyword"""
+    __tablename__ = "inclusion_predictions"
+    __table_args__ = (Index("ix_inclusion_predictions_keyword_created", "keyword", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(ForeignKey("workflow_runs.id"), index=True)
+    keyword: Mapped[str] = mapped_column(String(256))
+    probability: Mapped[float] = mapped_column(Float, index=True)
+    confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+class GeneratedArticle(Base):
+    """Article produced by the content generation workflow"""
+    __tablename__ = "generated_articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(ForeignKey("workflow_runs.id"), index=True)
+    opportunity_id: Mapped[Optional[str]] = mapped_column(String(128), nullable=True, index=True)
+    title: Mapped[str] = mapped_column(Text, default="")
+    status: Mapped[str] = mapped_column(String(32), index=True)
+    content: Mapped[dict] = mapped_column(JSON, default=dict)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
@@ -9,6 +9,7 @@ class NewsIntelState(TypedDict):
     """State for news intelligence workflow"""
     rss_articles: List[Dict[str, Any]]
     tracked_keywords: List[str]
+    candidate_articles: List[Dict[str, Any]]
     relevant_news: List[Dict[str, Any]]
     extracted_intents: List[Dict[str, Any]]
     content_opportunities: List[Dict[str, Any]]
@@ -21,11 +22,18 @@ class GEOState(TypedDict):
     """State for GEO optimization workflow"""
     target_keywords: List[str]
     ai_overview_data: Dict[str, Any]
+    ing_serp_results: Dict[str, List[Dict[str, Any]]]
     competitor_snippets: List[Dict[str, Any]]
     ing_content_analysis: Dict[str, Any]
     optimization_strategy: str
     optimized_content: Dict[str, Any]
     inclusion_predictions: Dict[str, Any]
+    failed_keywords: List[str]
+    content_versions: Dict[str, str]
+    keyword_fingerprints: Dict[str, str]
+    changed_keywords: List[str]
+    skipped_keywords: List[str]
+    optimization_results: List[Dict[str, Any]]
     timestamp: str
     workflow_id: str
 
@@ -0,0 +1,78 @@
+# ================================
+# services/geo_result_store.py - Last GEO Result per Keyword Fingerprint
+# ================================
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+from app.config.settings import DashboardSettings
+
+class GEOResultStore:
+    """Last GEO outcome per keyword, keyed by a fingerprint of that keyword's inputs
+
+    A run whose AI Overview, competitor snippets and ING content version hash to the
+    stored fingerprint reuses the stored outcome instead of re-optimizing.
+    """
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.path = self.settings.geo_result_store_path
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0}
+
+    async def start(self):
+        """Load results written by previous processes"""
+        await asyncio.to_thread(self._load)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"GEO result store load failed: {e}")
+
+    def lookup(self, keyword: str, key: str) -> Optional[Dict]:
+        """Stored outcome for `keyword` if its inputs still hash to `key`"""
+        entry = self.entries.get(keyword)
+        if entry is None or entry["fingerprint"] != key:
+            self.stats["misses"] += 1
+            return None
+        if time.time() - entry["stored_at"] > self.settings.geo_result_max_age:
+            # Re-evaluate now and then even when nothing changed, so predictions cannot drift forever
+            self.stats["expired"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry["result"]
+
+    def store(self, results: Dict[str, Dict], fingerprints: Dict[str, str]):
+        """Remember fresh per-keyword outcomes under their input fingerprints"""
+        now = time.time()
+        for keyword, result in results.items():
+            if keyword in fingerprints:
+                self.entries[keyword] = {"fingerprint": fingerprints[keyword], "stored_at": now, "result": result}
+                self.stats["stored"] += 1
+        self._save()
+
+    def _save(self):
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump(self.entries, f, separators=(",", ":"), default=str)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"GEO result store save failed: {e}")
+
+    def invalidate(self, keyword: Optional[str] = None):
+        """Forget one keyword (or all) so the next run re-optimizes it"""
+        if keyword is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(keyword, None)
+        self._save()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "keywords": len(self.entries)}
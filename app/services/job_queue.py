@@ -0,0 +1,173 @@
+# ================================
+# services/job_queue.py - In-Process Job Queue for User-Triggered Workflows
+# ================================
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config.settings import DashboardSettings
+from app.utils.rate_limiter import Priority, llm_priority
+from app.utils.workflow_events import workflow_events
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    dedupe_key: str
+    priority: Priority
+    run: Callable[[], Awaitable[Any]]
+    expected_steps: int = 1
+    status: str = QUEUED
+    steps_done: int = 0
+    message: str = "Waiting for a worker"
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of expected steps completed (0-1)"""
+        if self.status == SUCCEEDED:
+            return 1.0
+        return min(self.steps_done / max(self.expected_steps, 1), 0.99)
+
+    def emit(self, event: str, data: Any):
+        """Workflow event sink: each progress event marks one step done"""
+        if event == "progress":
+            self.steps_done += 1
+            self.message = str(data)
+
+class JobQueue:
+    """Bounded worker pool running prioritized, deduplicated workflow jobs"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self._queue: "asyncio.PriorityQueue" = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, str] = {}  # dedupe key -> job ID while queued or running
+        self._workers = []
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    async def start(self):
+        """Start the worker pool"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.settings.job_workers)
+        ]
+
+    async def stop(self):
+        """Cancel workers; jobs still queued are dropped"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, run: Callable[[], Awaitable[Any]], dedupe_key: Optional[str] = None,
+               priority: Priority = Priority.INTERACTIVE, expected_steps: int = 1) -> Job:
+        """Enqueue a job, or return the pending one with the same dedupe key"""
+        dedupe_key = dedupe_key or uuid.uuid4().hex
+        existing = self._active.get(dedupe_key)
+        if existing is not None:
+            self._kind_stats(kind)["deduplicated"] += 1
+            return self._jobs[existing]
+
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, dedupe_key=dedupe_key, priority=priority,
+                  run=run, expected_steps=expected_steps)
+        self._jobs[job.id] = job
+        self._active[dedupe_key] = job.id
+        self._queue.put_nowait((int(priority), next(self._sequence), job.id))
+        self._kind_stats(kind)["submitted"] += 1
+        self._trim_history()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is not None:
+                    await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Job):
+        stats = self._kind_stats(job.kind)
+        job.status = RUNNING
+        job.message = "Started"
+        job.started_at = time.time()
+        stats["wait_seconds_total"] += job.started_at - job.created_at
+        stats["wait_seconds_max"] = max(stats["wait_seconds_max"], job.started_at - job.created_at)
+
+        try:
+            # Workflow nodes report progress through the event context the job provides
+            with workflow_events(job), llm_priority(job.priority):
+                job.result = await asyncio.wait_for(job.run(), timeout=self.settings.max_workflow_timeout)
+            job.status = SUCCEEDED
+            job.message = "Completed"
+            stats["succeeded"] += 1
+        except asyncio.TimeoutError:
+            job.status = FAILED
+            job.error = f"timed out after {self.settings.max_workflow_timeout}s"
+            stats["failed"] += 1
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            stats["failed"] += 1
+            print(f"Job {job.kind} {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            stats["run_seconds_total"] += job.finished_at - job.started_at
+            stats["run_seconds_max"] = max(stats["run_seconds_max"], job.finished_at - job.started_at)
+            self._active.pop(job.dedupe_key, None)
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond the history limit"""
+        excess = len(self._jobs) - self.settings.job_history_size
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _kind_stats(self, kind: str) -> Dict[str, float]:
+        return self.stats.setdefault(kind, {
+            "submitted": 0, "deduplicated": 0, "succeeded": 0, "failed": 0,
+            "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0, "run_seconds_max": 0.0
+        })
+
+    def get_stats(self) -> Dict:
+        """Queue depth plus per-kind counts and wait/run times"""
+        running = sum(1 for job in self._jobs.values() if job.status == RUNNING)
+        by_kind = {}
+        for kind, stats in self.stats.items():
+            started = stats["succeeded"] + stats["failed"]
+            by_kind[kind] = {
+                **{name: round(value, 3) for name, value in stats.items()},
+                "wait_seconds_avg": round(stats["wait_seconds_total"] / started, 3) if started else 0.0,
+                "run_seconds_avg": round(stats["run_seconds_total"] / started, 3) if started else 0.0
+            }
+        return {
+            "queue_depth": self._queue.qsize(),
+            "running": running,
+            "workers": len(self._workers),
+            "jobs": by_kind
+        }
@@ -0,0 +1,95 @@
+# ================================
+# services/keyword_ranker.py - Vectorized Keyword Prioritization
+# ================================
+
+import math
+from itertools import islice
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.config.settings import DashboardSettings
+
+class KeywordRanker:
+    """Scores a SerpBear keyword portfolio in one columnar pass and picks GEO targets"""
+
+    COMPONENTS = ["position_decline", "volume", "top3_distance", "ai_overview"]
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+
+    def build_table(self, records: List[Dict], ai_overview: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Columnar view of SerpBear records; position 0 (not in top 100) becomes NaN"""
+        trend = self.settings.keyword_rank_trend_days
+        overview = ai_overview or {}
+        table = pd.DataFrame({
+            "keyword": [r["keyword"] for r in records],
+            "position": np.array([r.get("position") or math.nan for r in records], dtype=np.float64),
+            "previous_position": np.array(
+                [self._previous_position(r.get("history"), trend) for r in records], dtype=np.float64
+            ),
+            "volume": np.array([r.get("volume") or 0 for r in records], dtype=np.float64),
+            "url": [r.get("url") or "" for r in records],
+            "ai_overview": np.array(
+                [overview.get(r["keyword"], r.get("ai_overview") or 0.0) for r in records], dtype=np.float64
+            )
+        })
+        table.loc[table["position"] <= 0, "position"] = math.nan
+        table.loc[table["previous_position"] <= 0, "previous_position"] = math.nan
+        return table
+
+    @staticmethod
+    def _previous_position(history: Optional[Dict], trend: int) -> float:
+        """Position `trend` history entries back; SerpBear stores history oldest first"""
+        if not history:
+            return math.nan
+        return next(islice(reversed(history.values()), trend, None), math.nan) or math.nan
+
+    def score(self, table: pd.DataFrame) -> pd.DataFrame:
+        """Add each normalized component (0-1) and the weighted priority score (0-100)"""
+        position = table["position"].to_numpy()
+        previous = table["previous_position"].to_numpy()
+        unranked = np.isnan(position)
+        unranked_position = self.settings.keyword_rank_unranked_position
+
+        # Positions lost over the trend window; dropping out of the top 100 counts as the full drop
+        current = np.where(unranked, unranked_position, position)
+        decline = np.nan_to_num(current - previous, nan=0.0)
+        table["position_decline"] = np.clip(decline / self.settings.keyword_rank_decline_scale, 0.0, 1.0)
+
+        volume = table["volume"].to_numpy()
+        max_volume = volume.max() if volume.size else 0.0
+        table["volume_score"] = np.log1p(volume) / np.log1p(max_volume) if max_volume > 0 else 0.0
+
+        # Just outside the top 3 scores highest, fading to zero at the striking distance
+        striking = self.settings.keyword_rank_striking_distance
+        distance = np.where(unranked | (position <= 3), np.inf, position - 4)
+        table["top3_distance"] = np.clip(1.0 - distance / max(striking - 4, 1), 0.0, 1.0)
+
+        table["ai_overview_score"] = np.clip(table["ai_overview"].to_numpy(), 0.0, 1.0)
+
+        weights = self.settings.keyword_rank_weights
+        columns = {
+            "position_decline": "position_decline",
+            "volume": "volume_score",
+            "top3_distance": "top3_distance",
+            "ai_overview": "ai_overview_score"
+        }
+        total_weight = sum(max(weights.get(name, 0.0), 0.0) for name in self.COMPONENTS) or 1.0
+        score = np.zeros(len(table))
+        for name in self.COMPONENTS:
+            weight = max(weights.get(name, 0.0), 0.0)
+            if weight:
+                score += weight * table[columns[name]].to_numpy()
+        table["priority_score"] = np.round(score / total_weight * 100, 2)
+        return table
+
+    def rank(self, records: List[Dict], top_n: int, ai_overview: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Top `top_n` keywords by priority score"""
+        if not records:
+            return pd.DataFrame(columns=["keyword", "priority_score"])
+        table = self.score(self.build_table(records, ai_overview))
+        return table.nlargest(top_n, "priority_score", keep="first")
+
+    def top_keywords(self, records: List[Dict], top_n: int,
+                     ai_overview: Optional[Dict[str, float]] = None) -> List[str]:
+        return self.rank(records, top_n, ai_overview)["keyword"].tolist()
@@ -0,0 +1,313 @@
+# ================================
+# services/llm_gateway.py - Shared Entry Point for Agent LLM Calls
+# ================================
+
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from openai import RateLimitError
+from app.models.agent_schemas import AGENT_SCHEMAS
+from app.utils.json_parser import JSONStreamScanner, extract_json_from_response, validate_json
+from app.utils.llm_cache import LLMResponseCache, llm_cache_key
+from app.utils.metrics import METRICS
+from app.utils.prompt_payload import PromptPayloadBuilder
+from app.utils.rate_limiter import LLMRateLimiter, Priority
+from app.utils.token_counter import count_message_tokens
+
+class StructuredOutputError(ValueError):
+    """An agent response that is still malformed after local repair and re-asking"""
+
+    def __init__(self, agent_name: str, errors: List[str]):
+        super().__init__(f"{agent_name} returned invalid JSON: {'; '.join(errors[:3])}")
+        self.agent_name = agent_name
+        self.errors = errors
+
+class LLMGateway:
+    """Routes every agent chat completion through the shared client and rate limiter"""
+
+    def __init__(self, azure_config):
+        self.azure_config = azure_config
+        self.settings = azure_config.settings
+        self.rate_limiter = LLMRateLimiter(self.settings)
+        self.response_cache = LLMResponseCache(self.settings)
+        self.payloads = PromptPayloadBuilder(self.settings)
+
+    async def complete(self, agent_name: str, messages: List[Dict], temperature: float, max_tokens: int,
+                       model: Optional[str] = None, priority: Optional[Priority] = None,
+                       accept: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+        """Run a chat completion under the deployment's RPM/TPM budget and return its text
+
+        Responses rejected by `accept` are returned but never cached.
+        """
+        deployment = model or self.azure_config.get_model_for_agent(agent_name)
+        started = time.perf_counter()
+
+        cache_key, cache_status = None, "bypass"
+        if self.response_cache.is_cacheable(agent_name, temperature):
+            cache_key = llm_cache_key(deployment, messages, temperature, max_tokens, kwargs)
+            cached = await self.response_cache.get(agent_name, cache_key)
+            if cached is not None:
+                self._record_metrics(agent_name, deployment, started, "hit")
+                return cached
+            cache_status = "miss"
+
+        client = self.azure_config.get_client(agent_name)
+
+        # Azure charges max_tokens against the TPM quota up front, so budget for it too
+        estimated_tokens = count_message_tokens(messages, deployment) + max_tokens
+        extra_headers = self._agent_headers(agent_name, kwargs)
+        queue_wait = 0.0
+
+        for attempt in range(self.settings.llm_max_retries + 1):
+            async with self.rate_limiter.acquire(deployment, estimated_tokens, priority) as waited:
+                queue_wait += waited
+                try:
+                    response = await client.chat.completions.create(
+                        model=deployment,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        extra_headers=extra_headers,
+                        **kwargs
+                    )
+                except RateLimitError as e:
+                    if attempt == self.settings.llm_max_retries:
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                    # Block the whole deployment, not just this caller, until Azure allows more
+                    self.rate_limiter.penalize(deployment, delay)
+                    print(f"Azure rate limit for {agent_name} ({deployment}), retrying in {delay:.1f}s")
+                    continue
+
+            content = response.choices[0].message.content
+            total_tokens = response.usage.total_tokens if response.usage is not None else estimated_tokens
+            self.rate_limiter.record_usage(deployment, estimated_tokens, total_tokens)
+            self._record_metrics(agent_name, deployment, started, cache_status, queue_wait, response.usage)
+            if cache_key is not None and (accept is None or accept(content)):
+                await self.response_cache.set(agent_name, cache_key, content, total_tokens)
+            return content
+
+    async def complete_json(self, agent_name: str, messages: List[Dict], temperature: float, max_tokens: int,
+                            schema: Optional[str] = None, model: Optional[str] = None,
+                            priority: Optional[Priority] = None, **kwargs) -> Any:
+        """Chat completion parsed and validated against the agent's schema
+
+        Uses Azure JSON mode where the deployment supports it. Output that still fails is
+        repaired locally, then re-asked with only the broken text and the validation
+        errors, so a bad answer costs one small call instead of a workflow re-run.
+        """
+        schema_name = schema or agent_name
+        schema_def = AGENT_SCHEMAS.get(schema_name, {})
+        deployment = model or self.azure_config.get_model_for_agent(agent_name)
+        response_format = self._response_format(deployment, schema_name, schema_def, messages)
+        if response_format is not None:
+            kwargs.setdefault("response_format", response_format)
+
+        def accept(text: str) -> bool:
+            return not self._parse_structured(text, schema_def)[1]
+
+        text = await self.complete(agent_name, messages, temperature, max_tokens, model=deployment,
+                                   priority=priority, accept=accept, **kwargs)
+        value, errors = self._parse_structured(text, schema_def)
+
+        outcome = "valid"
+        for _ in range(self.settings.llm_json_max_reasks if errors else 0):
+            print(f"Re-asking {agent_name} for valid JSON: {'; '.join(errors[:3])}")
+            outcome = "reasked"
+            text = await self.complete(agent_name, self._repair_messages(text, errors, schema_def), 0.0,
+                                       max_tokens, model=deployment, priority=priority, accept=accept, **kwargs)
+            value, errors = self._parse_structured(text, schema_def)
+            if not errors:
+                break
+
+        if errors:
+            outcome = "failed"
+        if self.settings.enable_workflow_logging:
+            METRICS.inc("llm_structured_outputs_total", labels={"agent": agent_name, "outcome": outcome})
+        if errors:
+            raise StructuredOutputError(agent_name, errors)
+        return value
+
+    async def stream_json(self, agent_name: str, messages: List[Dict], temperature: float, max_tokens: int,
+                          schema: Optional[str] = None, model: Optional[str] = None,
+                          priority: Optional[Priority] = None, **kwargs) -> AsyncIterator[Dict]:
+        """Stream a JSON array answer, yielding each valid item as soon as it closes
+
+        Items that completed before a truncated or malformed tail are kept; invalid items
+        are dropped rather than failing the whole answer.
+        """
+        schema_def = AGENT_SCHEMAS.get(schema or agent_name, {})
+        item_schema = schema_def.get("items", {})
+        scanner = JSONStreamScanner(emit_array_items=True)
+        yielded = dropped = 0
+
+        def valid_items(raw_values: List[str], unwrap: bool) -> List[Dict]:
+            nonlocal dropped
+            valid = []
+            for raw in raw_values:
+                try:
+                    value = json.loads(raw)
+                except json.JSONDecodeError:
+                    dropped += 1
+                    continue
+                for item in (self._array_items(value) if unwrap else [value]):
+                    if validate_json(item, item_schema):
+                        dropped += 1
+                    else:
+                        valid.append(item)
+            return valid
+
+        async for token in self.stream(agent_name, messages, temperature, max_tokens, model=model,
+                                       priority=priority, **kwargs):
+            values = scanner.feed(token)
+            for item in valid_items(scanner.take_items(), False) + valid_items(values, True):
+                yielded += 1
+                yield item
+
+        if not yielded and not dropped:
+            # Nothing closed cleanly, e.g. a single truncated object; try repairing the whole text
+            repaired = extract_json_from_response(scanner.buffer)
+            for item in valid_items([json.dumps(repaired)] if repaired is not None else [], True):
+                yielded += 1
+                yield item
+
+        if self.settings.enable_workflow_logging:
+            outcome = "valid" if not dropped else ("partial" if yielded else "failed")
+            METRICS.inc("llm_structured_outputs_total", labels={"agent": agent_name, "outcome": outcome})
+        if dropped:
+            print(f"Dropped {dropped} malformed items from {agent_name} stream")
+
+    async def stream(self, agent_name: str, messages: List[Dict], temperature: float, max_tokens: int,
+                     model: Optional[str] = None, priority: Optional[Priority] = None,
+                     **kwargs) -> AsyncIterator[str]:
+        """Stream completion text deltas under the same budget as `complete`"""
+        deployment = model or self.azure_config.get_model_for_agent(agent_name)
+        client = self.azure_config.get_client(agent_name)
+        estimated_tokens = count_message_tokens(messages, deployment) + max_tokens
+        extra_headers = self._agent_headers(agent_name, kwargs)
+        started = time.perf_counter()
+        queue_wait = 0.0
+
+        for attempt in range(self.settings.llm_max_retries + 1):
+            # The budget slot is held until the stream ends, like a regular call
+            async with self.rate_limiter.acquire(deployment, estimated_tokens, priority) as waited:
+                queue_wait += waited
+                try:
+                    response = await client.chat.completions.create(
+                        model=deployment,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        extra_headers=extra_headers,
+                        **kwargs
+                    )
+                except RateLimitError as e:
+                    # Only the initial request can be retried; nothing has been yielded yet
+                    if attempt == self.settings.llm_max_retries:
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                    self.rate_limiter.penalize(deployment, delay)
+                    print(f"Azure rate limit for {agent_name} ({deployment}), retrying in {delay:.1f}s")
+                    continue
+
+                total_tokens, usage, first_token = estimated_tokens, None, True
+                async for chunk in response:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                        total_tokens = usage.total_tokens
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if first_token and self.settings.enable_workflow_logging:
+                            METRICS.observe("llm_time_to_first_token_seconds", time.perf_counter() - started,
+                                            {"agent": agent_name, "deployment": deployment})
+                        first_token = False
+                        yield chunk.choices[0].delta.content
+
+            self.rate_limiter.record_usage(deployment, estimated_tokens, total_tokens)
+            self._record_metrics(agent_name, deployment, started, "bypass", queue_wait, usage)
+            return
+
+    @staticmethod
+    def _agent_headers(agent_name: str, kwargs: Dict) -> Dict[str, str]:
+        """Tag requests with the calling agent for request logs and the offline benchmark server"""
+        return {**kwargs.pop("extra_headers", {}), "X-Agent-Name": agent_name}
+
+    def _response_format(self, deployment: str, schema_name: str, schema: Dict,
+                         messages: List[Dict]) -> Optional[Dict]:
+        """Strongest output constraint the deployment and API version support for this schema"""
+        # Both JSON mode and structured outputs require a top-level object
+        if deployment not in self.settings.llm_json_mode_deployments or schema.get("type") != "object":
+            return None
+        if self.settings.azure_openai_api_version >= "2024-08-01":
+            return {"type": "json_schema", "json_schema": {"name": schema_name, "schema": schema}}
+        # Azure rejects JSON mode unless the prompt itself asks for JSON
+        if any("json" in str(m.get("content", "")).lower() for m in messages):
+            return {"type": "json_object"}
+        return None
+
+    @staticmethod
+    def _parse_structured(text: str, schema: Dict) -> Tuple[Any, List[str]]:
+        value = extract_json_from_response(text)
+        if value is None:
+            return None, ["response is not valid JSON"]
+        return value, validate_json(value, schema)
+
+    @staticmethod
+    def _repair_messages(text: str, errors: List[str], schema: Dict) -> List[Dict]:
+        """Re-ask with just the broken output, not the original prompt"""
+        return [
+            {"role": "system", "content": "You fix malformed JSON. Keep all content that is present, "
+                                          "fill missing required fields sensibly and return only JSON."},
+            {"role": "user", "content": f"JSON schema:\n{json.dumps(schema)}\n\n"
+                                        f"Problems:\n" + "\n".join(errors[:10]) + f"\n\nOutput to fix:\n{text}"}
+        ]
+
+    @staticmethod
+    def _array_items(value: Any) -> List[Any]:
+        """Items of an array answer, unwrapping objects like {"relevant_articles": [...]}"""
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict):
+            for field_value in value.values():
+                if isinstance(field_value, list) and all(isinstance(v, dict) for v in field_value):
+                    return field_value
+        return [value]
+
+    def _record_metrics(self, agent_name: str, deployment: str, started: float, cache_status: str,
+                        queue_wait: float = 0.0, usage=None):
+        """Latency, queue wait and Azure-reported token usage for one call"""
+        if not self.settings.enable_workflow_logging:
+            return
+        labels = {"agent": agent_name, "deployment": deployment}
+        METRICS.inc("llm_requests_total", labels={**labels, "cache": cache_status})
+        METRICS.observe("llm_request_duration_seconds", time.perf_counter() - started,
+                        {**labels, "cache": cache_status})
+        if cache_status != "hit":
+            METRICS.observe("llm_queue_wait_seconds", queue_wait, labels)
+        if usage is not None:
+            METRICS.inc("llm_prompt_tokens_total", usage.prompt_tokens, labels)
+            METRICS.inc("llm_completion_tokens_total", usage.completion_tokens, labels)
+
+    async def close(self):
+        """Release the response cache backend"""
+        await self.response_cache.close()
+
+    def _retry_delay(self, error: RateLimitError, attempt: int) -> float:
+        """Retry-After when Azure sends one, else jittered exponential backoff"""
+        headers = error.response.headers if error.response is not None else {}
+        retry_after = None
+        try:
+            if headers.get("retry-after-ms"):
+                retry_after = float(headers["retry-after-ms"]) / 1000.0
+            elif headers.get("retry-after"):
+                retry_after = float(headers["retry-after"])
+        except ValueError:
+            retry_after = None
+
+        if retry_after is not None:
+            return retry_after * random.uniform(1.0, 1.2)
+
+        backoff = min(self.settings.llm_backoff_max, self.settings.llm_backoff_base * (2 ** attempt))
+        return backoff * random.uniform(0.5, 1.0)
@@ -0,0 +1,141 @@
+# ================================
+# services/news_prefilter.py - Local Relevance Pre-filter for News
+# ================================
+
+import re
+import time
+import numpy as np
+from typing import Dict, List, Optional
+from app.config.settings import DashboardSettings
+from app.utils.prompt_payload import strip_html
+
+_TOKEN_RE = re.compile(r"[a-z0-9À-ɏ]+")
+
+# Topics ING content covers even when no tracked keyword mentions them
+BRAND_TOPICS = [
+    "ing", "mortgage", "hypotheek", "savings", "sparen", "interest rate", "rente",
+    "ecb", "dnb", "afm", "digital banking", "mobile banking", "payments", "pension",
+    "investing", "beleggen", "inflation", "housing market", "consumer credit",
+    "sustainable finance", "fraud", "phishing", "deposit guarantee", "dutch banks"
+]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "for", "in", "is", "of", "on", "or", "the", "to", "with",
+    "de", "het", "een", "en", "van", "voor", "op"
+}
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+class NewsPrefilter:
+    """BM25 + phrase matching over tracked keywords and brand topics, run before LLM scoring.
+
+    The vocabulary is just the query terms (a few hundred at most), so a dense
+    documents x terms matrix stays small and scoring is a handful of NumPy ops.
+    """
+
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.last_stats: Dict = {}
+        self.totals = {"cycles": 0, "scored": 0, "kept": 0}
+
+    def filter(self, articles: List[Dict], tracked_keywords: List[str]) -> List[Dict]:
+        """Return the top-scoring candidates, each annotated with `prefilter_score`"""
+        started = time.perf_counter()
+        if not articles:
+            return []
+
+        scores = self.score(articles, tracked_keywords)
+        candidates = np.flatnonzero(scores >= self.settings.news_prefilter_min_score)
+        # The best few matching articles always reach the LLM, whatever the cutoff says
+        top = np.argsort(-scores, kind="stable")[:self.settings.news_prefilter_min_candidates]
+        candidates = np.union1d(candidates, top[scores[top] > 0])
+        # Highest scores first, capped at the candidate limit
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        order = order[:self.settings.news_prefilter_max_candidates]
+
+        kept = []
+        for index in order:
+            article = dict(articles[index])
+            article["prefilter_score"] = round(float(scores[index]), 3)
+            kept.append(article)
+
+        self._record_stats(len(articles), len(kept), time.perf_counter() - started)
+        return kept
+
+    def score(self, articles: List[Dict], tracked_keywords: List[str]) -> np.ndarray:
+        """Relevance score per article (BM25 over query terms plus phrase bonuses)"""
+        phrases = sorted({p.lower().strip() for p in list(tracked_keywords) + BRAND_TOPICS if p.strip()})
+        vocabulary = {}
+        for phrase in phrases:
+            for term in _tokenize(phrase):
+                if term not in STOPWORDS:
+                    vocabulary.setdefault(term, len(vocabulary))
+
+        # Headlines carry most of the signal, so they are counted twice
+        texts = [
+            f"{a.get('headline', '')} {a.get('headline', '')} {strip_html(a.get('summary', ''))}".lower()
+            for a in articles
+        ]
+        doc_count = len(texts)
+        doc_lengths = np.fromiter((len(text.split()) or 1 for text in texts), dtype=np.float64, count=doc_count)
+
+        # One alternation regex per cycle only surfaces query terms, so the Python
+        # work per article is proportional to matches rather than to its length
+        term_re = self._alternation(sorted(vocabulary, key=len, reverse=True))
+        matches = [term_re.findall(text) for text in texts]
+        doc_index = np.repeat(np.arange(doc_count), [len(found) for found in matches])
+        columns = np.fromiter((vocabulary[term] for found in matches for term in found),
+                              dtype=np.int64, count=len(doc_index))
+
+        term_freqs = np.zeros((doc_count, max(len(vocabulary), 1)), dtype=np.float64)
+        np.add.at(term_freqs, (doc_index, columns), 1.0)
+
+        # IDF is smoothed with background documents that contain none of the query terms,
+        # so a story that dominates one cycle does not wipe out the weight of its own terms
+        doc_freqs = np.count_nonzero(term_freqs, axis=0)
+        corpus_size = doc_count + self.settings.news_prefilter_background_docs
+        idf = np.log((corpus_size - doc_freqs + 0.5) / (doc_freqs + 0.5) + 1.0)
+        length_norm = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * doc_lengths / doc_lengths.mean())
+        bm25 = (term_freqs * (self.BM25_K1 + 1)) / (term_freqs + length_norm[:, None])
+        scores = bm25 @ idf
+
+        # Exact multi-word phrase hits ("interest rate", tracked keywords) on top of term matches
+        multi_word = [" ".join(_tokenize(p)) for p in phrases if " " in p]
+        if multi_word:
+            phrase_re = self._alternation(multi_word, r"\s+")
+            phrase_hits = np.fromiter((len(phrase_re.findall(text)) for text in texts), dtype=np.float64, count=doc_count)
+            scores = scores + self.settings.news_prefilter_phrase_weight * phrase_hits
+
+        return scores
+
+    @staticmethod
+    def _alternation(terms: List[str], space: str = " ") -> "re.Pattern":
+        """Whole-word regex matching any of the terms"""
+        if not terms:
+            return re.compile(r"(?!x)x")
+        body = "|".join(re.escape(term).replace(r"\ ", space) for term in terms)
+        return re.compile(rf"(?<![a-z0-9À-ɏ])(?:{body})(?![a-z0-9À-ɏ])")
+
+    def _record_stats(self, scored: int, kept: int, elapsed: float):
+        self.last_stats = {
+            "scored": scored,
+            "kept": kept,
+            "dropped_fraction": round(1 - kept / scored, 3) if scored else 0.0,
+            "elapsed_ms": round(elapsed * 1000, 2)
+        }
+        self.totals["cycles"] += 1
+        self.totals["scored"] += scored
+        self.totals["kept"] += kept
+
+    def get_stats(self) -> Dict:
+        """Last cycle and cumulative drop rates"""
+        scored = self.totals["scored"]
+        return {
+            "last_cycle": self.last_stats,
+            **self.totals,
+            "dropped_fraction": round(1 - self.totals["kept"] / scored, 3) if scored else 0.0
+        }
@@ -0,0 +1,288 @@
+# ================================
+# services/ranking_store.py - SERP Ranking Time Series and Competitor Change Alerts
+# ================================
+
+import asyncio
+import json
+import os
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+from app.config.settings import DashboardSettings
+
+DAY = 86400
+
+def cited_domains(ai_overview: Optional[Dict]) -> List[str]:
+    """Domains an AI Overview cites, from its source entries"""
+    domains = set()
+    for source in (ai_overview or {}).get("sources") or []:
+        domain = source.get("domain") or urlparse(source.get("url", "")).netloc
+        if domain:
+            domains.add(domain.lower().removeprefix("www."))
+    return sorted(domains)
+
+@dataclass
+class KeywordSeries:
+    """Change points for one keyword: positions delta-encoded, cited domains as set diffs"""
+    time_deltas: array = field(default_factory=lambda: array("q"))
+    position_deltas: array = field(default_factory=lambda: array("h"))
+    last_time: int = 0
+    last_position: int = 0  # 0 = not ranked
+    domains: frozenset = frozenset()  # domain ids currently cited
+    domain_events: List[Tuple[int, Tuple[int, ...], Tuple[int, ...]]] = field(default_factory=list)
+
+    def append_position(self, at: int, position: int) -> Tuple[int, int]:
+        delta = (at - self.last_time, position - self.last_position)
+        self.time_deltas.append(delta[0])
+        self.position_deltas.append(delta[1])
+        self.last_time, self.last_position = at, position
+        return delta
+
+    def points(self) -> List[Tuple[int, int]]:
+        """Decoded (timestamp, position) change points"""
+        decoded, at, position = [], 0, 0
+        for dt, dp in zip(self.time_deltas, self.position_deltas):
+            at += dt
+            position += dp
+            decoded.append((at, position))
+        return decoded
+
+class RankingStore:
+    """Append-only log of per-keyword SERP positions and AI Overview citations
+
+    Only changes are stored, so appending a snapshot costs O(changed keywords) on disk and
+    each change immediately yields its competitor alerts for the dashboard.
+    """
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.path = self.settings.ranking_store_path
+        self.own_domains = {d.lower() for d in self.settings.ranking_own_domains}
+        self.series: Dict[str, KeywordSeries] = {}
+        self._keyword_ids: Dict[str, int] = {}
+        self._domain_ids: Dict[str, int] = {}
+        self._domain_names: List[str] = []
+        self.alerts: deque = deque(maxlen=self.settings.ranking_alert_history)
+        self._last_compaction = time.time()
+        self.stats = {"snapshots": 0, "changes": 0, "alerts": 0, "compactions": 0}
+
+    async def start(self):
+        """Replay the log written by previous processes"""
+        await asyncio.to_thread(self._load)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        keyword_names: Dict[int, str] = {}
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                kind = record[0]
+                if kind == "k":
+                    keyword_names[record[1]] = record[2]
+                    self._keyword_ids[record[2]] = record[1]
+                elif kind == "d":
+                    self._domain_ids[record[2]] = record[1]
+                    self._domain_names.append(record[2])
+                elif kind == "p":
+                    series = self.series.setdefault(keyword_names[record[1]], KeywordSeries())
+                    series.append_position(series.last_time + record[2], series.last_position + record[3])
+                elif kind == "c":
+                    series = self.series.setdefault(keyword_names[record[1]], KeywordSeries())
+                    added, removed = tuple(record[3]), tuple(record[4])
+                    series.domain_events.append((record[2], added, removed))
+                    series.domains = (series.domains | set(added)) - set(removed)
+
+    def record_positions(self, keyword_records: Iterable[Dict], at: Optional[float] = None) -> List[Dict]:
+        """Store SerpBear positions that changed since the previous snapshot and return new alerts"""
+        now = int(at or time.time())
+        lines, alerts = [], []
+        for record in keyword_records:
+            keyword, position = record.get("keyword"), int(record.get("position") or 0)
+            if not keyword:
+                continue
+            series = self._series(keyword, lines)
+            first = not series.time_deltas
+            if not first and position == series.last_position:
+                continue
+            previous = series.last_position
+            dt, dp = series.append_position(now, position)
+            lines.append(["p", self._keyword_ids[keyword], dt, dp])
+            if not first:
+                alerts.extend(self._position_alerts(keyword, previous, position, now))
+        return self._commit(lines, alerts)
+
+    def record_ai_overviews(self, overviews: Dict[str, Dict], at: Optional[float] = None) -> List[Dict]:
+        """Store AI Overview citation changes per keyword and return new alerts"""
+        now = int(at or time.time())
+        lines, alerts = [], []
+        for keyword, overview in overviews.items():
+            series = self._series(keyword, lines)
+            domain_ids = frozenset(self._domain_id(domain, lines) for domain in cited_domains(overview))
+            first = not series.domain_events
+            if not first and domain_ids == series.domains:
+                continue
+            added = tuple(sorted(domain_ids - series.domains))
+            removed = tuple(sorted(series.domains - domain_ids))
+            series.domain_events.append((now, added, removed))
+            series.domains = domain_ids
+            lines.append(["c", self._keyword_ids[keyword], now, list(added), list(removed)])
+            if not first:
+                alerts.extend(self._citation_alerts(keyword, added, removed, now))
+        return self._commit(lines, alerts)
+
+    def recent_alerts(self) -> List[Dict]:
+        """Precomputed alerts, newest first"""
+        return list(self.alerts)
+
+    def history(self, keyword: str) -> List[Tuple[int, int]]:
+        series = self.series.get(keyword)
+        return series.points() if series is not None else []
+
+    def _series(self, keyword: str, lines: List) -> KeywordSeries:
+        if keyword not in self._keyword_ids:
+            self._keyword_ids[keyword] = len(self._keyword_ids)
+            lines.append(["k", self._keyword_ids[keyword], keyword])
+        return self.series.setdefault(keyword, KeywordSeries())
+
+    def _domain_id(self, domain: str, lines: List) -> int:
+        if domain not in self._domain_ids:
+            self._domain_ids[domain] = len(self._domain_names)
+            self._domain_names.append(domain)
+            lines.append(["d", self._domain_ids[domain], domain])
+        return self._domain_ids[domain]
+
+    def _position_alerts(self, keyword: str, previous: int, position: int, at: int) -> List[Dict]:
+        if previous and position and abs(position - previous) < self.settings.ranking_alert_min_position_change:
+            return []
+        if not position:
+            change = f"ING dropped out of the top 100 for '{keyword}' (was #{previous})"
+        elif not previous:
+            change = f"ING now ranks #{position} for '{keyword}'"
+        else:
+            direction = "up" if position < previous else "down"
+            change = f"ING moved {direction} from #{previous} to #{position} for '{keyword}'"
+        return [self._alert(keyword, "SERP position", change, "position", at)]
+
+    def _citation_alerts(self, keyword: str, added: Tuple[int, ...], removed: Tuple[int, ...],
+                         at: int) -> List[Dict]:
+        alerts = []
+        for domain_id in added:
+            domain = self._domain_names[domain_id]
+            if domain in self.own_domains:
+                alerts.append(self._alert(keyword, domain, f"ING is now cited in the AI Overview for '{keyword}'",
+                                          "citation_gained", at))
+            else:
+                alerts.append(self._alert(keyword, domain, f"Newly cited in the AI Overview for '{keyword}'",
+                                          "competitor_cited", at))
+        for domain_id in removed:
+            domain = self._domain_names[domain_id]
+            if domain in self.own_domains:
+                alerts.append(self._alert(keyword, domain, f"ING is no longer cited in the AI Overview for '{keyword}'",
+                                          "citation_lost", at))
+            else:
+                alerts.append(self._alert(keyword, domain, f"No longer cited in the AI Overview for '{keyword}'",
+                                          "competitor_dropped", at))
+        return alerts
+
+    @staticmethod
+    def _alert(keyword: str, competitor: str, description: str, kind: str, at: int) -> Dict:
+        return {
+            "keyword": keyword,
+            "competitor": competitor,
+            "change_description": description,
+            "kind": kind,
+            "detected_at": datetime.fromtimestamp(at).isoformat()
+        }
+
+    def _commit(self, lines: List, alerts: List[Dict]) -> List[Dict]:
+        self.stats["snapshots"] += 1
+        self.stats["changes"] += sum(1 for line in lines if line[0] in ("p", "c"))
+        self.stats["alerts"] += len(alerts)
+        self.alerts.extendleft(alerts)
+        if lines:
+            self._append(lines)
+        if time.time() - self._last_compaction > self.settings.ranking_compaction_interval:
+            self.compact()
+        return alerts
+
+    def _append(self, lines: List):
+        try:
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines))
+        except OSError as e:
+            print(f"Ranking store append failed: {e}")
+
+    def compact(self, now: Optional[float] = None):
+        """Apply retention, keep one point per day for older history and rewrite the log"""
+        now = int(now or time.time())
+        retain_from = now - self.settings.ranking_retention_days * DAY
+        downsample_before = now - self.settings.ranking_downsample_after_days * DAY
+        lines = [["d", domain_id, domain] for domain_id, domain in enumerate(self._domain_names)]
+
+        for keyword, series in self.series.items():
+            keyword_id = self._keyword_ids[keyword]
+            lines.append(["k", keyword_id, keyword])
+
+            points = [p for p in series.points() if p[0] >= retain_from]
+            # Older points collapse to the last change of each day
+            daily: Dict[int, Tuple[int, int]] = {}
+            recent = []
+            for at, position in points:
+                if at < downsample_before:
+                    daily[at // DAY] = (at, position)
+                else:
+                    recent.append((at, position))
+            compacted = KeywordSeries(domains=series.domains)
+            for at, position in list(daily.values()) + recent:
+                if compacted.time_deltas and position == compacted.last_position:
+                    continue
+                dt, dp = compacted.append_position(at, position)
+                lines.append(["p", keyword_id, dt, dp])
+            if not compacted.time_deltas and series.time_deltas:
+                # Keep the current position even when its last change is past retention
+                dt, dp = compacted.append_position(max(series.last_time, retain_from), series.last_position)
+                lines.append(["p", keyword_id, dt, dp])
+
+            # Expired citation changes fold into one baseline event
+            baseline, kept = set(), []
+            for at, added, removed in series.domain_events:
+                if at < retain_from:
+                    baseline = (baseline | set(added)) - set(removed)
+                else:
+                    kept.append((at, added, removed))
+            if baseline or (series.domain_events and not kept):
+                kept.insert(0, (retain_from, tuple(sorted(baseline)), ()))
+            compacted.domain_events = kept
+            for at, added, removed in kept:
+                lines.append(["c", keyword_id, at, list(added), list(removed)])
+            self.series[keyword] = compacted
+
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w") as f:
+                f.write("".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Ranking store compaction failed: {e}")
+        self._last_compaction = time.time()
+        self.stats["compactions"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        try:
+            log_bytes = os.path.getsize(self.path)
+        except OSError:
+            log_bytes = 0
+        return {
+            **self.stats,
+            "keywords": len(self.series),
+            "points": sum(len(s.time_deltas) for s in self.series.values()),
+            "log_bytes": log_bytes
+        }
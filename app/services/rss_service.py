@@ -2,12 +2,26 @@
 # services/rss_service.py - Enhanced RSS Management
 # ================================
 
+import asyncio
+import hashlib
 import aiohttp
 import feedparser
-from typing import List, Dict
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from app.config.settings import DashboardSettings
+
+@dataclass
+class FeedState:
+    """Validators and last parsed entries for a single feed"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    articles: List[Dict] = field(default_factory=list)
 
 class RSSService:
-    def __init__(self):
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
         self.rss_sources = {
             "yahoo_finance": "https://feeds.yahoo.com/rss/markets",
             "marketwatch": "https://feeds.marketwatch.com/marketwatch/topstories/",
@@ -16,32 +30,114 @@ class RSSService:
             "ecb_press": "https://www.ecb.europa.eu/press/pressreleases/rss.xml",
             "fd_banking": "https://fd.nl/rss/banking"  # Het Financieele Dagblad
         }
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._feed_state: Dict[str, FeedState] = {}
+        self._seen_ids: "OrderedDict[str, None]" = OrderedDict()
+
+    async def start(self):
+        """Open the long-lived connection pool shared by all feed fetches"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.settings.rss_connection_pool_size,
+            ttl_dns_cache=300,
+            keepalive_timeout=self.settings.rss_keepalive_timeout
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.settings.rss_request_timeout)
+        )
+
+    async def close(self):
+        """Close the connection pool on shutdown"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, opening it lazily outside the app lifecycle"""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
     async def fetch_all_feeds(self) -> List[Dict]:
-        """Fetch articles from all RSS sources"""
+        """Fetch articles from all RSS sources concurrently within the fetch deadline"""
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(self.settings.rss_max_concurrent_fetches)
+
+        async def fetch_limited(source_name: str, rss_url: str) -> List[Dict]:
+            async with semaphore:
+                return await self._fetch_single_feed(session, rss_url, source_name)
+
+        tasks = {
+            asyncio.create_task(fetch_limited(source_name, rss_url)): source_name
+            for source_name, rss_url in self.rss_sources.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.settings.rss_fetch_deadline)
+
+        # Slow feeds must not hold up the ones that already answered
+        for task in pending:
+            task.cancel()
+            print(f"RSS fetch exceeded {self.settings.rss_fetch_deadline}s deadline for {tasks[task]}")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
         all_articles = []
-        
-        async with aiohttp.ClientSession() as session:
-            for source_name, rss_url in self.rss_sources.items():
-                try:
-                    articles = await self._fetch_single_feed(session, rss_url, source_name)
-                    all_articles.extend(articles)
-                except Exception as e:
-                    print(f"RSS fetch failed for {source_name}: {e}")
-                    continue
-        
-        return sorted(all_articles, key=lambda x: x.get('published_date', ''), reverse=True)[:20]
-    
+        for task in done:
+            try:
+                all_articles.extend(task.result())
+            except Exception as e:
+                print(f"RSS fetch failed for {tasks[task]}: {e}")
+
+        return sorted(all_articles, key=lambda x: x.get('published_date', ''), reverse=True)[:self.settings.rss_max_articles]
+
+    async def fetch_new_articles(self) -> List[Dict]:
+        """Fetch only entries not yet marked as seen; call mark_seen once they are processed"""
+        return self.unseen_articles(await self.fetch_all_feeds())
+
+    def unseen_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Articles whose entry IDs have not been marked as seen"""
+        return [a for a in articles if a['entry_id'] not in self._seen_ids]
+
+    def mark_seen(self, entry_ids: Iterable[str]):
+        """Remember processed entry IDs; only call after the articles were analyzed and stored"""
+        for entry_id in entry_ids:
+            self._seen_ids[entry_id] = None
+            self._seen_ids.move_to_end(entry_id)
+        while len(self._seen_ids) > self.settings.rss_seen_index_size:
+            self._seen_ids.popitem(last=False)
+
     async def _fetch_single_feed(self, session: aiohttp.ClientSession, url: str, source: str) -> List[Dict]:
-        """Fetch single RSS feed"""
-        async with session.get(url, timeout=10) as response:
+        """Fetch single RSS feed, reusing the last parse when the feed is unchanged"""
+        state = self._feed_state.setdefault(source, FeedState())
+
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return state.articles
+
             if response.status == 200:
-                content = await response.text()
+                content = await response.read()
+                state.etag = response.headers.get("ETag")
+                state.last_modified = response.headers.get("Last-Modified")
+
+                # Servers without validators still resend identical bodies
+                content_hash = hashlib.sha1(content).hexdigest()
+                if content_hash == state.content_hash:
+                    return state.articles
+
                 feed = feedparser.parse(content)
-                
+
                 articles = []
-                for entry in feed.entries[:5]:
+                for entry in feed.entries[:self.settings.rss_max_articles_per_source]:
                     articles.append({
+                        'entry_id': entry.get('id') or entry.get('link') or entry.get('title', ''),
                         'headline': entry.get('title', ''),
                         'summary': entry.get('summary', ''),
                         'url': entry.get('link', ''),
@@ -49,5 +145,8 @@ class RSSService:
                         'source': source,
                         'raw_entry': entry
                     })
+
+                state.content_hash = content_hash
+                state.articles = articles
                 return articles
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,252 @@
+# ================================
+# services/serp_service.py - SERP and AI Overview Acquisition
+# ================================
+
+import asyncio
+import gzip
+import os
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+import aiohttp
+from app.config.settings import DashboardSettings
+from app.utils.rate_limiter import TokenBucket
+from app.utils.result_cache import SingleFlightCache, fingerprint
+from app.utils.serp_parser import SerpMarkup, parse_serp
+
+# ================================
+# Providers
+# ================================
+
+class SerpProvider:
+    """Turns a keyword into the HTTP request for its results page and describes that page's markup"""
+    name = "base"
+    markup = SerpMarkup()
+
+    def __init__(self, settings: DashboardSettings):
+        self.settings = settings
+
+    def request(self, keyword: str) -> Tuple[str, Dict[str, str]]:
+        """(url, query params) for the keyword's results page"""
+        raise NotImplementedError
+
+class SearchPageProvider(SerpProvider):
+    """Fetches the search engine's results page directly"""
+    name = "search_page"
+
+    def request(self, keyword: str) -> Tuple[str, Dict[str, str]]:
+        return self.settings.serp_search_url, {
+            "q": keyword,
+            "hl": self.settings.serp_language,
+            "gl": self.settings.serp_country,
+            "num": "10"
+        }
+
+class ScrapingProxyProvider(SearchPageProvider):
+    """Fetches the results page through a scraping API that takes the target URL as a parameter"""
+    name = "scraping_proxy"
+
+    def request(self, keyword: str) -> Tuple[str, Dict[str, str]]:
+        url, params = super().request(keyword)
+        return self.settings.serp_proxy_url, {
+            "api_key": self.settings.serp_proxy_api_key,
+            "url": f"{url}?{urlencode(params)}"
+        }
+
+SERP_PROVIDERS = {provider.name: provider for provider in (SearchPageProvider, ScrapingProxyProvider)}
+
+# ================================
+# Politeness and Raw Page Cache
+# ================================
+
+class HostRateLimiter:
+    """Token bucket per host; callers for the same host queue in arrival order"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"waits": 0, "wait_seconds": 0.0}
+
+    async def acquire(self, host: str):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.burst, self.rate)
+            self._locks[host] = asyncio.Lock()
+        async with self._locks[host]:
+            wait = bucket.wait_time(1)
+            if wait > 0:
+                self.stats["waits"] += 1
+                self.stats["wait_seconds"] += wait
+                await asyncio.sleep(wait)
+            bucket.consume(1)
+
+    def penalize(self, host: str, seconds: float):
+        """Hold back a host that asked us to slow down (429/503 with Retry-After)"""
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.consume(bucket.available + seconds * self.rate)
+
+class RawPageCache:
+    """Gzipped raw HTML on disk, so restarts and parser changes do not refetch pages"""
+
+    def __init__(self, directory: str, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.html.gz")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def put(self, key: str, html: str):
+        path = self._path(key)
+        temporary = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=5) as f:
+                f.write(html)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"SERP cache write failed: {e}")
+
+    def prune(self) -> int:
+        """Delete expired pages; returns how many were removed"""
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+# ================================
+# SERP Service
+# ================================
+
+class SerpService:
+    """Fetches and parses results pages with bounded concurrency, per-host politeness and two cache layers"""
+
+    RETRY_STATUSES = (429, 503)
+
+    def __init__(self, settings: Optional[DashboardSettings] = None, provider: Optional[SerpProvider] = None):
+        self.settings = settings or DashboardSettings()
+        self.provider = provider or SERP_PROVIDERS[self.settings.serp_provider](self.settings)
+        self.page_cache = RawPageCache(self.settings.serp_cache_dir, self.settings.serp_cache_ttl)
+        # Parsed records per keyword; concurrent GEO runs for one keyword share a single fetch
+        self.parsed_cache = SingleFlightCache(
+            ttl=self.settings.serp_cache_ttl,
+            max_entries=self.settings.serp_parsed_cache_size
+        )
+        self.host_limiter = HostRateLimiter(self.settings.serp_host_rate, self.settings.serp_host_burst)
+        self._fetch_slots = asyncio.Semaphore(self.settings.serp_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"fetched": 0, "page_cache_hits": 0, "retries": 0, "errors": 0, "parsed": 0,
+                      "parse_seconds": 0.0, "bytes": 0}
+
+    async def start(self):
+        """Open the connection pool and drop expired cached pages"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.settings.serp_connection_pool_size, ttl_dns_cache=300),
+                headers={
+                    "User-Agent": self.settings.serp_user_agent,
+                    "Accept-Language": f"{self.settings.serp_language},en;q=0.8"
+                },
+                timeout=aiohttp.ClientTimeout(
+                    total=self.settings.serp_request_timeout,
+                    connect=self.settings.serp_connect_timeout
+                )
+            )
+        await asyncio.to_thread(self.page_cache.prune)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def fetch_serp(self, keyword: str) -> Dict:
+        """Parsed AI Overview and organic results for a keyword"""
+        return await self.parsed_cache.get_or_compute(keyword.strip().lower(), lambda: self._fetch_and_parse(keyword))
+
+    async def _fetch_and_parse(self, keyword: str) -> Dict:
+        html = await self.fetch_html(keyword)
+        started = time.perf_counter()
+        # Parsing is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(
+            parse_serp, html, keyword, self.provider.markup, self.settings.serp_snippet_max_chars
+        )
+        self.stats["parse_seconds"] += time.perf_counter() - started
+        self.stats["parsed"] += 1
+        return result
+
+    async def fetch_html(self, keyword: str) -> str:
+        """Raw results page, from the disk cache when fresh"""
+        url, params = self.provider.request(keyword)
+        key = fingerprint(self.provider.name, url, params)[:32]
+        html = await asyncio.to_thread(self.page_cache.get, key)
+        if html is not None:
+            self.stats["page_cache_hits"] += 1
+            return html
+
+        async with self._fetch_slots:
+            html = await self._download(url, params)
+        self.stats["fetched"] += 1
+        self.stats["bytes"] += len(html)
+        await asyncio.to_thread(self.page_cache.put, key, html)
+        return html
+
+    async def _download(self, url: str, params: Dict[str, str]) -> str:
+        session = await self._get_session()
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            await self.host_limiter.acquire(host)
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < self.settings.serp_max_retries:
+                        retry_after = response.headers.get("Retry-After", "")
+                        delay = float(retry_after) if retry_after.isdigit() else 2.0 ** attempt
+                        self.host_limiter.penalize(host, delay)
+                        self.stats["retries"] += 1
+                        attempt += 1
+                        continue
+                    response.raise_for_status()
+                    return await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Timeouts are not ClientErrors; count them too so hung upstreams show up
+                self.stats["errors"] += 1
+                raise
+
+    def invalidate(self, keyword: Optional[str] = None):
+        """Drop parsed records so the next call re-reads the page cache (or the network once it expires)"""
+        self.parsed_cache.invalidate(keyword.strip().lower() if keyword else None)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "parse_seconds": round(self.stats["parse_seconds"], 3),
+            "host_burst": self.host_limiter.burst,
+            "host_waits": self.host_limiter.stats["waits"],
+            "host_wait_seconds": round(self.host_limiter.stats["wait_seconds"], 3),
+            "parsed_cache": self.parsed_cache.get_stats()
+        }
@@ -2,30 +2,85 @@
 # services/serpbear_service.py - Enhanced SERP Tracking
 # ================================
 
-import os
 import aiohttp
-from typing import List
+from typing import Dict, List, Optional
+from app.config.settings import DashboardSettings
+from app.services.keyword_ranker import KeywordRanker
+from app.utils.result_cache import SingleFlightCache
 
 class SerpBearService:
-    def __init__(self):
-        self.base_url = os.getenv("SERPBEAR_BASE_URL")
-        self.api_key = os.getenv("SERPBEAR_API_KEY")
-    
-    async def get_tracked_keywords(self) -> List[str]:
-        """Get currently tracked keywords from SerpBear"""
+    FALLBACK_KEYWORDS = ["mortgage rates", "digital banking", "investment options"]
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.base_url = self.settings.serpbear_base_url.rstrip("/")
+        self.api_key = self.settings.serpbear_api_key
+        self.ranker = KeywordRanker(self.settings)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # One shared keyword list; callers never wait on SerpBear while a stale copy exists
+        self.keyword_cache = SingleFlightCache(
+            ttl=self.settings.serpbear_cache_ttl,
+            max_entries=1,
+            stale_ttl=self.settings.serpbear_stale_ttl
+        )
+
+    async def start(self):
+        """Open the long-lived connection pool for SerpBear API calls"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.settings.serpbear_connection_pool_size, ttl_dns_cache=300),
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=aiohttp.ClientTimeout(
+                total=self.settings.serpbear_request_timeout,
+                connect=self.settings.serpbear_connect_timeout
+            )
+        )
+
+    async def close(self):
+        """Close the connection pool on shutdown"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, opening it lazily outside the app lifecycle"""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def get_keyword_data(self) -> List[Dict]:
+        """Tracked keyword records (position, history, URL) from the shared cache"""
+        if not self.base_url:
+            return [{"keyword": keyword} for keyword in self.FALLBACK_KEYWORDS]
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                async with session.get(f"{self.base_url}/api/keywords", headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [kw["keyword"] for kw in data.get("keywords", [])]
+            return await self.keyword_cache.get_or_compute("keywords", self._fetch_keywords)
         except Exception as e:
-            print(f"SerpBear API error: {e}")
-            return ["mortgage rates", "digital banking", "investment options"]  # Fallback
-    
-    async def get_priority_keywords(self) -> List[str]:
-        """Get high-priority keywords for optimization"""
-        all_keywords = await self.get_tracked_keywords()
-        # Logic to prioritize based on performance, competition, etc.
-        return all_keywords[:10]  # Top 10 for optimization
\ No newline at end of file
+            print(f"SerpBear API error: {type(e).__name__}: {e}")
+            return [{"keyword": keyword} for keyword in self.FALLBACK_KEYWORDS]
+
+    async def get_tracked_keywords(self) -> List[str]:
+        """Get currently tracked keywords from SerpBear"""
+        return [record["keyword"] for record in await self.get_keyword_data()]
+
+    async def get_priority_keywords(self, limit: Optional[int] = None,
+                                    ai_overview: Optional[Dict[str, float]] = None) -> List[str]:
+        """Get high-priority keywords for optimization, ranked by position trend, volume and AI Overview presence"""
+        records = await self.get_keyword_data()
+        return self.ranker.top_keywords(records, limit or self.settings.geo_priority_keywords, ai_overview)
+
+    async def _fetch_keywords(self) -> List[Dict]:
+        session = await self._get_session()
+        params = {"domain": self.settings.serpbear_domain} if self.settings.serpbear_domain else None
+        async with session.get(f"{self.base_url}/api/keywords", params=params) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return [record for record in data.get("keywords", []) if record.get("keyword")]
+
+    def invalidate(self):
+        """Force the next call to refetch, e.g. after keywords are added in SerpBear"""
+        self.keyword_cache.invalidate()
+
+    def get_stats(self) -> Dict[str, int]:
+        return self.keyword_cache.get_stats()
@@ -0,0 +1,287 @@
+# ================================
+# services/storage_service.py - Persistent Workflow Result Store
+# ================================
+
+import asyncio
+import math
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Type
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from app.config.settings import DashboardSettings
+from app.models.storage_models import (
+    Article, Base, GEORun, GeneratedArticle, InclusionPrediction, Opportunity, WorkflowRun
+)
+
+# Async drivers for the sync-style URLs settings usually carry
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql"
+}
+
+def async_database_url(url: str) -> str:
+    """Swap a plain database URL onto its async driver"""
+    scheme, separator, rest = url.partition("://")
+    if "+" in scheme or scheme not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[scheme]}{separator}{rest}"
+
+# Confidence usually comes back from the LLM as a label rather than a number
+CONFIDENCE_LEVELS = {"low": 0.25, "medium": 0.5, "high": 0.75, "very high": 0.9}
+
+def urgency_for_priority(priority: float) -> str:
+    return "urgent" if priority > 80 else "normal"
+
+def as_float(value) -> Optional[float]:
+    """Numeric LLM output as a float, None for anything that is not a finite number"""
+    if isinstance(value, str):
+        value = CONFIDENCE_LEVELS.get(value.strip().lower(), value.strip().rstrip("%"))
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+class StorageService:
+    """Persists workflow outputs through a batched background writer and serves metric counts"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.engine: AsyncEngine = create_async_engine(async_database_url(self.settings.database_url))
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        self._queue: "asyncio.Queue[Tuple[Type[Base], Dict]]" = asyncio.Queue(
+            maxsize=self.settings.storage_write_queue_size
+        )
+        self._writer: Optional[asyncio.Task] = None
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "dropped": 0, "failed": 0}
+
+    async def start(self):
+        """Create tables and start the background writer"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        """Flush pending writes, stop the writer and dispose of the connection pool"""
+        if self._writer is not None:
+            await self.flush()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self.engine.dispose()
+
+    async def flush(self):
+        """Wait until every queued row has been written"""
+        if self._writer is not None:
+            await self._queue.join()
+
+    # ================================
+    # Recording (non-blocking)
+    # ================================
+
+    def record_news_run(self, result: Dict, articles: List[Dict], started_at: datetime) -> str:
+        """Queue a news intelligence run with its articles and opportunities"""
+        run_id = self._record_run("news_intelligence", started_at)
+        now = datetime.now()
+        for article in articles:
+            self._enqueue(Article, {
+                "entry_id": article.get("entry_id") or article.get("url") or article.get("headline", ""),
+                "headline": article.get("headline", ""),
+                "summary": article.get("summary", ""),
+                "url": article.get("url", ""),
+                "source": article.get("source", "unknown"),
+                "published_date": str(article.get("published_date", "")),
+                "cluster_id": article.get("cluster_id"),
+                "fetched_at": now
+            })
+        for opportunity in result.get("content_opportunities", []):
+            priority = as_float(opportunity.get("priority")) or 0.0
+            self._enqueue(Opportunity, {
+                "run_id": run_id,
+                "headline": opportunity.get("headline", ""),
+                "priority": priority,
+                "urgency_level": opportunity.get("urgency_level") or urgency_for_priority(priority),
+                "keywords": opportunity.get("keywords") or [],
+                "content_angle": opportunity.get("content_angle", ""),
+                "estimated_traffic": str(opportunity.get("estimated_traffic", "")),
+                "created_at": now
+            })
+        return run_id
+
+    def record_geo_run(self, result: Dict, started_at: datetime) -> str:
+        """Queue a GEO optimization run with one outcome and prediction per keyword
+
+        Keywords skipped as unchanged are recorded with the outcome reused from their last run.
+        Prediction values come straight from the LLM, so anything non-numeric is stored as NULL
+        (or the prediction row skipped) and a malformed result never fails the run.
+        """
+        run_id = self._record_run("geo_optimization", started_at)
+        try:
+            self._record_geo_keywords(run_id, result)
+        except Exception as e:
+            print(f"Recording GEO run {run_id} failed: {e}")
+        return run_id
+
+    def _record_geo_keywords(self, run_id: str, result: Dict):
+        now = datetime.now()
+        failed = set(result.get("failed_keywords") or [])
+        analysis = result.get("ing_content_analysis") or {}
+        predictions = result.get("inclusion_predictions") or {}
+        outcomes = {outcome["keyword"]: outcome for outcome in result.get("optimization_results") or []}
+
+        for keyword in result.get("target_keywords", []):
+            if keyword in failed:
+                continue
+            outcome = outcomes.get(keyword, {})
+            prediction = outcome.get("prediction", predictions)
+            if not isinstance(prediction, dict):
+                prediction = {}
+            probability = as_float(outcome.get("inclusion_probability", prediction.get(
+                "overall_inclusion_probability", prediction.get("inclusion_probability")
+            )))
+            self._enqueue(GEORun, {
+                "run_id": run_id,
+                "keyword": keyword,
+                "optimization_strategy": outcome.get("optimization_status", result.get("optimization_strategy", "unknown")),
+                # The evaluator's score for the current content, the same value the strategy router reads
+                "average_inclusion_score": as_float(
+                    outcome.get("average_inclusion_score", analysis.get("overall_inclusion_probability"))
+                ),
+                "created_at": now
+            })
+            if probability is not None:
+                self._enqueue(InclusionPrediction, {
+                    "run_id": run_id,
+                    "keyword": keyword,
+                    "probability": probability,
+                    "confidence": as_float(prediction.get("confidence_level")),
+                    "created_at": now
+                })
+
+    def record_generated_article(self, result: Dict, started_at: datetime) -> str:
+        """Queue the final article of a content generation run"""
+        run_id = self._record_run("content_generation", started_at)
+        article = result.get("final_article") or {}
+        self._enqueue(GeneratedArticle, {
+            "run_id": run_id,
+            "opportunity_id": result.get("opportunity_id"),
+            "title": article.get("title", ""),
+            "status": article.get("status", "review"),
+            "content": article,
+            "created_at": datetime.now()
+        })
+        return run_id
+
+    def _record_run(self, workflow: str, started_at: datetime, status: str = "completed",
+                    error: Optional[str] = None) -> str:
+        run_id = uuid.uuid4().hex
+        self._enqueue(WorkflowRun, {
+            "id": run_id,
+            "workflow": workflow,
+            "status": status,
+            "started_at": started_at,
+            "duration": (datetime.now() - started_at).total_seconds(),
+            "error": error
+        })
+        return run_id
+
+    def _enqueue(self, model: Type[Base], row: Dict):
+        # Never make a workflow wait on the database; shed rows instead when it falls behind
+        try:
+            self._queue.put_nowait((model, row))
+            self.stats["queued"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+
+    # ================================
+    # Background Writer
+    # ================================
+
+    async def _write_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Let concurrent producers fill the batch before writing it
+            await asyncio.sleep(self.settings.storage_flush_interval)
+            while len(batch) < self.settings.storage_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._write_batch(batch)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                print(f"Storage batch of {len(batch)} rows failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: List[Tuple[Type[Base], Dict]]):
+        """One transaction per batch, one executemany per table in dependency order"""
+        rows_by_table: Dict[str, List[Dict]] = {}
+        for model, row in batch:
+            rows_by_table.setdefault(model.__tablename__, []).append(row)
+
+        async with self.sessions.begin() as session:
+            for table in Base.metadata.sorted_tables:
+                rows = rows_by_table.get(table.name)
+                if not rows:
+                    continue
+                statement = self._insert(table) if table.name == Article.__tablename__ else insert(table)
+                await session.execute(statement, rows)
+
+    def _insert(self, table):
+        """Insert that ignores rows already stored (articles reappear across polls)"""
+        dialect = self.engine.dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return insert(table).prefix_with("IGNORE")
+        return dialect_insert(table).on_conflict_do_nothing()
+
+    # ================================
+    # Dashboard Metrics
+    # ================================
+
+    def _window_start(self) -> datetime:
+        return datetime.now() - timedelta(hours=self.settings.metrics_window_hours)
+
+    async def _scalar(self, statement) -> int:
+        async with self.sessions() as session:
+            return (await session.execute(statement)).scalar() or 0
+
+    async def count_urgent_opportunities(self) -> int:
+        """Distinct urgent opportunity headlines within the metrics window"""
+        return await self._scalar(
+            select(func.count(func.distinct(Opportunity.headline)))
+            .where(Opportunity.urgency_level == "urgent", Opportunity.created_at >= self._window_start())
+        )
+
+    async def count_ai_overview_wins(self) -> int:
+        """Keywords predicted to be included in AI Overviews within the metrics window"""
+        return await self._scalar(
+            select(func.count(func.distinct(InclusionPrediction.keyword)))
+            .where(InclusionPrediction.probability >= self.settings.ai_overview_win_probability,
+                   InclusionPrediction.created_at >= self._window_start())
+        )
+
+    async def count_active_optimizations(self) -> int:
+        """Keywords with a targeted or comprehensive optimization within the metrics window"""
+        return await self._scalar(
+            select(func.count(func.distinct(GEORun.keyword)))
+            .where(GEORun.optimization_strategy != "monitor", GEORun.created_at >= self._window_start())
+        )
+
+    async def count_pipeline_items(self) -> int:
+        """Generated articles not yet published"""
+        return await self._scalar(
+            select(func.count(GeneratedArticle.id)).where(GeneratedArticle.status != "published")
+        )
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "pending": self._queue.qsize()}
@@ -0,0 +1,161 @@
+# ================================
+# services/story_clusterer.py - Near-Duplicate Story Clustering
+# ================================
+
+import itertools
+import re
+import zlib
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from app.config.settings import DashboardSettings
+from app.utils.prompt_payload import strip_html
+
+_TOKEN_RE = re.compile(r"[a-z0-9À-ɏ]+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "to", "was", "will", "with",
+    "de", "het", "een", "en", "van", "voor", "op", "in", "met", "is"
+}
+
+@dataclass
+class StoryCluster:
+    cluster_id: int
+    signature: np.ndarray
+    band_keys: List[int]
+    sources: Set[str] = field(default_factory=set)
+    entry_ids: Set[str] = field(default_factory=set)  # first news_cluster_max_members entries
+    urls: List[str] = field(default_factory=list)
+    overflow: int = 0  # entries seen after the member cap was reached
+
+    @property
+    def size(self) -> int:
+        return len(self.entry_ids) + self.overflow
+
+class StoryClusterer:
+    """Streaming MinHash/LSH index grouping the same story across feeds and polling cycles"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.num_perm = self.settings.news_cluster_num_perm
+        self.bands = self.settings.news_cluster_bands
+        self.rows = self.num_perm // self.bands
+
+        # Fixed seed so signatures stay comparable for the life of the index
+        rng = np.random.default_rng(1)
+        self._perm_a = rng.integers(1, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._perm_b = rng.integers(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+
+        self._clusters: "OrderedDict[int, StoryCluster]" = OrderedDict()
+        self._buckets: Dict[int, Set[int]] = {}
+        # Every entry seen, members and overflow alike, so each is counted once; LRU-bounded
+        self._entry_index: "OrderedDict[str, int]" = OrderedDict()
+        self._next_id = itertools.count(1)
+        self.stats = {"articles": 0, "duplicates": 0}
+
+    def cluster(self, articles: List[Dict]) -> List[Dict]:
+        """One representative per story, annotated with its cluster ID and all sources seen"""
+        representatives: "OrderedDict[int, Dict]" = OrderedDict()
+
+        for article in articles:
+            story = self._assign(article)
+            if story.cluster_id not in representatives:
+                representatives[story.cluster_id] = article
+            else:
+                self.stats["duplicates"] += 1
+            self.stats["articles"] += 1
+
+        results = []
+        for cluster_id, article in representatives.items():
+            story = self._clusters[cluster_id]
+            results.append({
+                **article,
+                "cluster_id": cluster_id,
+                "sources": sorted(story.sources),
+                "cluster_size": story.size
+            })
+        return results
+
+    def _assign(self, article: Dict) -> StoryCluster:
+        entry_id = article.get("entry_id") or article.get("url") or article.get("headline", "")
+
+        # Entries seen in an earlier poll keep their cluster without re-hashing
+        cluster_id = self._entry_index.get(entry_id)
+        if cluster_id is not None and cluster_id in self._clusters:
+            self._entry_index.move_to_end(entry_id)
+            self._clusters.move_to_end(cluster_id)
+            return self._clusters[cluster_id]
+
+        signature = self._signature(f"{article.get('headline', '')} {strip_html(article.get('summary', ''))}")
+        band_keys = self._band_keys(signature)
+        story = self._find_match(signature, band_keys)
+
+        if story is None:
+            story = StoryCluster(cluster_id=next(self._next_id), signature=signature, band_keys=band_keys)
+            self._clusters[story.cluster_id] = story
+            for key in band_keys:
+                self._buckets.setdefault(key, set()).add(story.cluster_id)
+            self._evict()
+
+        story.sources.add(article.get("source", "unknown"))
+        # Long-running stories keep their first members and a count, so one cluster cannot grow without bound
+        if len(story.entry_ids) < self.settings.news_cluster_max_members:
+            story.entry_ids.add(entry_id)
+            if article.get("url"):
+                story.urls.append(article["url"])
+        else:
+            story.overflow += 1
+        self._entry_index[entry_id] = story.cluster_id
+        self._entry_index.move_to_end(entry_id)
+        while len(self._entry_index) > self.settings.news_cluster_entry_index_size:
+            self._entry_index.popitem(last=False)
+        self._clusters.move_to_end(story.cluster_id)
+        return story
+
+    def _find_match(self, signature: np.ndarray, band_keys: List[int]) -> Optional[StoryCluster]:
+        """Best LSH candidate whose estimated Jaccard similarity clears the threshold"""
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_similarity = None, self.settings.news_cluster_similarity
+        for cluster_id in candidates:
+            story = self._clusters[cluster_id]
+            similarity = float(np.mean(story.signature == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = story, similarity
+        return best
+
+    def _signature(self, text: str) -> np.ndarray:
+        tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+        # Word bigrams: headlines are too short for longer shingles to overlap
+        shingles = {" ".join(tokens[i:i + 2]) for i in range(max(len(tokens) - 1, 1))} or {""}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._perm_a) + self._perm_b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        return [
+            hash((band, signature[band * self.rows:(band + 1) * self.rows].tobytes()))
+            for band in range(self.bands)
+        ]
+
+    def _evict(self):
+        """Drop least recently seen clusters beyond the memory bound"""
+        while len(self._clusters) > self.settings.news_cluster_max_clusters:
+            _, story = self._clusters.popitem(last=False)
+            for key in story.band_keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(story.cluster_id)
+                    if not bucket:
+                        del self._buckets[key]
+            for entry_id in story.entry_ids:
+                if self._entry_index.get(entry_id) == story.cluster_id:
+                    del self._entry_index[entry_id]
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "clusters": len(self._clusters), "buckets": len(self._buckets)}
@@ -0,0 +1,121 @@
+# ================================
+# services/workflow_scheduler.py - Background Workflow Scheduler
+# ================================
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config.settings import DashboardSettings
+from app.utils.rate_limiter import Priority, llm_priority
+
+@dataclass
+class WorkflowSnapshot:
+    """Last successful result of a scheduled workflow"""
+    result: Any
+    completed_at: datetime
+    duration: float
+
+@dataclass
+class ScheduledJob:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    interval: float
+    timeout: float
+    snapshot: Optional[WorkflowSnapshot] = None
+    last_error: Optional[str] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    task: Optional[asyncio.Task] = None
+
+class WorkflowScheduler:
+    """Runs workflows on fixed cadences so routes can serve precomputed snapshots"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._running = False
+
+    def register(self, name: str, run: Callable[[], Awaitable[Any]], interval: float,
+                 timeout: Optional[float] = None):
+        """Register a workflow coroutine factory to run every `interval` seconds"""
+        self.jobs[name] = ScheduledJob(
+            name=name,
+            run=run,
+            interval=interval,
+            timeout=timeout or self.settings.max_workflow_timeout
+        )
+
+    async def start(self):
+        """Start one background loop per registered workflow"""
+        if self._running:
+            return
+        self._running = True
+        for job in self.jobs.values():
+            job.task = asyncio.create_task(self._job_loop(job))
+
+    async def stop(self):
+        """Cancel all background loops and wait for them to exit"""
+        self._running = False
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
+
+    def get_snapshot(self, name: str) -> Optional[WorkflowSnapshot]:
+        """Latest good result for a workflow, or None if it has not completed yet"""
+        return self.jobs[name].snapshot
+
+    async def get_latest(self, name: str) -> Optional[WorkflowSnapshot]:
+        """Latest snapshot; with the scheduler disabled, stale results are refreshed on demand"""
+        job = self.jobs[name]
+        if not self._running:
+            age = None if job.snapshot is None else (datetime.now() - job.snapshot.completed_at).total_seconds()
+            if age is None or age >= job.interval:
+                await self._run_once(job)
+        return job.snapshot
+
+    def get_error(self, name: str) -> Optional[str]:
+        """Error message of the most recent failed run, cleared on success"""
+        return self.jobs[name].last_error
+
+    async def run_now(self, name: str) -> Optional[WorkflowSnapshot]:
+        """Run a workflow immediately unless a run is already in progress"""
+        job = self.jobs[name]
+        await self._run_once(job)
+        return job.snapshot
+
+    async def _job_loop(self, job: ScheduledJob):
+        # Stagger the first runs so startup does not fire every workflow at once
+        await asyncio.sleep(random.uniform(0, min(job.interval, 5)))
+        while self._running:
+            await self._run_once(job)
+            jitter = self.settings.scheduler_jitter_ratio
+            await asyncio.sleep(job.interval * random.uniform(1 - jitter, 1 + jitter))
+
+    async def _run_once(self, job: ScheduledJob):
+        # Overlap protection: a slow run is never joined by a second one
+        if job.lock.locked():
+            return
+
+        async with job.lock:
+            started = time.monotonic()
+            try:
+                # Background refreshes queue behind interactive requests for LLM budget
+                with llm_priority(Priority.BACKGROUND):
+                    result = await asyncio.wait_for(job.run(), timeout=job.timeout)
+                job.snapshot = WorkflowSnapshot(
+                    result=result,
+                    completed_at=datetime.now(),
+                    duration=time.monotonic() - started
+                )
+                job.last_error = None
+            except asyncio.TimeoutError:
+                job.last_error = f"timed out after {job.timeout}s"
+                print(f"Scheduled workflow {job.name} {job.last_error}")
+            except Exception as e:
+                job.last_error = str(e)
+                print(f"Scheduled workflow {job.name} failed: {e}")
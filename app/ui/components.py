@@ -44,7 +44,9 @@ def NewsIntelCard(headline: str, summary: str, relevance_score: int, urgency: st
                 Button("🔍 Analyze", cls="btn-ghost btn-xs"),
                 Button("🚀 Generate", cls="btn-ing-primary btn-xs",
                        hx_post="/api/generate-from-news",
-                       hx_vals=json.dumps({"headline": headline}))
+                       hx_vals=json.dumps({"headline": headline}),
+                       hx_target="#content-workspace",
+                       hx_swap="innerHTML")
             )
         ),
         cls="ing-news-item hover:bg-orange-50 transition-colors mb-2"
@@ -74,7 +76,8 @@ def GEOOptimizationCard(keyword: str, current_position: int, ai_overview_probabi
         CardFooter(
             Button("🎯 Optimize", cls="btn-ing-primary btn-sm w-full",
                    hx_post="/api/trigger-geo-optimization", 
-                   hx_vals=json.dumps({"keyword": keyword}))
+                   hx_vals=json.dumps({"keyword": keyword}),
+                   hx_swap="outerHTML")
         ),
         cls="ing-geo-card mb-3"
     )
@@ -128,7 +131,8 @@ def render_competitive_alerts(alerts: List[Dict]) -> Div:
                 DivFullySpaced(
                     Div(
                         Strong(alert["competitor"], cls=TextT.sm),
-                        P(alert["change_description"], cls=TextT.xs + TextT.muted)
+                        P(alert["change_description"], cls=TextT.xs + TextT.muted),
+                        P(alert.get("detected_at", "")[:16].replace("T", " "), cls=TextT.xs + TextT.muted)
                     ),
                     Button("📊 Analyze", cls="btn-xs")
                 ),
@@ -136,4 +140,112 @@ def render_competitive_alerts(alerts: List[Dict]) -> Div:
             )
         )
     
-    return Div(*alert_items)
\ No newline at end of file
+    return Div(*alert_items)
+
+def render_pending_snapshot(label: str, refresh_url: str, error: str = None) -> Div:
+    """Placeholder shown until the background scheduler has a first result"""
+    message = f"{label} failed: {error}" if error else f"{label} is being prepared..."
+    return Div(
+        DivCentered(
+            Loading(cls=LoadingT.ring + LoadingT.sm),
+            P(message, cls=TextT.xs + TextT.muted + "mt-2"),
+            cls="py-8"
+        ),
+        hx_get=refresh_url,
+        hx_trigger="every 5s",
+        hx_swap="outerHTML"
+    )
+
+def render_content_stream(stream_url: str) -> Div:
+    """Live view of a content generation run fed by Server-Sent Events"""
+    return Div(
+        Div(
+            Loading(cls=LoadingT.dots + LoadingT.sm),
+            P("Starting content generation...", cls=TextT.xs + TextT.muted),
+            id="content-progress",
+            sse_swap="progress",
+            hx_swap="innerHTML",
+            cls="flex items-center gap-2 mb-2"
+        ),
+        Div(id="content-stream", sse_swap="token", hx_swap="beforeend",
+            cls="whitespace-pre-wrap text-sm text-gray-800"),
+        # The final article (or the error panel) replaces the whole live view and closes the
+        # stream; an open stream would reconnect and start the generation again
+        Div(sse_swap="done", hx_target="#content-workspace", hx_swap="innerHTML"),
+        hx_ext="sse",
+        sse_connect=stream_url,
+        sse_close="done"
+    )
+
+def render_stream_progress(message: str, error: bool = False) -> Div:
+    """Status line pushed as the workflow moves between steps"""
+    if error:
+        return Alert(f"Generation failed: {message}", cls=AlertT.error)
+    return Div(
+        Loading(cls=LoadingT.dots + LoadingT.sm),
+        P(message, cls=TextT.xs + TextT.muted),
+        cls="flex items-center gap-2"
+    )
+
+def render_generated_content(result: Dict) -> Div:
+    """Render the finished article with its review status"""
+    article = result.get("final_article", {})
+    status_styles = {"ready": AlertT.success, "review": AlertT.warning}
+    score = article.get("brand_compliance_score")
+
+    return Card(
+        CardHeader(
+            DivFullySpaced(
+                Strong(article.get("title", "Generated article"), cls=TextT.sm),
+                Alert(article.get("status", "review"), cls=status_styles.get(article.get("status"), AlertT.info) + "badge-sm")
+            )
+        ),
+        CardBody(
+            Div(article.get("body", ""), cls="whitespace-pre-wrap text-sm text-gray-800"),
+            P(f"Brand compliance: {score}%" if score is not None else "", cls=TextT.xs + TextT.muted + "mt-2"),
+            P(article.get("revision_notes", ""), cls=TextT.xs + TextT.muted)
+        ),
+        cls="mb-2"
+    )
+
+def render_job_status(job, poll_interval: int = 2) -> Div:
+    """Job progress that polls its status endpoint until the job finishes"""
+    if job.status == "failed":
+        return Alert(f"{job.kind.replace('_', ' ').title()} failed: {job.error}", cls=AlertT.error)
+    if job.status == "succeeded":
+        return Alert(f"✅ {job.message}", cls=AlertT.success)
+
+    return Div(
+        DivFullySpaced(
+            P(job.message, cls=TextT.xs + TextT.muted),
+            Span(f"{int(job.progress * 100)}%", cls=TextT.xs)
+        ),
+        Progress(value=int(job.progress * 100), max=100, cls="progress progress-info w-full"),
+        hx_get=f"/api/jobs/{job.id}",
+        hx_trigger=f"every {poll_interval}s",
+        hx_swap="outerHTML"
+    )
+
+def render_latency_panel(nodes: List[Dict], llm_calls: List[Dict]) -> Div:
+    """p50/p95 wall time per workflow node and per agent LLM call"""
+    if not nodes and not llm_calls:
+        return P("No workflow runs recorded yet", cls=TextT.muted + "text-center py-4")
+
+    def latency_table(title: str, label_columns: List[str], rows: List[Dict]):
+        return Div(
+            H4(title, cls=TextT.sm + TextT.bold + " mb-2"),
+            Table(
+                Thead(Tr(*[Th(c.replace("_", " ").title()) for c in label_columns], Th("Runs"), Th("p50 (s)"), Th("p95 (s)"))),
+                Tbody(*[
+                    Tr(*[Td(row.get(c, "")) for c in label_columns], Td(row["count"]), Td(row["p50"]), Td(row["p95"]))
+                    for row in rows
+                ]),
+                cls="table table-xs"
+            ),
+            cls="mb-4"
+        )
+
+    return Div(
+        latency_table("Workflow nodes", ["workflow", "node", "status"], nodes),
+        latency_table("Agent LLM calls", ["agent", "deployment", "cache"], llm_calls)
+    )
@@ -126,6 +126,22 @@ def create_ing_dashboard():
                 cls="ing-card-competitive"
             ),
             
+            # Workflow Latency (p50/p95 per node and agent)
+            Card(
+                CardHeader(
+                    H3("Workflow Latency", cls=TextT.lg + TextT.bold)
+                ),
+                CardBody(
+                    Div(
+                        id="latency-panel",
+                        hx_get="/api/latency-panel",
+                        hx_trigger="load, every 30s",
+                        hx_swap="innerHTML"
+                    )
+                ),
+                cls="ing-card-latency mt-8"
+            ),
+            
             cls=ContainerT.xl + " py-6"
         ),
         
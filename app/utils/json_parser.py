@@ -1,30 +1,201 @@
-"""
-Robust JSON parsing for LLM responses
-"""
+# ================================
+# utils/json_parser.py - Robust JSON Parsing for LLM Responses
+# ================================
+
 import json
 import re
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_OPENERS = {"{": "}", "[": "]"}
+_CLOSERS = {"}": "{", "]": "["}
+_STRUCTURAL = re.compile(r'["\\{}\[\]]')
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None)
+}
+
+class JSONStreamScanner:
+    """Incremental bracket matcher that finds complete JSON values in text as it arrives
+
+    Scanning resumes where the previous chunk ended, so feeding a streamed response chunk
+    by chunk costs the same as scanning it whole. Text outside brackets (prose, markdown fences) is ignored.
+    """
+
+    def __init__(self, emit_array_items: bool = False):
+        # When set, objects inside the outermost array are collected for take_items() as
+        # soon as they close, and their enclosing value is not returned again by feed()
+        self.emit_array_items = emit_array_items
+        self._items: List[str] = []
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[Tuple[str, int]] = []  # (opener, start offset)
+        self._in_string = False
+        self._skip_to = 0  # offset after an escaped character inside a string
+        self._value_items = 0  # array items already emitted from the open top-level value
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add text and return the raw JSON of every value completed by it"""
+        self.buffer += chunk
+        completed = []
+        buffer, stack = self.buffer, self._stack
+        # Only quotes, backslashes and brackets can change state, so jump between them
+        for match in _STRUCTURAL.finditer(buffer, self._pos):
+            i, char = match.start(), match.group()
+            if i < self._skip_to:
+                continue
+            if self._in_string:
+                if char == "\\":
+                    self._skip_to = i + 2
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only matter inside a value; quoted prose around it is skipped
+                self._in_string = bool(stack)
+            elif char in _OPENERS:
+                if not stack:
+                    self._value_items = 0
+                stack.append((char, i))
+            elif char in _CLOSERS and stack:
+                opener, start = stack.pop()
+                if opener != _CLOSERS[char]:
+                    # Mismatched bracket: the value is broken, start over from here
+                    stack.clear()
+                    continue
+                if not stack:
+                    # A value whose items were already emitted is not repeated as a whole
+                    if not self._value_items:
+                        completed.append(buffer[start:i + 1])
+                elif self.emit_array_items and opener == "{" and self._outermost_array_parent():
+                    self._items.append(buffer[start:i + 1])
+                    self._value_items += 1
+        self._pos = len(buffer)
+        return completed
 
-def extract_json_from_response(response_text: str) -> Optional[Dict]:
-    """Extract JSON from LLM response, handling markdown code blocks"""
+    def _outermost_array_parent(self) -> bool:
+        """True when the innermost open container is the first array in the stack"""
+        return self._stack[-1][0] == "[" and all(opener == "{" for opener, _ in self._stack[:-1])
+
+    def take_items(self) -> List[str]:
+        """Raw JSON of array items closed since the last call"""
+        items, self._items = self._items, []
+        return items
+
+def _strip_fences(text: str) -> str:
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else ""
+        if cleaned.rstrip().endswith("```"):
+            cleaned = cleaned.rstrip()[:-3]
+    return cleaned.strip()
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """Every complete top-level JSON object or array embedded in text"""
+    for raw in JSONStreamScanner().feed(text):
+        try:
+            yield json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+
+def repair_json(text: str, max_cutbacks: int = 3) -> Optional[Any]:
+    """Best-effort fix for truncated output: close the open string and brackets, cutting
+    back to an earlier member boundary when the last member is incomplete"""
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None
+    fragment = text[min(starts):]
+
+    stack: List[str] = []
+    in_string, escaped, end = False, False, len(fragment)
+    boundaries: List[Tuple[int, str]] = []  # (comma offset, closers needed there)
+    for i, char in enumerate(fragment):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _OPENERS:
+            stack.append(_OPENERS[char])
+        elif char in _CLOSERS:
+            if not stack or stack[-1] != char:
+                end = i
+                break
+            stack.pop()
+            if not stack:
+                end = i + 1
+                break
+        elif char == ",":
+            boundaries.append((i, "".join(reversed(stack))))
+
+    tail = fragment[:end]
+    if in_string:
+        tail = (tail[:-1] if escaped else tail) + '"'
+    candidates = [tail.rstrip().rstrip(",") + "".join(reversed(stack))]
+    candidates += [fragment[:i] + closers for i, closers in reversed(boundaries[-max_cutbacks:])]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def extract_json_from_response(response_text: str) -> Optional[Any]:
+    """Extract JSON from LLM response, handling markdown code blocks, prose and truncation"""
     if not response_text:
         return None
-    
-    # Remove markdown code blocks
-    cleaned = re.sub(r'```json\s*', '', response_text)
-    cleaned = re.sub(r'```\s*', '', cleaned)
-    cleaned = cleaned.strip()
-    
+
+    cleaned = _strip_fences(response_text)
     try:
         return json.loads(cleaned)
     except json.JSONDecodeError:
-        # Try to find JSON within the text
-        json_match = re.search(r'\{.*\}|\[.*\]', cleaned, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                pass
-    
-    print(f"Failed to parse JSON from response: {response_text[:200]}...")
-    return None
\ No newline at end of file
+        pass
+
+    for value in iter_json_values(cleaned):
+        return value
+
+    repaired = repair_json(cleaned)
+    if repaired is None:
+        print(f"Failed to parse JSON from response: {response_text[:200]}...")
+    return repaired
+
+def validate_json(value: Any, schema: Dict, path: str = "$") -> List[str]:
+    """Check a value against a JSON Schema subset (type, required, properties, items, enum, bounds)"""
+    errors = []
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_is_type(value, t) for t in types):
+            return [f"{path}: expected {' or '.join(types)}, got {type(value).__name__}"]
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} is below {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} is above {schema['maximum']}")
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing required field '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate_json(value[key], subschema, f"{path}.{key}"))
+    elif isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate_json(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+def _is_type(value: Any, expected: str) -> bool:
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, _TYPES.get(expected, object))
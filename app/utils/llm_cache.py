@@ -0,0 +1,185 @@
+# ================================
+# utils/llm_cache.py - Content-Addressed LLM Response Cache
+# ================================
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import DashboardSettings
+from app.utils.result_cache import fingerprint
+
+@dataclass
+class CachedResponse:
+    content: str
+    total_tokens: int
+
+def llm_cache_key(deployment: str, messages: List[Dict], temperature: float, max_tokens: int,
+                  extra: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of everything that determines a completion"""
+    return fingerprint(deployment, messages, temperature, max_tokens, extra or {})
+
+class MemoryCacheBackend:
+    """Size-bounded in-process LRU"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def set(self, key: str, response: CachedResponse, ttl: float):
+        self._entries[key] = (time.time() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self):
+        self._entries.clear()
+
+class SQLiteCacheBackend:
+    """Size-bounded LRU persisted in SQLite so cached answers survive restarts"""
+
+    EVICT_EVERY = 50  # writes between eviction sweeps
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._db = None
+        self._init_lock = asyncio.Lock()
+        self._writes = 0
+
+    async def _connection(self):
+        async with self._init_lock:
+            if self._db is None:
+                import aiosqlite
+                self._db = await aiosqlite.connect(self.path)
+                await self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                    "key TEXT PRIMARY KEY, content TEXT NOT NULL, total_tokens INTEGER NOT NULL, "
+                    "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                await self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_access "
+                    "ON llm_response_cache (last_access)"
+                )
+                await self._db.commit()
+        return self._db
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        db = await self._connection()
+        async with db.execute(
+            "SELECT content, total_tokens, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if row[2] < now:
+            await db.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+            await db.commit()
+            return None
+
+        await db.execute("UPDATE llm_response_cache SET last_access = ? WHERE key = ?", (now, key))
+        await db.commit()
+        return CachedResponse(content=row[0], total_tokens=row[1])
+
+    async def set(self, key: str, response: CachedResponse, ttl: float):
+        db = await self._connection()
+        now = time.time()
+        await db.execute(
+            "INSERT OR REPLACE INTO llm_response_cache (key, content, total_tokens, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, response.content, response.total_tokens, now + ttl, now)
+        )
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            await db.execute("DELETE FROM llm_response_cache WHERE expires_at < ?", (now,))
+            await db.execute(
+                "DELETE FROM llm_response_cache WHERE key IN ("
+                "SELECT key FROM llm_response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        await db.commit()
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+def _sqlite_path(database_url: str) -> Optional[str]:
+    """Filesystem path from a sqlite:/// URL, or None for other databases"""
+    for prefix in ("sqlite+aiosqlite:///", "sqlite:///"):
+        if database_url.startswith(prefix):
+            return database_url[len(prefix):]
+    return None
+
+class LLMResponseCache:
+    """Caches low-temperature agent completions with per-agent TTLs and hit statistics"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.backend = self._create_backend()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _create_backend(self):
+        if self.settings.llm_cache_backend == "sqlite":
+            path = _sqlite_path(self.settings.database_url)
+            if path is not None:
+                return SQLiteCacheBackend(path, self.settings.llm_cache_max_entries)
+            print(f"LLM cache needs a SQLite database_url, using memory instead of {self.settings.database_url}")
+        return MemoryCacheBackend(self.settings.llm_cache_max_entries)
+
+    def is_cacheable(self, agent_name: str, temperature: float) -> bool:
+        """Only near-deterministic calls for agents with a configured TTL are cached"""
+        return (
+            self.settings.llm_cache_ttls.get(agent_name, 0) > 0
+            and temperature <= self.settings.llm_cache_max_temperature
+        )
+
+    def _agent_stats(self, agent_name: str) -> Dict[str, int]:
+        return self.stats.setdefault(agent_name, {"hits": 0, "misses": 0, "tokens_saved": 0})
+
+    async def get(self, agent_name: str, key: str) -> Optional[str]:
+        stats = self._agent_stats(agent_name)
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            print(f"LLM cache read failed for {agent_name}: {e}")
+            cached = None
+
+        if cached is None:
+            stats["misses"] += 1
+            return None
+        stats["hits"] += 1
+        stats["tokens_saved"] += cached.total_tokens
+        return cached.content
+
+    async def set(self, agent_name: str, key: str, content: str, total_tokens: int):
+        ttl = self.settings.llm_cache_ttls.get(agent_name, 0)
+        try:
+            await self.backend.set(key, CachedResponse(content=content, total_tokens=total_tokens), ttl)
+        except Exception as e:
+            print(f"LLM cache write failed for {agent_name}: {e}")
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Hits, misses, hit rate and tokens saved per agent"""
+        report = {}
+        for agent_name, stats in self.stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            report[agent_name] = {**stats, "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0}
+        return report
+
+    async def close(self):
+        await self.backend.close()
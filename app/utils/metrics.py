@@ -0,0 +1,138 @@
+# ================================
+# utils/metrics.py - In-Process Histograms and Prometheus Export
+# ================================
+
+import bisect
+import functools
+import time
+import numpy as np
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds: LLM calls range from cache hits to multi-minute rewrites
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in (labels or {}).items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+class Histogram:
+    """Cumulative bucket counts for export plus recent samples for percentiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, reservoir_size: int = 1024):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=reservoir_size)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def percentiles(self, *quantiles: float) -> List[float]:
+        if not self.recent:
+            return [0.0 for _ in quantiles]
+        return [float(v) for v in np.percentile(np.fromiter(self.recent, dtype=np.float64), quantiles)]
+
+class MetricsRegistry:
+    """Labelled counters and histograms, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[Dict[str, Any]] = None):
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        series = self._histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def summarize(self, name: str) -> List[Dict[str, Any]]:
+        """p50/p95 and counts per label set of one histogram, slowest p95 first"""
+        rows = []
+        for key, histogram in self._histograms.get(name, {}).items():
+            p50, p95 = histogram.percentiles(50, 95)
+            rows.append({
+                **dict(key),
+                "count": histogram.count,
+                "p50": round(p50, 3),
+                "p95": round(p95, 3),
+                "mean": round(histogram.sum / histogram.count, 3) if histogram.count else 0.0
+            })
+        return sorted(rows, key=lambda row: row["p95"], reverse=True)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for name, series in sorted(self._counters.items()):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+
+        for name, series in sorted(self._histograms.items()):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in series.items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+METRICS.describe("workflow_node_duration_seconds", "Wall time of each LangGraph node")
+METRICS.describe("llm_request_duration_seconds", "Wall time of agent LLM calls including queueing")
+METRICS.describe("llm_queue_wait_seconds", "Time agent LLM calls waited for rate-limit budget")
+METRICS.describe("llm_time_to_first_token_seconds", "Time from request to first streamed token")
+METRICS.describe("llm_requests_total", "Agent LLM calls by cache status")
+METRICS.describe("llm_prompt_tokens_total", "Prompt tokens reported by Azure usage")
+METRICS.describe("llm_completion_tokens_total", "Completion tokens reported by Azure usage")
+METRICS.describe("llm_structured_outputs_total", "Agent JSON answers by parse outcome")
+METRICS.describe("geo_keywords_total", "GEO run keywords optimized or skipped as unchanged")
+
+def node_timer(workflow: str, enabled: bool = True) -> Callable[[str, Callable], Callable]:
+    """Wraps LangGraph node functions so each run records its wall time"""
+    def wrap(node: str, fn: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+        if not enabled:
+            return fn
+
+        @functools.wraps(fn)
+        async def timed(state):
+            started = time.perf_counter()
+            status = "error"
+            try:
+                result = await fn(state)
+                status = "ok"
+                return result
+            finally:
+                METRICS.observe("workflow_node_duration_seconds", time.perf_counter() - started,
+                                {"workflow": workflow, "node": node, "status": status})
+        return timed
+    return wrap
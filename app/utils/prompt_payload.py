@@ -0,0 +1,129 @@
+# ================================
+# utils/prompt_payload.py - Compact Prompt Serialization
+# ================================
+
+import html
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+from app.config.settings import DashboardSettings
+from app.utils.token_counter import count_tokens
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Fields each prompt input actually needs; everything else (raw feed entries, URLs,
+# internal IDs) is dropped before serialization
+PAYLOAD_FIELDS = {
+    "rss_articles": ["headline", "summary", "source", "sources", "published_date"],
+    "relevant_news": ["headline", "summary", "urgency_level", "target_keywords", "content_angle", "customer_impact"],
+    "competitor_snippets": ["keyword", "domain", "title", "snippet", "position"]
+}
+
+HTML_FIELDS = ("summary", "snippet", "title", "headline")
+
+def strip_html(text: str) -> str:
+    """Remove tags and entities and collapse whitespace"""
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+def compact_json(data: Any) -> str:
+    """Serialize without indentation or ASCII escaping"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def project(records: List[Dict], fields: Sequence[str]) -> List[Dict]:
+    """Keep only the listed fields, skipping empty values"""
+    projected = []
+    for record in records:
+        item = {}
+        for name in fields:
+            value = record.get(name)
+            if value in (None, "", [], {}):
+                continue
+            item[name] = strip_html(value) if name in HTML_FIELDS and isinstance(value, str) else value
+        projected.append(item)
+    return projected
+
+def _truncate_strings(data: Any, max_chars: int) -> Any:
+    if isinstance(data, str):
+        return data if len(data) <= max_chars else data[:max_chars].rstrip() + "…"
+    if isinstance(data, dict):
+        return {key: _truncate_strings(value, max_chars) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_truncate_strings(value, max_chars) for value in data]
+    return data
+
+class PromptPayloadBuilder:
+    """Projects, compacts and budget-truncates agent prompt inputs, tracking token savings"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def build(self, agent_name: str, data: Any, fields: Optional[Sequence[str]] = None,
+              budget_share: float = 1.0, model: str = "gpt-4o-mini") -> str:
+        """Serialize `data` for a prompt within the agent's token budget"""
+        budget = int(self.settings.prompt_token_budgets.get(agent_name, 4000) * budget_share)
+        # Serializing and tokenizing the raw input (feed entries included) is only needed for the
+        # savings statistic, so it happens only when that statistic is switched on
+        tokens_before = None
+        if self.settings.prompt_savings_stats:
+            tokens_before = count_tokens(json.dumps(data, indent=2, default=str), model)
+
+        if isinstance(data, list) and fields:
+            data = project(data, fields)
+        data = _truncate_strings(data, self.settings.prompt_max_field_chars)
+
+        payload = compact_json(data)
+        tokens_after = count_tokens(payload, model)
+
+        if tokens_after > budget:
+            payload, tokens_after = self._fit_to_budget(data, budget, model)
+
+        stats = self.stats.setdefault(agent_name, {"payloads": 0, "tokens_after": 0})
+        stats["payloads"] += 1
+        stats["tokens_after"] += tokens_after
+        if tokens_before is not None:
+            # Both sides exact, counted over the same payloads
+            stats["measured_after"] = stats.get("measured_after", 0) + tokens_after
+            stats["tokens_before"] = stats.get("tokens_before", 0) + tokens_before
+        return payload
+
+    def _fit_to_budget(self, data: Any, budget: int, model: str):
+        """Drop trailing list items (inputs arrive ranked), then shorten long strings"""
+        if isinstance(data, list):
+            low, high = 0, len(data)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if count_tokens(compact_json(data[:middle]), model) <= budget:
+                    low = middle
+                else:
+                    high = middle - 1
+            if low > 0:
+                payload = compact_json(data[:low])
+                return payload, count_tokens(payload, model)
+            data = data[:1]
+
+        max_chars = self.settings.prompt_max_field_chars
+        payload = compact_json(data)
+        tokens = count_tokens(payload, model)
+        while tokens > budget and max_chars > 40:
+            max_chars //= 2
+            payload = compact_json(_truncate_strings(data, max_chars))
+            tokens = count_tokens(payload, model)
+        return payload, tokens
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Prompt tokens per agent, with compaction savings when prompt_savings_stats is on"""
+        report = {}
+        for agent_name, stats in self.stats.items():
+            report[agent_name] = {"payloads": stats["payloads"], "tokens_after": stats["tokens_after"]}
+            if stats.get("tokens_before"):
+                saved = stats["tokens_before"] - stats["measured_after"]
+                report[agent_name].update({
+                    "tokens_before": stats["tokens_before"],
+                    "tokens_saved": saved,
+                    "reduction": round(saved / stats["tokens_before"], 3)
+                })
+        return report
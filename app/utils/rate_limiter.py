@@ -0,0 +1,182 @@
+# ================================
+# utils/rate_limiter.py - LLM Rate Limiting and Concurrency Governor
+# ================================
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+from app.config.settings import DashboardSettings
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Run LLM calls made inside this block (and tasks it spawns) at the given priority"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+class TokenBucket:
+    """Continuously refilling budget, e.g. requests or tokens per minute"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be consumed (requests above capacity wait for a full bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float):
+        """Take from the bucket; may go negative when reconciling actual usage"""
+        self._refill()
+        self.available -= amount
+
+@dataclass
+class DeploymentBudget:
+    requests: TokenBucket
+    tokens: TokenBucket
+    blocked_until: float = 0.0
+    waiters: List[Tuple[int, int]] = field(default_factory=list)
+
+    def wait_time(self, estimated_tokens: int) -> float:
+        blocked = max(0.0, self.blocked_until - time.monotonic())
+        return max(blocked, self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+
+class LLMRateLimiter:
+    """RPM/TPM budgets per deployment plus a global in-flight cap, served in priority order"""
+
+    def __init__(self, settings: Optional[DashboardSettings] = None):
+        self.settings = settings or DashboardSettings()
+        self.max_concurrent = self.settings.llm_max_concurrent_requests
+        self._in_flight = 0
+        self._budgets: Dict[str, DeploymentBudget] = {}
+        # Deployment queue heads whose budget is available, competing for the global slots
+        self._ready: List[Tuple[int, int]] = []
+        self._condition = asyncio.Condition()
+        self._sequence = itertools.count()
+
+    def _budget(self, deployment: str) -> DeploymentBudget:
+        budget = self._budgets.get(deployment)
+        if budget is None:
+            rpm = self._limit(self.settings.llm_requests_per_minute, deployment,
+                              self.settings.llm_default_requests_per_minute)
+            tpm = self._limit(self.settings.llm_tokens_per_minute, deployment,
+                              self.settings.llm_default_tokens_per_minute)
+            budget = DeploymentBudget(
+                requests=TokenBucket(rpm, rpm / 60.0),
+                tokens=TokenBucket(tpm, tpm / 60.0)
+            )
+            self._budgets[deployment] = budget
+        return budget
+
+    def _limit(self, limits: Dict[str, int], deployment: str, default: int) -> int:
+        """Limit for a deployment, given by its name or by its tier ("full"/"mini") in settings"""
+        if deployment in limits:
+            return limits[deployment]
+        tiers = {
+            self.settings.azure_openai_full_deployment: "full",
+            self.settings.azure_openai_mini_deployment: "mini"
+        }
+        return limits.get(tiers.get(deployment, ""), default)
+
+    @asynccontextmanager
+    async def acquire(self, deployment: str, estimated_tokens: int, priority: Optional[Priority] = None):
+        """Wait for budget and a concurrency slot; yields the time spent queued"""
+        priority = current_priority() if priority is None else priority
+        queued_at = time.monotonic()
+        await self._acquire(deployment, estimated_tokens, priority)
+        try:
+            yield time.monotonic() - queued_at
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def _acquire(self, deployment: str, estimated_tokens: int, priority: Priority):
+        budget = self._budget(deployment)
+        entry = (int(priority), next(self._sequence))
+
+        async with self._condition:
+            heapq.heappush(budget.waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    # Only the head of the queue may take budget, so callers are served
+                    # by priority and then FIFO instead of whoever polls first
+                    if budget.waiters[0] == entry:
+                        timeout = budget.wait_time(estimated_tokens)
+                        if timeout <= 0:
+                            timeout = None
+                            if entry not in self._ready:
+                                heapq.heappush(self._ready, entry)
+                                self._condition.notify_all()
+                            # Global slots also go by priority across deployments
+                            if self._ready[0] == entry and self._in_flight < self.max_concurrent:
+                                heapq.heappop(self._ready)
+                                heapq.heappop(budget.waiters)
+                                budget.requests.consume(1)
+                                budget.tokens.consume(estimated_tokens)
+                                self._in_flight += 1
+                                self._condition.notify_all()
+                                return
+                        elif entry in self._ready:
+                            # Budget was withdrawn (e.g. a 429 penalty); let other deployments go first
+                            self._ready.remove(entry)
+                            heapq.heapify(self._ready)
+                            self._condition.notify_all()
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._ready:
+                    self._ready.remove(entry)
+                    heapq.heapify(self._ready)
+                if entry in budget.waiters:
+                    budget.waiters.remove(entry)
+                    heapq.heapify(budget.waiters)
+                self._condition.notify_all()
+                raise
+
+    def record_usage(self, deployment: str, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once the real usage is known"""
+        self._budget(deployment).tokens.consume(actual_tokens - estimated_tokens)
+
+    def penalize(self, deployment: str, seconds: float):
+        """Hold all calls to a deployment, e.g. for a 429 Retry-After period"""
+        budget = self._budget(deployment)
+        budget.blocked_until = max(budget.blocked_until, time.monotonic() + seconds)
+
+    def get_stats(self) -> Dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": {name: len(budget.waiters) for name, budget in self._budgets.items()}
+        }
@@ -0,0 +1,97 @@
+# ================================
+# utils/result_cache.py - Single-Flight TTL Result Cache
+# ================================
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of JSON-serializable inputs, used as a cache key"""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SingleFlightCache:
+    """TTL cache where concurrent misses for the same key share one computation
+
+    With `stale_ttl`, an entry past its TTL is still served for that long while a
+    single background refresh replaces it (stale-while-revalidate).
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 64, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "stale": 0, "refresh_errors": 0}
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, or compute it once for all waiting callers"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale"] += 1
+                if key not in self._in_flight:
+                    self._start(key, factory).add_done_callback(self._log_refresh_error(key))
+                return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = self._start(key, factory)
+
+        # Shield so a disconnecting client does not cancel the run for the others
+        return await asyncio.shield(task)
+
+    def _start(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.ensure_future(self._compute(key, factory))
+        # Failures are re-raised to every waiter; this only silences the
+        # "never retrieved" warning when all waiters have gone away
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._in_flight[key] = task
+        return task
+
+    def _log_refresh_error(self, key: str) -> Callable[[asyncio.Task], None]:
+        def callback(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                # The stale entry stays in place until its stale window runs out
+                self.stats["refresh_errors"] += 1
+                print(f"Background refresh of {key} failed: {task.exception()!r}")
+        return callback
+
+    async def _compute(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await factory()
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached entry, or all of them"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters plus current cache occupancy"""
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight)
+        }
@@ -0,0 +1,168 @@
+# ================================
+# utils/serp_parser.py - Single-Pass SERP HTML Parser
+# ================================
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urljoin, urlparse
+
+# Inline scripts and styles are most of a saved results page and carry no result text
+_NON_CONTENT = re.compile(r"<(script|style|noscript|svg)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+@dataclass(frozen=True)
+class SerpMarkup:
+    """Attributes that identify each part of a results page; class markers match one class token"""
+    overview: Tuple[str, str] = ("data-attrid", "AIOverview")
+    overview_source: Tuple[str, str] = ("class", "aio-source")
+    result: Tuple[str, str] = ("class", "g")
+    snippet: Tuple[str, str] = ("class", "VwiC3b")
+    source_snippet: Tuple[str, str] = ("class", "gxZfx")
+    title_tag: str = "h3"
+    base_url: str = "https://www.google.com"
+
+def domain_of(url: str) -> str:
+    return urlparse(url).netloc.lower().removeprefix("www.")
+
+class _Region:
+    """An element being collected, closed when its tag's nesting depth returns to zero"""
+    __slots__ = ("tag", "depth", "url", "title", "link_text", "snippet", "rest")
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.depth = 1
+        self.url = ""
+        self.title: List[str] = []
+        self.link_text: List[str] = []
+        self.snippet: List[str] = []
+        self.rest: List[str] = []
+
+class SerpParser(HTMLParser):
+    """Collects AI Overview text, its cited sources and organic results in one pass over the page"""
+
+    def __init__(self, markup: Optional[SerpMarkup] = None, snippet_max_chars: int = 300):
+        super().__init__(convert_charrefs=True)
+        self.markup = markup or SerpMarkup()
+        self.snippet_max_chars = snippet_max_chars
+        self.overview_text: List[str] = []
+        self.has_overview = False
+        self.sources: List[Dict] = []
+        self.results: List[Dict] = []
+        self._overview: Optional[_Region] = None
+        self._item: Optional[_Region] = None  # current source card or organic result
+        self._item_kind = ""
+        self._in_title = 0
+        self._in_link = False
+        self._in_snippet: Optional[_Region] = None
+
+    @staticmethod
+    def _matches(attrs: List[Tuple[str, Optional[str]]], marker: Tuple[str, str]) -> bool:
+        name, value = marker
+        for attr, attr_value in attrs:
+            if attr == name and attr_value is not None:
+                return value in attr_value.split() if name == "class" else attr_value == value
+        return False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        markup = self.markup
+        for region in (self._overview, self._item, self._in_snippet):
+            if region is not None and region.tag == tag:
+                region.depth += 1
+
+        if self._overview is None and self._item is None and self._matches(attrs, markup.overview):
+            self._overview = _Region(tag)
+            self.has_overview = True
+        elif self._item is None and self._overview is not None and self._matches(attrs, markup.overview_source):
+            self._item, self._item_kind = _Region(tag), "source"
+        elif self._item is None and self._overview is None and self._matches(attrs, markup.result):
+            self._item, self._item_kind = _Region(tag), "result"
+        elif self._item is not None:
+            if tag == "a" and not self._item.url:
+                self._item.url = self._resolve(dict(attrs).get("href") or "")
+                self._in_link = True
+            elif tag == markup.title_tag:
+                self._in_title += 1
+            elif self._in_snippet is None and self._matches(
+                    attrs, markup.source_snippet if self._item_kind == "source" else markup.snippet):
+                self._in_snippet = _Region(tag)
+
+    def handle_endtag(self, tag: str):
+        if self._in_snippet is not None and self._in_snippet.tag == tag:
+            self._in_snippet.depth -= 1
+            if not self._in_snippet.depth:
+                self._in_snippet = None
+        if self._item is not None:
+            if tag == "a":
+                self._in_link = False
+            if tag == self.markup.title_tag and self._in_title:
+                self._in_title -= 1
+            if self._item.tag == tag:
+                self._item.depth -= 1
+                if not self._item.depth:
+                    self._close_item()
+        if self._overview is not None and self._overview.tag == tag:
+            self._overview.depth -= 1
+            if not self._overview.depth:
+                self._overview = None
+
+    def handle_data(self, data: str):
+        item = self._item
+        if item is None:
+            if self._overview is not None:
+                self.overview_text.append(data)
+            return
+        if self._in_title:
+            item.title.append(data)
+        elif self._in_snippet is not None:
+            item.snippet.append(data)
+        elif self._in_link:
+            item.link_text.append(data)
+        else:
+            item.rest.append(data)
+
+    def _close_item(self):
+        item, kind = self._item, self._item_kind
+        self._item, self._item_kind, self._in_title, self._in_link, self._in_snippet = None, "", 0, False, None
+        if not item.url.startswith("http"):
+            return
+        records = self.sources if kind == "source" else self.results
+        # Source cards often have no heading or snippet block: fall back to link text and card text
+        snippet = item.snippet or (item.rest if kind == "source" else [])
+        records.append({
+            "domain": domain_of(item.url),
+            "url": item.url,
+            "title": self._clean(item.title or item.link_text),
+            "snippet": self._clean(snippet)[:self.snippet_max_chars],
+            "position": len(records) + 1
+        })
+
+    def _resolve(self, href: str) -> str:
+        """Absolute target URL, unwrapping /url?q= redirect links"""
+        if href.startswith("/url?"):
+            query = parse_qs(urlparse(href).query)
+            target = query.get("q") or query.get("url")
+            return target[0] if target else ""
+        return urljoin(self.markup.base_url, href) if href.startswith("/") else href
+
+    @staticmethod
+    def _clean(parts: List[str]) -> str:
+        return _WHITESPACE.sub(" ", "".join(parts)).strip()
+
+def parse_serp(html: str, keyword: str, markup: Optional[SerpMarkup] = None,
+               snippet_max_chars: int = 300) -> Dict:
+    """Compact records for one results page: the AI Overview (empty if absent) and organic results"""
+    parser = SerpParser(markup, snippet_max_chars)
+    parser.feed(_NON_CONTENT.sub(" ", html))
+    parser.close()
+    for record in parser.sources + parser.results:
+        record["keyword"] = keyword
+
+    ai_overview = {}
+    if parser.has_overview:
+        ai_overview = {
+            "text": SerpParser._clean(parser.overview_text),
+            "sources": parser.sources
+        }
+    return {"keyword": keyword, "ai_overview": ai_overview, "organic_results": parser.results}
@@ -0,0 +1,42 @@
+# ================================
+# utils/token_counter.py - Prompt Token Estimation
+# ================================
+
+from functools import lru_cache
+from typing import Dict, List
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Tokenizer for a deployment, or None when tiktoken is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Azure deployment names are free-form; gpt-4o family uses o200k
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"Tokenizer unavailable for {model}, using estimate: {e}")
+        return None
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate from character length (~4 characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Count tokens in text, falling back to ~4 characters per token"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def count_message_tokens(messages: List[Dict], model: str = "gpt-4o-mini") -> int:
+    """Count prompt tokens for a chat request, including per-message framing"""
+    return 3 + sum(4 + count_tokens(message.get("content") or "", model) for message in messages)
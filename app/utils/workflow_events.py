@@ -0,0 +1,44 @@
+# ================================
+# utils/workflow_events.py - Progress and Token Events from Running Workflows
+# ================================
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Optional, Tuple
+
+class WorkflowEventStream:
+    """Queue of (event, data) pairs emitted by one workflow run"""
+
+    def __init__(self):
+        self._queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue()
+
+    def emit(self, event: str, data: Any):
+        self._queue.put_nowait((event, data))
+
+    def close(self):
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            yield item
+
+_current_stream: ContextVar[Optional[WorkflowEventStream]] = ContextVar("workflow_event_stream", default=None)
+
+@contextmanager
+def workflow_events(stream: WorkflowEventStream):
+    """Route events emitted in this context (and tasks it spawns) to `stream`"""
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+def emit_event(event: str, data: Any):
+    """Emit to the current run's stream; a no-op when nobody is listening"""
+    stream = _current_stream.get()
+    if stream is not None:
+        stream.emit(event, data)
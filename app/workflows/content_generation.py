@@ -2,36 +2,54 @@
 # workflows/content_generation.py - Content Creation Workflow
 # ================================
 
-from typing import TypedDict, Dict
+import asyncio
+from typing import Any, AsyncIterator, TypedDict, Dict, List, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from app.config.azure_config import AzureAIConfig
+from app.config.settings import DashboardSettings
 from app.agents.content_optimizer import ContentOptimizer
 from app.agents.brand_enforcer import BrandEnforcer
+from app.services.checkpoint_store import CheckpointStore
+from app.utils.metrics import node_timer
+from app.utils.result_cache import fingerprint
+from app.utils.workflow_events import WorkflowEventStream, emit_event, workflow_events
 
 class ContentGenState(TypedDict):
     opportunity_id: str
+    news_headline: str
+    generation_type: str
+    target_keywords: List[str]
     content_brief: Dict
     generated_content: str
     brand_compliance: Dict
     seo_optimization: Dict
     final_article: Dict
     timestamp: str
+    workflow_id: str
 
 class ContentGenerationWorkflow:
-    def __init__(self, azure_config: AzureAIConfig):
+    def __init__(self, azure_config: AzureAIConfig, settings: Optional[DashboardSettings] = None):
         self.azure_config = azure_config
+        self.settings = settings or DashboardSettings()
         self.content_optimizer = ContentOptimizer(azure_config)
         self.brand_enforcer = BrandEnforcer(azure_config)
+        self.checkpoints: Optional[CheckpointStore] = None
         self.workflow = self._create_workflow()
     
-    def _create_workflow(self):
+    def enable_checkpointing(self, checkpoints: CheckpointStore):
+        """Recompile with a checkpointer so interrupted runs resume from their last node"""
+        self.checkpoints = checkpoints
+        self.workflow = self._create_workflow(checkpoints.saver)
+    
+    def _create_workflow(self, checkpointer=None):
+        timed = node_timer("content_generation", self.settings.enable_workflow_logging)
         workflow = StateGraph(ContentGenState)
         
-        workflow.add_node("create_brief", self._create_content_brief)
-        workflow.add_node("generate_content", self._generate_initial_content)
-        workflow.add_node("enforce_brand", self._enforce_brand_voice)
-        workflow.add_node("optimize_seo", self._optimize_for_seo)
-        workflow.add_node("final_review", self._final_quality_review)
+        workflow.add_node("create_brief", timed("create_brief", self._create_content_brief))
+        workflow.add_node("generate_content", timed("generate_content", self._generate_initial_content))
+        workflow.add_node("enforce_brand", timed("enforce_brand", self._enforce_brand_voice))
+        workflow.add_node("optimize_seo", timed("optimize_seo", self._optimize_for_seo))
+        workflow.add_node("final_review", timed("final_review", self._final_quality_review))
         
         workflow.set_entry_point("create_brief")
         workflow.add_edge("create_brief", "generate_content")
@@ -40,8 +58,91 @@ class ContentGenerationWorkflow:
         workflow.add_edge("optimize_seo", "final_review")
         workflow.add_edge("final_review", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+    
+    async def _create_content_brief(self, state: ContentGenState) -> ContentGenState:
+        """Turn the triggering opportunity or headline into a writing brief"""
+        emit_event("progress", "Preparing content brief")
+        state["content_brief"] = {
+            "topic": state.get("news_headline") or state.get("opportunity_id", ""),
+            "generation_type": state.get("generation_type", "opportunity"),
+            "target_keywords": state.get("target_keywords", []),
+            "audience": "ING retail customers in the Netherlands",
+            "goal": "Answer the searcher's question well enough to be cited in AI Overviews"
+        }
+        return state
+    
+    async def _generate_initial_content(self, state: ContentGenState) -> ContentGenState:
+        """Write the article, forwarding tokens to any listener as they arrive"""
+        emit_event("progress", "Writing article")
+        chunks = []
+        async for token in self.content_optimizer.stream_article(state["content_brief"]):
+            chunks.append(token)
+            emit_event("token", token)
+        state["generated_content"] = "".join(chunks)
+        return state
+    
+    async def _enforce_brand_voice(self, state: ContentGenState) -> ContentGenState:
+        """Check the draft against ING brand guidelines"""
+        emit_event("progress", "Checking brand compliance")
+        state["brand_compliance"] = await self.brand_enforcer.validate_brand_compliance(
+            state["generated_content"]
+        )
+        return state
+    
+    async def _optimize_for_seo(self, state: ContentGenState) -> ContentGenState:
+        """Targeted AI Overview optimization of the brand-checked draft"""
+        emit_event("progress", "Optimizing for search")
+        state["seo_optimization"] = await self.content_optimizer.targeted_optimize(
+            {"article": state["generated_content"], "brand_compliance": state["brand_compliance"]},
+            []
+        )
+        return state
+    
+    async def _final_quality_review(self, state: ContentGenState) -> ContentGenState:
+        """Assemble the publishable article and its review status"""
+        emit_event("progress", "Final review")
+        optimized = state["seo_optimization"].get("optimized_content", {})
+        compliance = state["brand_compliance"]
+        approved = bool(compliance.get("approved_for_publication"))
+        state["final_article"] = {
+            "title": optimized.get("title") or state["content_brief"]["topic"],
+            "body": state["generated_content"],
+            "seo": optimized,
+            "brand_compliance_score": compliance.get("brand_compliance_score"),
+            "revision_notes": compliance.get("revision_notes", ""),
+            "status": "ready" if approved else "review"
+        }
+        return state
     
     async def generate_optimized_article(self, input_state: Dict) -> Dict:
         """Generate complete optimized article"""
-        return await self.workflow.ainvoke(input_state)
\ No newline at end of file
+        if self.checkpoints is None:
+            return await self.workflow.ainvoke(input_state)
+        workflow_id = input_state.get("workflow_id") or (
+            f"content-{fingerprint(input_state.get('opportunity_id'), input_state.get('news_headline'))[:16]}"
+        )
+        return await self.checkpoints.run(self.workflow, input_state, workflow_id)
+    
+    async def stream_article(self, input_state: Dict) -> AsyncIterator[Tuple[str, Any]]:
+        """Run the workflow, yielding progress and token events, then a final done or error event"""
+        stream = WorkflowEventStream()
+        
+        async def run():
+            try:
+                with workflow_events(stream):
+                    result = await self.generate_optimized_article(input_state)
+                stream.emit("done", result)
+            except Exception as e:
+                stream.emit("error", str(e))
+            finally:
+                stream.close()
+        
+        task = asyncio.create_task(run())
+        try:
+            async for event in stream:
+                yield event
+        finally:
+            # Listener went away; checkpointing lets a retry pick up from here
+            if not task.done():
+                task.cancel()
\ No newline at end of file
@@ -2,37 +2,98 @@
 # workflows/geo_optimization.py - LangGraph GEO Workflow  
 # ================================
 
-from typing import TypedDict, List, Dict
+import asyncio
+import re
+from datetime import datetime
+from typing import TypedDict, List, Dict, Any, Awaitable, Callable, Optional
 from langgraph.graph import StateGraph, END
 from app.config.azure_config import AzureAIConfig
+from app.config.settings import DashboardSettings
 from app.agents.content_evaluator import ContentEvaluator
 from app.agents.content_optimizer import ContentOptimizer
+from app.services.checkpoint_store import CheckpointStore
+from app.services.geo_result_store import GEOResultStore
+from app.services.ranking_store import RankingStore
+from app.services.serp_service import SerpService
+from app.utils.metrics import METRICS, node_timer
+from app.utils.result_cache import fingerprint
+from app.utils.workflow_events import emit_event
 
 class GEOState(TypedDict):
     target_keywords: List[str]
     ai_overview_data: Dict
+    ing_serp_results: Dict[str, List[Dict]]
     competitor_snippets: List[Dict]
     ing_content_analysis: Dict
     optimization_strategy: str
     optimized_content: Dict
     inclusion_predictions: Dict
+    failed_keywords: List[str]
+    content_versions: Dict[str, str]
+    keyword_fingerprints: Dict[str, str]
+    changed_keywords: List[str]
+    skipped_keywords: List[str]
+    optimization_results: List[Dict]
     timestamp: str
+    workflow_id: str
+
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize(text: Any) -> str:
+    return _WHITESPACE.sub(" ", str(text or "")).strip().lower()
+
+def _snippet_key(snippet: Dict) -> List[str]:
+    """Content that matters for a snippet; positions and fetch metadata are ignored"""
+    return [
+        _normalize(snippet.get("domain") or snippet.get("url")),
+        _normalize(snippet.get("title")),
+        _normalize(snippet.get("snippet") or snippet.get("text"))
+    ]
 
 class GEOOptimizationWorkflow:
-    def __init__(self, azure_config: AzureAIConfig):
+    def __init__(self, azure_config: AzureAIConfig, settings: Optional[DashboardSettings] = None,
+                 serp: Optional[SerpService] = None):
         self.azure_config = azure_config
+        self.settings = settings or DashboardSettings()
+        self.serp = serp or SerpService(self.settings)
+        self.own_domains = {domain.lower() for domain in self.settings.ranking_own_domains}
         self.content_evaluator = ContentEvaluator(azure_config)
         self.content_optimizer = ContentOptimizer(azure_config)
+        self.checkpoints: Optional[CheckpointStore] = None
+        self.rankings: Optional[RankingStore] = None
+        self.results: Optional[GEOResultStore] = None
         self.workflow = self._create_workflow()
     
-    def _create_workflow(self):
+    def enable_change_tracking(self, rankings: RankingStore):
+        """Record AI Overview citations of every run so competitor changes become alerts"""
+        self.rankings = rankings
+    
+    def enable_result_reuse(self, results: GEOResultStore):
+        """Reuse the stored outcome of keywords whose AI Overview, competitors and ING content are unchanged"""
+        self.results = results
+    
+    def enable_checkpointing(self, checkpoints: CheckpointStore):
+        """Recompile with a checkpointer so interrupted runs resume from their last node"""
+        self.checkpoints = checkpoints
+        self.workflow = self._create_workflow(checkpoints.saver)
+    
+    def _create_workflow(self, checkpointer=None):
         """Create LangGraph workflow for GEO optimization"""
+        timed = node_timer("geo_optimization", self.settings.enable_workflow_logging)
         workflow = StateGraph(GEOState)
         
-        # Parallel analysis nodes
-        workflow.add_node("scrape_ai_overview", self._scrape_ai_overview)
-        workflow.add_node("analyze_competitors", self._analyze_competitor_snippets)
-        workflow.add_node("evaluate_ing_content", self._evaluate_ing_content)
+        # Analysis nodes (each fans out across keywords internally)
+        workflow.add_node("scrape_ai_overview", timed("scrape_ai_overview", self._scrape_ai_overview))
+        workflow.add_node("analyze_competitors", timed("analyze_competitors", self._analyze_competitor_snippets))
+        workflow.add_node("skip_unchanged", timed("skip_unchanged", self._skip_unchanged_keywords))
+        workflow.add_node("evaluate_ing_content", timed("evaluate_ing_content", self._evaluate_ing_content))
+        
+        # Nothing left to optimize when every keyword's inputs match its last run
+        workflow.add_conditional_edges(
+            "skip_unchanged",
+            lambda state: "changed" if state["changed_keywords"] else "unchanged",
+            {"changed": "evaluate_ing_content", "unchanged": END}
+        )
         
         # Conditional optimization
         workflow.add_conditional_edges(
@@ -46,73 +107,189 @@ class GEOOptimizationWorkflow:
         )
         
         # Optimization nodes
-        workflow.add_node("monitor_only", self._monitor_only)
-        workflow.add_node("targeted_optimization", self._targeted_optimization)
-        workflow.add_node("comprehensive_rewrite", self._comprehensive_rewrite)
+        workflow.add_node("monitor_only", timed("monitor_only", self._monitor_only))
+        workflow.add_node("targeted_optimization", timed("targeted_optimization", self._targeted_optimization))
+        workflow.add_node("comprehensive_rewrite", timed("comprehensive_rewrite", self._comprehensive_rewrite))
         
         # All paths lead to prediction
         workflow.add_edge("monitor_only", "predict_inclusion")
         workflow.add_edge("targeted_optimization", "predict_inclusion")
         workflow.add_edge("comprehensive_rewrite", "predict_inclusion")
         
-        workflow.add_node("predict_inclusion", self._predict_ai_overview_inclusion)
+        workflow.add_node("predict_inclusion", timed("predict_inclusion", self._predict_ai_overview_inclusion))
         workflow.add_edge("predict_inclusion", END)
         
         workflow.set_entry_point("scrape_ai_overview")
         workflow.add_edge("scrape_ai_overview", "analyze_competitors")
-        workflow.add_edge("analyze_competitors", "evaluate_ing_content")
+        workflow.add_edge("analyze_competitors", "skip_unchanged")
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
+    async def _map_keywords(self, keywords: List[str],
+                            task: Callable[[str], Awaitable[Any]]) -> Dict[str, Any]:
+        """Run `task` per keyword with bounded concurrency; failed keywords are left out"""
+        semaphore = asyncio.Semaphore(self.settings.geo_keyword_concurrency)
+
+        async def run(keyword: str):
+            async with semaphore:
+                return await task(keyword)
+
+        outcomes = await asyncio.gather(*(run(keyword) for keyword in keywords), return_exceptions=True)
+
+        results = {}
+        for keyword, outcome in zip(keywords, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"GEO step failed for '{keyword}': {outcome}")
+                continue
+            results[keyword] = outcome
+        return results
+
     async def _scrape_ai_overview(self, state: GEOState) -> GEOState:
         """Scrape current AI Overview results for target keywords"""
-        ai_overview_data = {}
-        
-        for keyword in state["target_keywords"]:
-            # Use existing SERP scraping infrastructure
-            serp_data = await self._scrape_serp_for_keyword(keyword)
-            ai_overview_data[keyword] = serp_data.get("ai_overview", {})
-        
+        emit_event("progress", "Fetching AI Overview results")
+        keywords = state["target_keywords"]
+
+        serp_data = await self._map_keywords(keywords, self._scrape_serp_for_keyword)
+        ai_overview_data = {keyword: page.get("ai_overview", {}) for keyword, page in serp_data.items()}
+        if self.rankings is not None:
+            self.rankings.record_ai_overviews(ai_overview_data)
+
         state["ai_overview_data"] = ai_overview_data
+        state["ing_serp_results"] = {keyword: self._ing_results(page) for keyword, page in serp_data.items()}
+        state["failed_keywords"] = [kw for kw in keywords if kw not in ai_overview_data]
         return state
     
+    async def _scrape_serp_for_keyword(self, keyword: str) -> Dict:
+        """Parsed results page: AI Overview text with cited sources, and organic results"""
+        return await self.serp.fetch_serp(keyword)
+    
+    def _is_own(self, record: Dict) -> bool:
+        return record.get("domain", "") in self.own_domains
+    
+    def _ing_results(self, serp_data: Dict) -> List[Dict]:
+        """What the SERP currently shows of ING's own pages: AI Overview citations and organic results"""
+        cited = [source for source in serp_data.get("ai_overview", {}).get("sources", []) if self._is_own(source)]
+        return cited + [result for result in serp_data.get("organic_results", []) if self._is_own(result)]
+    
+    async def _extract_competitor_snippets(self, ai_overview: Dict) -> List[Dict]:
+        """Sources the AI Overview cites from other domains, in citation order"""
+        return [source for source in ai_overview.get("sources", []) if not self._is_own(source)]
+    
     async def _analyze_competitor_snippets(self, state: GEOState) -> GEOState:
         """Extract and analyze competitor snippets from AI Overview"""
+        emit_event("progress", "Analyzing competitor snippets")
+        ai_overview_data = state["ai_overview_data"]
+        snippets_by_keyword = await self._map_keywords(
+            list(ai_overview_data),
+            lambda keyword: self._extract_competitor_snippets(ai_overview_data[keyword])
+        )
+
+        # Keep keyword order stable so downstream prompts are reproducible
         competitor_snippets = []
-        
-        for keyword, ai_data in state["ai_overview_data"].items():
-            snippets = await self._extract_competitor_snippets(ai_data)
-            competitor_snippets.extend(snippets)
-        
+        for keyword in ai_overview_data:
+            competitor_snippets.extend({**snippet, "keyword": keyword} for snippet in snippets_by_keyword.get(keyword, []))
+
         state["competitor_snippets"] = competitor_snippets
+        state["failed_keywords"] = state.get("failed_keywords", []) + [
+            kw for kw in ai_overview_data if kw not in snippets_by_keyword
+        ]
         return state
     
+    def _keyword_fingerprint(self, keyword: str, ai_overview: Dict, snippets: List[Dict],
+                             ing_results: List[Dict], content_version: Optional[str]) -> str:
+        """Hash of everything a keyword's optimization depends on, normalized so re-fetches of the same SERP match"""
+        overview_text = ai_overview.get("text") or ai_overview.get("summary") or ""
+        return fingerprint(
+            keyword.lower(),
+            _normalize(overview_text),
+            sorted(_snippet_key(source) for source in ai_overview.get("sources") or []),
+            sorted(_snippet_key(snippet) for snippet in snippets),
+            sorted(_snippet_key(result) for result in ing_results),
+            content_version or "",
+            self.settings.geo_content_version
+        )
+    
+    async def _skip_unchanged_keywords(self, state: GEOState) -> GEOState:
+        """Split keywords into changed ones and unchanged ones whose last outcome is reused"""
+        failed = set(state.get("failed_keywords", []))
+        snippets_by_keyword: Dict[str, List[Dict]] = {}
+        for snippet in state["competitor_snippets"]:
+            snippets_by_keyword.setdefault(snippet["keyword"], []).append(snippet)
+        versions = state.get("content_versions") or {}
+        ing_results = state.get("ing_serp_results") or {}
+
+        fingerprints = {
+            keyword: self._keyword_fingerprint(keyword, overview or {}, snippets_by_keyword.get(keyword, []),
+                                               ing_results.get(keyword, []), versions.get(keyword))
+            for keyword, overview in state["ai_overview_data"].items() if keyword not in failed
+        }
+        reused = {}
+        if self.results is not None:
+            for keyword, key in fingerprints.items():
+                result = self.results.lookup(keyword, key)
+                if result is not None:
+                    reused[keyword] = {**result, "reused": True}
+
+        state["keyword_fingerprints"] = fingerprints
+        state["skipped_keywords"] = list(reused)
+        state["changed_keywords"] = [keyword for keyword in fingerprints if keyword not in reused]
+        state["optimization_results"] = list(reused.values())
+        METRICS.inc("geo_keywords_total", len(reused), {"outcome": "skipped"})
+        METRICS.inc("geo_keywords_total", len(state["changed_keywords"]), {"outcome": "optimized"})
+        if reused:
+            emit_event("progress", f"Reusing results for {len(reused)} unchanged keywords")
+
+        if not state["changed_keywords"]:
+            # Batch-level probabilities depend on which keywords shared the run, so only
+            # per-keyword predictions feed the average
+            probabilities = [
+                result["inclusion_probability"] for result in reused.values()
+                if result.get("inclusion_probability") is not None
+                and "inclusion_probability" not in result.get("aggregate_fields", ["inclusion_probability"])
+            ]
+            state["optimization_strategy"] = "unchanged"
+            state["optimized_content"] = {"status": "inputs_unchanged"}
+            state["inclusion_predictions"] = {
+                "overall_inclusion_probability": sum(probabilities) / len(probabilities) if probabilities else None,
+                "keywords": {keyword: result.get("prediction", {}) for keyword, result in reused.items()}
+            } if reused else {}
+        return state
+    
+    @staticmethod
+    def _changed_snippets(state: GEOState) -> List[Dict]:
+        changed = set(state["changed_keywords"])
+        return [snippet for snippet in state["competitor_snippets"] if snippet["keyword"] in changed]
+    
     async def _evaluate_ing_content(self, state: GEOState) -> GEOState:
         """Evaluate ING's current content against AI Overview winners"""
+        emit_event("progress", "Evaluating ING content")
+        ing_results = state.get("ing_serp_results") or {}
         analysis = await self.content_evaluator.evaluate_content(
-            state["target_keywords"],
-            state["competitor_snippets"]
+            state["changed_keywords"],
+            self._changed_snippets(state),
+            [result for keyword in state["changed_keywords"] for result in ing_results.get(keyword, [])]
         )
         state["ing_content_analysis"] = analysis
         return state
     
     def _determine_optimization_strategy(self, state: GEOState) -> str:
         """Decide optimization approach based on content analysis"""
-        analysis = state["ing_content_analysis"]
-        avg_score = analysis.get("average_inclusion_score", 0)
+        # The evaluator prompt asks for, and its schema requires, overall_inclusion_probability
+        score = state["ing_content_analysis"].get("overall_inclusion_probability", 0)
         
-        if avg_score >= 85:
+        if score >= 85:
             return "already_winning"
-        elif avg_score >= 60:
+        elif score >= 60:
             return "minor_optimization"
         else:
             return "major_optimization"
     
     async def _targeted_optimization(self, state: GEOState) -> GEOState:
         """Minor content optimizations"""
+        emit_event("progress", "Applying targeted optimizations")
         optimized = await self.content_optimizer.targeted_optimize(
             state["ing_content_analysis"],
-            state["competitor_snippets"]
+            self._changed_snippets(state)
         )
         state["optimized_content"] = optimized
         state["optimization_strategy"] = "targeted"
@@ -120,9 +297,10 @@ class GEOOptimizationWorkflow:
     
     async def _comprehensive_rewrite(self, state: GEOState) -> GEOState:
         """Major content rewrite for AI Overview inclusion"""
+        emit_event("progress", "Rewriting content")
         optimized = await self.content_optimizer.comprehensive_rewrite(
-            state["target_keywords"],
-            state["competitor_snippets"],
+            state["changed_keywords"],
+            self._changed_snippets(state),
             state["ing_content_analysis"]
         )
         state["optimized_content"] = optimized
@@ -131,20 +309,92 @@ class GEOOptimizationWorkflow:
     
     async def _monitor_only(self, state: GEOState) -> GEOState:
         """Content is already performing well - just monitor"""
+        emit_event("progress", "Content already competitive")
         state["optimization_strategy"] = "monitor"
         state["optimized_content"] = {"status": "no_changes_needed"}
         return state
     
     async def _predict_ai_overview_inclusion(self, state: GEOState) -> GEOState:
         """Predict AI Overview inclusion using LLM reasoning"""
+        emit_event("progress", "Predicting AI Overview inclusion")
         predictions = await self.content_evaluator.predict_inclusion_probability(
             state["optimized_content"],
-            state["competitor_snippets"],
-            state["target_keywords"]
+            self._changed_snippets(state),
+            state["changed_keywords"]
         )
-        state["inclusion_predictions"] = predictions
+        fresh = {
+            keyword: self._keyword_outcome(keyword, predictions, state)
+            for keyword in state["changed_keywords"]
+        }
+        if self.results is not None:
+            self.results.store(fresh, state["keyword_fingerprints"])
+        state["optimization_results"] = state.get("optimization_results", []) + [
+            {**result, "reused": False} for result in fresh.values()
+        ]
+        # The overall figures cover only the keywords optimized in this run; the per-keyword
+        # map also carries the outcomes reused for unchanged keywords
+        state["inclusion_predictions"] = {
+            **predictions,
+            "overall_covers": list(state["changed_keywords"]),
+            "keywords": {result["keyword"]: result.get("prediction", {}) for result in state["optimization_results"]}
+        }
         return state
+
+    @staticmethod
+    def _keyword_outcome(keyword: str, predictions: Dict, state: GEOState) -> Dict:
+        """One keyword's result, using its own prediction when the LLM returned one
+
+        `aggregate_fields` lists values that were computed for the whole batch of changed
+        keywords rather than for this keyword alone.
+        """
+        batch_probability = predictions.get("overall_inclusion_probability", predictions.get("inclusion_probability"))
+        per_keyword = predictions.get("keywords") or {}
+        own = per_keyword.get(keyword) if isinstance(per_keyword, dict) else None
+        single = len(state["changed_keywords"]) == 1
+
+        if isinstance(own, dict) and own.get("inclusion_probability") is not None:
+            probability = own["inclusion_probability"]
+            prediction = {"confidence_level": predictions.get("confidence_level"), **own}
+            aggregate_fields = []
+        else:
+            probability = batch_probability
+            prediction = {
+                "overall_inclusion_probability": batch_probability,
+                "confidence_level": predictions.get("confidence_level")
+            }
+            aggregate_fields = [] if single else ["inclusion_probability"]
+        if not single:
+            aggregate_fields.append("average_inclusion_score")
+
+        return {
+            "keyword": keyword,
+            "optimization_status": state["optimization_strategy"],
+            "inclusion_probability": probability,
+            "average_inclusion_score": state["ing_content_analysis"].get("overall_inclusion_probability"),
+            "prediction": prediction,
+            "aggregate_fields": aggregate_fields
+        }
     
     async def optimize_for_ai_overview(self, input_state: Dict) -> Dict:
         """Main entry point for GEO optimization"""
-        return await self.workflow.ainvoke(input_state)
\ No newline at end of file
+        if self.checkpoints is None:
+            return await self.workflow.ainvoke(input_state)
+        # Same keywords map to the same thread, so a retry picks up where the last attempt stopped
+        workflow_id = input_state.get("workflow_id") or f"geo-{fingerprint(sorted(input_state['target_keywords']))[:16]}"
+        return await self.checkpoints.run(self.workflow, input_state, workflow_id)
+    
+    async def monitor_competitor_changes(self, keyword_records: Optional[List[Dict]] = None) -> List[Dict]:
+        """Record current SERP positions and return the precomputed competitor alerts"""
+        if self.rankings is None:
+            return []
+        if keyword_records:
+            self.rankings.record_positions(keyword_records)
+        return self.rankings.recent_alerts()
+    
+    async def optimize_single_keyword(self, input_state: Dict) -> Dict:
+        """Run the full GEO pipeline for one keyword"""
+        return await self.optimize_for_ai_overview({
+            "target_keywords": [input_state["keyword"]],
+            "content_versions": input_state.get("content_versions", {}),
+            "timestamp": input_state.get("timestamp", datetime.now().isoformat())
+        })
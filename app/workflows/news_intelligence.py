@@ -3,16 +3,21 @@
 # ================================
 
 from langgraph.graph import StateGraph, END
-from typing import TypedDict, List, Dict
-from datetime import datetime
+from typing import TypedDict, List, Dict, Optional
+from datetime import datetime, timedelta
 from app.config.azure_config import AzureAIConfig
+from app.config.settings import DashboardSettings
 from app.agents.news_scanner import NewsScanner
 from app.agents.intent_extractor import IntentExtractor
 from app.agents.competitive_gap_analyzer import CompetitiveGapAnalyzer
+from app.services.news_prefilter import NewsPrefilter
+from app.utils.metrics import node_timer
+from app.utils.result_cache import SingleFlightCache, fingerprint
 
 class NewsIntelState(TypedDict):
     rss_articles: List[Dict]
     tracked_keywords: List[str] 
+    candidate_articles: List[Dict]
     relevant_news: List[Dict]
     extracted_intents: List[Dict]
     content_opportunities: List[Dict]
@@ -21,8 +26,13 @@ class NewsIntelState(TypedDict):
     timestamp: str
 
 class NewsIntelligenceWorkflow:
-    def __init__(self, azure_config: AzureAIConfig):
+    MAX_OPPORTUNITIES = 5
+
+    def __init__(self, azure_config: AzureAIConfig, settings: Optional[DashboardSettings] = None):
         self.azure_config = azure_config
+        self.settings = settings or DashboardSettings()
+        self.result_cache = SingleFlightCache(ttl=self.settings.news_result_cache_ttl)
+        self.prefilter = NewsPrefilter(self.settings)
         self.news_scanner = NewsScanner(azure_config)
         self.intent_extractor = IntentExtractor(azure_config)
         self.gap_analyzer = CompetitiveGapAnalyzer(azure_config)
@@ -30,32 +40,54 @@ class NewsIntelligenceWorkflow:
     
     def _create_workflow(self):
         """Create LangGraph workflow for news intelligence"""
+        timed = node_timer("news_intelligence", self.settings.enable_workflow_logging)
         workflow = StateGraph(NewsIntelState)
         
         # Add nodes
-        workflow.add_node("scan_news", self._scan_news_relevance)
-        workflow.add_node("extract_intents", self._extract_search_intents)
-        workflow.add_node("analyze_gaps", self._analyze_competitive_gaps)
-        workflow.add_node("prioritize_opportunities", self._prioritize_opportunities)
+        workflow.add_node("prefilter_news", timed("prefilter_news", self._prefilter_news))
+        workflow.add_node("scan_news", timed("scan_news", self._scan_news_relevance))
+        workflow.add_node("extract_intents", timed("extract_intents", self._extract_search_intents))
+        workflow.add_node("analyze_gaps", timed("analyze_gaps", self._analyze_competitive_gaps))
+        workflow.add_node("prioritize_opportunities", timed("prioritize_opportunities", self._prioritize_opportunities))
         
         # Define flow
-        workflow.set_entry_point("scan_news")
-        workflow.add_edge("scan_news", "extract_intents")
+        workflow.set_entry_point("prefilter_news")
+        workflow.add_edge("prefilter_news", "scan_news")
+        workflow.add_conditional_edges(
+            "scan_news",
+            self._route_after_scan,
+            {
+                "has_relevant_news": "extract_intents",
+                "nothing_relevant": "prioritize_opportunities"
+            }
+        )
         workflow.add_edge("extract_intents", "analyze_gaps")
         workflow.add_edge("analyze_gaps", "prioritize_opportunities")
         workflow.add_edge("prioritize_opportunities", END)
         
         return workflow.compile()
     
+    async def _prefilter_news(self, state: NewsIntelState) -> NewsIntelState:
+        """Drop obvious misses locally so only likely candidates reach the LLM"""
+        state["candidate_articles"] = self.prefilter.filter(
+            state["rss_articles"],
+            state["tracked_keywords"]
+        )
+        return state
+    
     async def _scan_news_relevance(self, state: NewsIntelState) -> NewsIntelState:
         """Scan RSS articles for ING relevance"""
         relevant_news = await self.news_scanner.analyze_relevance(
-            state["rss_articles"], 
+            state["candidate_articles"], 
             state["tracked_keywords"]
         )
         state["relevant_news"] = relevant_news
         return state
     
+    def _route_after_scan(self, state: NewsIntelState) -> str:
+        """Skip intent and gap analysis when no article passed the relevance threshold"""
+        return "has_relevant_news" if state["relevant_news"] else "nothing_relevant"
+    
     async def _extract_search_intents(self, state: NewsIntelState) -> NewsIntelState:
         """Extract search intents from relevant news"""
         intents = await self.intent_extractor.extract_from_news(
@@ -77,27 +109,61 @@ class NewsIntelligenceWorkflow:
         """Prioritize content opportunities by urgency and impact"""
         opportunities = []
         
-        for gap in state["competitive_gaps"]:
+        for gap in state.get("competitive_gaps") or []:
             opportunity = {
                 "headline": gap["potential_headline"],
                 "priority": gap["urgency_score"],
+                "urgency_level": "urgent" if gap["urgency_score"] > 80 else "normal",
                 "keywords": gap["target_keywords"],
                 "content_angle": gap["recommended_angle"],
                 "ai_overview_gap": gap["competitor_weakness"],
-                "estimated_traffic": gap["traffic_potential"]
+                "estimated_traffic": gap["traffic_potential"],
+                "detected_at": state["timestamp"]
             }
             opportunities.append(opportunity)
         
         # Sort by priority score
         opportunities.sort(key=lambda x: x["priority"], reverse=True)
         
-        state["content_opportunities"] = opportunities[:5]  # Top 5
-        state["priority_level"] = "urgent" if opportunities[0]["priority"] > 80 else "normal"
+        state["content_opportunities"] = opportunities[:self.MAX_OPPORTUNITIES]
+        state["priority_level"] = "urgent" if opportunities and opportunities[0]["priority"] > 80 else "normal"
         
         return state
 
+    def merge_results(self, previous: Dict, fresh: Dict) -> Dict:
+        """Combine a run over new entries only with the opportunities still live from earlier runs"""
+        cutoff = (datetime.now() - timedelta(seconds=self.settings.news_opportunity_max_age)).isoformat()
+        headlines = {op["headline"] for op in fresh["content_opportunities"]}
+        carried = [
+            op for op in previous.get("content_opportunities", [])
+            if op["headline"] not in headlines and op.get("detected_at", "") >= cutoff
+        ]
+        opportunities = sorted(fresh["content_opportunities"] + carried, key=lambda x: x["priority"], reverse=True)
+        opportunities = opportunities[:self.MAX_OPPORTUNITIES]
+        return {
+            **fresh,
+            "content_opportunities": opportunities,
+            "urgent_count": len([op for op in opportunities if op["urgency_level"] == "urgent"])
+        }
+
     async def analyze_news_opportunities(self, state: Dict) -> Dict:
-        """Main workflow execution"""
+        """Main workflow execution, shared by all callers with identical inputs"""
+        cache_key = self._input_fingerprint(state)
+        return await self.result_cache.get_or_compute(
+            cache_key,
+            lambda: self._run_analysis(state)
+        )
+
+    def _input_fingerprint(self, state: Dict) -> str:
+        """Cache key from feed entry IDs and tracked keywords"""
+        entry_ids = sorted(
+            article.get("entry_id") or article.get("url") or article.get("headline", "")
+            for article in state["rss_articles"]
+        )
+        return fingerprint(entry_ids, sorted(state["tracked_keywords"]))
+
+    async def _run_analysis(self, state: Dict) -> Dict:
+        """Run the LangGraph pipeline and shape the result for the dashboard"""
         workflow_result = await self.workflow.ainvoke(state)
         
         # Post-process results for dashboard
@@ -105,5 +171,6 @@ class NewsIntelligenceWorkflow:
             "content_opportunities": workflow_result["content_opportunities"],
             "urgent_count": len([op for op in workflow_result["content_opportunities"] if op["urgency_level"] == "urgent"]),
             "total_analyzed": len(state["rss_articles"]),
+            "llm_candidates": len(workflow_result["candidate_articles"]),
             "analysis_timestamp": datetime.now().isoformat()
         }
\ No newline at end of file
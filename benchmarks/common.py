@@ -0,0 +1,76 @@
+# ================================
+# benchmarks/common.py - Shared Benchmark Helpers
+# ================================
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from aiohttp import web
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+async def start_site(app: web.Application, host: str = "127.0.0.1") -> Tuple[web.AppRunner, str]:
+    """Serve an aiohttp app on a free local port and return its base URL"""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}"
+
+def configure_app_environment(overrides: Dict[str, str]):
+    """Point DashboardSettings at local fakes before any app module is imported"""
+    os.environ.update(overrides)
+    # Agents load prompts relative to the app directory
+    os.chdir(REPO_ROOT / "app")
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+def latency_summary(latencies: List[float], errors: int, wall_time: float) -> Dict:
+    """Throughput and latency percentiles for one scenario"""
+    samples = np.asarray(latencies, dtype=np.float64)
+    summary = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "error_rate": round(errors / (len(latencies) + errors), 4) if latencies or errors else 0.0,
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(latencies) / wall_time, 3) if wall_time > 0 else 0.0
+    }
+    if samples.size:
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        summary.update({
+            "latency_p50_s": round(float(p50), 4),
+            "latency_p95_s": round(float(p95), 4),
+            "latency_p99_s": round(float(p99), 4),
+            "latency_max_s": round(float(samples.max()), 4)
+        })
+    return summary
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def write_report(kind: str, config: Dict, scenarios: Dict, output: Optional[str] = None) -> Path:
+    """Write a JSON report tagged with the current commit for later comparison"""
+    commit = git_commit()
+    report = {
+        "kind": kind,
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": config,
+        "scenarios": scenarios
+    }
+    path = Path(output) if output else RESULTS_DIR / f"{kind}-{commit}-{int(time.time())}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    return path
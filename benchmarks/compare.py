@@ -0,0 +1,44 @@
+# ================================
+# benchmarks/compare.py - Diff Two Benchmark Reports
+# ================================
+
+import argparse
+import json
+from typing import Dict, Optional
+
+METRICS = ["throughput_rps", "latency_p50_s", "latency_p95_s", "latency_p99_s", "error_rate",
+           "llm_requests", "prompt_tokens", "completion_tokens"]
+
+def _change(before: Optional[float], after: Optional[float]) -> str:
+    if before is None or after is None:
+        return "n/a"
+    if before == 0:
+        return "same" if after == 0 else "new"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+def compare(baseline: Dict, candidate: Dict):
+    print(f"baseline {baseline['commit']} ({baseline['created_at']}) -> "
+          f"candidate {candidate['commit']} ({candidate['created_at']})")
+    for name, after in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None or "requests" not in after:
+            continue
+        print(f"\n{name}")
+        for metric in METRICS:
+            if metric in after or metric in before:
+                print(f"  {metric:<20} {before.get(metric, '-')!s:>12} -> {after.get(metric, '-')!s:>12}"
+                      f"  {_change(before.get(metric), after.get(metric))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    compare(baseline, candidate)
+
+if __name__ == "__main__":
+    main()
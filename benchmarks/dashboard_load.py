@@ -0,0 +1,256 @@
+# ================================
+# benchmarks/dashboard_load.py - Simulated Dashboard Sessions
+# ================================
+
+"""
+Simulates N open dashboards polling the app with the same HTMX cadences as
+app/ui/dashboard.py: every panel fires on `load`, then news refreshes every 90s,
+GEO every 300s, competitive alerts every 600s and the latency panel every 30s.
+Sessions open at staggered times and the session count is ramped step by step.
+
+    # In-process against fake Azure OpenAI and synthetic feeds, 10x faster than real time
+    python -m benchmarks.dashboard_load --sessions 1,10,50,100 --time-scale 0.1
+
+    # Against an already running dashboard
+    python -m benchmarks.dashboard_load --url http://localhost:8000 --sessions 5,25 --step-duration 900
+
+Durations and cadences are given in production seconds and multiplied by --time-scale,
+so LLM calls per minute are reported in production-equivalent minutes.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from benchmarks.common import configure_app_environment, latency_summary, start_site, write_report
+from benchmarks.fake_azure import FakeAzureConfig, FakeAzureOpenAI
+from benchmarks.fake_feeds import FakeFeedConfig, FakeFeedServer
+from benchmarks.fake_serp import FakeSerpServer
+from benchmarks.fake_serpbear import FakeSerpBear, FakeSerpBearConfig
+
+# (route, refresh interval in seconds or None for load-only) as wired in create_ing_dashboard
+PANELS = [
+    ("/api/news-intelligence", 90),
+    ("/api/geo-optimization", 300),
+    ("/api/content-pipeline", None),
+    ("/api/competitive-alerts", 600),
+    ("/api/latency-panel", 30)
+]
+
+# Scheduler cadences scaled alongside the client cadences when running in-process
+SCHEDULER_INTERVALS = {
+    "RSS_FETCH_INTERVAL": 90,
+    "GEO_REFRESH_INTERVAL": 300,
+    "COMPETITIVE_ALERTS_INTERVAL": 600,
+    "DASHBOARD_REFRESH_INTERVAL": 60
+}
+
+@dataclass
+class StepRecorder:
+    """Latencies and errors per route for one ramp step"""
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    sample_errors: List[str] = field(default_factory=list)
+
+    def record(self, route: str, latency: Optional[float], error: Optional[str] = None):
+        if error is None:
+            self.latencies.setdefault(route, []).append(latency)
+            return
+        self.errors[route] = self.errors.get(route, 0) + 1
+        if len(self.sample_errors) < 5 and error not in self.sample_errors:
+            self.sample_errors.append(error)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard sessions")
+    parser.add_argument("--url", help="base URL of a running dashboard (default: run in-process with fakes)")
+    parser.add_argument("--sessions", default="1,5,10,25,50", help="comma-separated session counts to ramp through")
+    parser.add_argument("--step-duration", type=float, default=1200, help="production seconds per step")
+    parser.add_argument("--stagger", type=float, default=60, help="window in production seconds over which sessions open")
+    parser.add_argument("--jitter", type=float, default=0.02, help="+/- fraction applied to each poll interval")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiplier for every interval (0.1 = 10x faster)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="client timeout per request (s)")
+    parser.add_argument("--max-error-rate", type=float, default=0.05, help="error rate marking the breaking point")
+    parser.add_argument("--max-p95", type=float, default=2.0, help="p95 latency (s) marking the breaking point")
+    parser.add_argument("--stop-at-breaking-point", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake Azure time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--rate-limit-fraction", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--output", help="report path (default benchmarks/results/...)")
+    return parser.parse_args()
+
+def llm_calls_from_metrics(text: str) -> float:
+    """Sum of llm_requests_total that reached Azure (cache misses and bypasses)"""
+    total = 0.0
+    for line in text.splitlines():
+        if line.startswith("llm_requests_total") and 'cache="hit"' not in line:
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+async def fetch_llm_calls(client) -> Optional[float]:
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        return llm_calls_from_metrics(response.text)
+    except Exception as e:
+        print(f"Could not read /metrics: {e}")
+        return None
+
+async def request(client, recorder: StepRecorder, route: str):
+    started = time.perf_counter()
+    try:
+        response = await client.get(route, headers={"HX-Request": "true"})
+        if response.status_code >= 400:
+            recorder.record(route, None, f"HTTP {response.status_code} {route}")
+        else:
+            recorder.record(route, time.perf_counter() - started)
+    except Exception as e:
+        recorder.record(route, None, f"{type(e).__name__} {route}: {e}")
+
+async def run_session(client, recorder: StepRecorder, args: argparse.Namespace, opens_in: float,
+                      stop_at: float, rng: random.Random):
+    """One dashboard tab: the load burst on every panel, then independent polling timers"""
+    await asyncio.sleep(opens_in)
+    if time.monotonic() >= stop_at:
+        return
+
+    async def panel(route: str, interval: Optional[int]):
+        await request(client, recorder, route)
+        while interval:
+            delay = interval * args.time_scale * (1 + rng.uniform(-args.jitter, args.jitter))
+            if time.monotonic() + delay >= stop_at:
+                return
+            await asyncio.sleep(delay)
+            await request(client, recorder, route)
+
+    await asyncio.gather(*(panel(route, interval) for route, interval in PANELS))
+
+async def run_step(client, sessions: int, args: argparse.Namespace, rng: random.Random) -> Dict:
+    recorder = StepRecorder()
+    duration = args.step_duration * args.time_scale
+    stagger = min(args.stagger * args.time_scale, duration)
+    llm_before = await fetch_llm_calls(client)
+
+    started = time.monotonic()
+    stop_at = started + duration
+    await asyncio.gather(*(
+        run_session(client, recorder, args, rng.uniform(0, stagger), stop_at, rng)
+        for _ in range(sessions)
+    ))
+    wall_time = time.monotonic() - started
+    llm_after = await fetch_llm_calls(client)
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    summary = latency_summary(all_latencies, sum(recorder.errors.values()), wall_time)
+    summary["sessions"] = sessions
+    summary["by_route"] = {
+        route: latency_summary(recorder.latencies.get(route, []), recorder.errors.get(route, 0), wall_time)
+        for route, _ in PANELS
+    }
+    if llm_before is not None and llm_after is not None:
+        production_minutes = wall_time / args.time_scale / 60
+        summary["llm_calls"] = int(llm_after - llm_before)
+        summary["llm_calls_per_min"] = round((llm_after - llm_before) / production_minutes, 2)
+    if recorder.sample_errors:
+        summary["sample_errors"] = recorder.sample_errors
+    return summary
+
+def breaks(summary: Dict, args: argparse.Namespace) -> bool:
+    return (summary["error_rate"] > args.max_error_rate
+            or summary.get("latency_p95_s", 0.0) > args.max_p95)
+
+async def run_ramp(client, args: argparse.Namespace) -> Dict:
+    rng = random.Random(args.seed)
+    steps = []
+    breaking_point = None
+    for sessions in [int(n) for n in args.sessions.split(",") if n.strip()]:
+        summary = await run_step(client, sessions, args, rng)
+        steps.append(summary)
+        print(f"sessions={sessions:<5} requests={summary['requests']:<6} p50={summary.get('latency_p50_s', '-')}s "
+              f"p95={summary.get('latency_p95_s', '-')}s errors={summary['error_rate']:.2%} "
+              f"llm_calls/min={summary.get('llm_calls_per_min', '-')}")
+        if breaking_point is None and breaks(summary, args):
+            breaking_point = sessions
+            if args.stop_at_breaking_point:
+                break
+    return {"steps": steps, "breaking_point_sessions": breaking_point}
+
+async def run_remote(args: argparse.Namespace) -> Dict:
+    import httpx
+    async with httpx.AsyncClient(base_url=args.url.rstrip("/"), timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=None)) as client:
+        return await run_ramp(client, args)
+
+async def run_in_process(args: argparse.Namespace) -> Dict:
+    fake_azure = FakeAzureOpenAI(FakeAzureConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_fraction=args.rate_limit_fraction
+    ))
+    fake_feeds = FakeFeedServer(FakeFeedConfig(churn=5))
+    azure_runner, azure_url = await start_site(fake_azure.build_app())
+    feeds_runner, feeds_url = await start_site(fake_feeds.build_app())
+    fake_serpbear = FakeSerpBear(FakeSerpBearConfig(position_churn=0.2))
+    serpbear_runner, serpbear_url = await start_site(fake_serpbear.build_app())
+    fake_serp = FakeSerpServer()
+    serp_runner, serp_url = await start_site(fake_serp.build_app())
+
+    workdir = tempfile.mkdtemp(prefix="ing-load-")
+    configure_app_environment({
+        "AZURE_OPENAI_ENDPOINT": azure_url,
+        "AZURE_OPENAI_API_KEY": "benchmark",
+        "SERPBEAR_BASE_URL": serpbear_url,
+        "SERPBEAR_API_KEY": fake_serpbear.config.api_key,
+        "DATABASE_URL": f"sqlite:///{workdir}/load.db",
+        "CHECKPOINT_DB_PATH": f"{workdir}/checkpoints.db",
+        "RANKING_STORE_PATH": f"{workdir}/rankings.log",
+        "GEO_RESULT_STORE_PATH": f"{workdir}/geo_results.json",
+        "SERP_SEARCH_URL": f"{serp_url}/search",
+        "SERP_CACHE_DIR": f"{workdir}/serp_cache",
+        "SERP_HOST_RATE": "50",
+        "AZURE_ENABLE_HTTP2": "false",
+        **{name: str(max(1, round(seconds * args.time_scale))) for name, seconds in SCHEDULER_INTERVALS.items()}
+    })
+
+    # Imported late so module-level settings pick up the environment above
+    import httpx
+    from app import main
+
+    main.rss_service.rss_sources = fake_feeds.feed_urls(feeds_url)
+    await main.startup_services()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=args.timeout) as client:
+            result = await run_ramp(client, args)
+    finally:
+        await main.shutdown_services()
+        await azure_runner.cleanup()
+        await feeds_runner.cleanup()
+        await serpbear_runner.cleanup()
+        await serp_runner.cleanup()
+
+    result["fake_services"] = {
+        "azure": fake_azure.stats.snapshot(),
+        "feeds": {"requests": fake_feeds.requests, "not_modified": fake_feeds.not_modified},
+        "serpbear": {"requests": fake_serpbear.requests, "failures": fake_serpbear.failures},
+        "serp": {"requests": fake_serp.requests, "rate_limited": fake_serp.rate_limited}
+    }
+    return result
+
+def main():
+    args = parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    result = asyncio.run(run_remote(args) if args.url else run_in_process(args))
+    if result["breaking_point_sessions"] is not None:
+        print(f"Breaking point: {result['breaking_point_sessions']} sessions "
+              f"(error rate > {args.max_error_rate:.0%} or p95 > {args.max_p95}s)")
+    path = write_report("dashboard-load", vars(args), result, args.output)
+    print(f"Report written to {path}")
+
+if __name__ == "__main__":
+    main()
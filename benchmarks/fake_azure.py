@@ -0,0 +1,224 @@
+# ================================
+# benchmarks/fake_azure.py - Local Stand-in for Azure OpenAI Chat Completions
+# ================================
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+from aiohttp import web
+from app.models.agent_schemas import AGENT_SCHEMAS
+
+_HEADLINE_RE = re.compile(r'"headline":"((?:[^"\\]|\\.)*)"')
+_TARGET_KEYWORDS_RE = re.compile(r"TARGET KEYWORDS: (.*)")
+ARTICLE = ("# Wat betekent de renteverhoging voor uw hypotheek?\n\n"
+           + "ING legt uit wat de nieuwe ECB-rente betekent voor uw maandlasten. " * 40)
+
+@dataclass
+class FakeAzureConfig:
+    latency: float = 0.3  # seconds before the first token
+    tokens_per_second: float = 80.0  # completion generation rate
+    rate_limit_fraction: float = 0.0  # share of requests answered with 429
+    retry_after_ms: int = 500
+    relevant_fraction: float = 0.3  # share of scanned articles scored above threshold
+    malformed_fraction: float = 0.0  # share of JSON answers wrapped in prose and markdown fences
+    seed: int = 7
+
+@dataclass
+class FakeAzureStats:
+    requests: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    by_agent: Dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "by_agent": dict(self.by_agent)
+        }
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def _shape(value: Any, schema: Dict, prompt: str) -> Any:
+    """Top-level fields a real model could return: declared by the schema or named in the prompt"""
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        return {key: field_value for key, field_value in value.items() if key in properties or key in prompt}
+    if isinstance(value, list):
+        return [_shape(item, schema.get("items", {}), prompt) for item in value]
+    return value
+
+class FakeAzureOpenAI:
+    """aiohttp app answering chat completions with canned JSON shaped like each agent's schema"""
+
+    def __init__(self, config: FakeAzureConfig = None):
+        self.config = config or FakeAzureConfig()
+        self.stats = FakeAzureStats()
+        self._random = random.Random(self.config.seed)
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post("/openai/deployments/{deployment}/chat/completions", self.chat_completions)
+        return app
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        agent = request.headers.get("X-Agent-Name", "unknown")
+        deployment = request.match_info["deployment"]
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+
+        self.stats.requests += 1
+        self.stats.by_agent[agent] = self.stats.by_agent.get(agent, 0) + 1
+
+        if self._random.random() < self.config.rate_limit_fraction:
+            self.stats.rate_limited += 1
+            return web.json_response(
+                {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                status=429,
+                headers={"retry-after-ms": str(self.config.retry_after_ms)}
+            )
+
+        if body.get("stream") and agent == "content_optimizer":
+            content = ARTICLE
+        else:
+            schema_name = self._schema_name(agent, body, prompt)
+            content = json.dumps(_shape(
+                self._canned_response(schema_name, prompt), AGENT_SCHEMAS.get(schema_name, {}), prompt
+            ))
+            if self._random.random() < self.config.malformed_fraction:
+                content = f"Here is the analysis you asked for:\n```json\n{content}\n```\nLet me know if you need more."
+        prompt_tokens = _estimate_tokens(prompt)
+        completion_tokens = min(_estimate_tokens(content), body.get("max_tokens") or 4096)
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.completion_tokens += completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+
+        await asyncio.sleep(self.config.latency)
+        if body.get("stream"):
+            return await self._stream(request, deployment, content, usage)
+
+        await asyncio.sleep(completion_tokens / self.config.tokens_per_second)
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": deployment,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": usage
+        })
+
+    async def _stream(self, request: web.Request, deployment: str, content: str, usage: Dict) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        async def send(choices: List[Dict], extra: Dict = None):
+            payload = {"id": chunk_id, "object": "chat.completion.chunk", "created": created,
+                       "model": deployment, "choices": choices, **(extra or {})}
+            await response.write(f"data: {json.dumps(payload)}\n\n".encode())
+
+        # Roughly one token per four characters, paced at the configured rate
+        for start in range(0, len(content), 16):
+            await send([{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}])
+            await asyncio.sleep(4 / self.config.tokens_per_second)
+        await send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        await send([], {"usage": usage})
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    @staticmethod
+    def _schema_name(agent: str, body: Dict, prompt: str) -> str:
+        """Schema the gateway validates this call against (agents with two calls are told apart by prompt)"""
+        json_schema = (body.get("response_format") or {}).get("json_schema") or {}
+        if json_schema.get("name"):
+            return json_schema["name"]
+        if agent == "content_evaluator" and _TARGET_KEYWORDS_RE.search(prompt):
+            return "inclusion_prediction"
+        return agent
+
+    def _canned_response(self, agent: str, prompt: str) -> Any:
+        """Superset of plausible fields per schema; _shape trims it to what the prompt asks for"""
+        if agent == "news_scanner":
+            articles = []
+            for headline in _HEADLINE_RE.findall(prompt):
+                relevant = self._random.random() < self.config.relevant_fraction
+                articles.append({
+                    "headline": json.loads(f'"{headline}"'),
+                    "summary": "Relevant for ING mortgage and savings customers",
+                    "relevance_score": self._random.randint(70, 95) if relevant else self._random.randint(10, 50),
+                    "seo_opportunity": self._random.randint(40, 90),
+                    "urgency_level": self._random.choice(["urgent", "high", "medium", "low"]),
+                    "target_keywords": ["mortgage rates", "savings interest"],
+                    "content_angle": "Explain the impact on monthly costs",
+                    "customer_impact": "Higher mortgage payments for variable-rate customers"
+                })
+            return articles
+
+        if agent == "intent_extractor":
+            return {"extracted_intents": [{
+                "news_headline": "ECB raises rates",
+                "primary_intent": "How do higher rates affect my mortgage",
+                "sub_intents": [{"intent": "Will my mortgage payment go up", "search_volume_estimate": "high",
+                                 "competition_level": "medium", "customer_journey_stage": "awareness",
+                                 "ing_opportunity": "Rate impact calculator"}],
+                "target_keywords": ["mortgage rates", "ecb rate"],
+                "content_priority": 85
+            }]}
+
+        if agent == "competitive_analyzer":
+            return [{
+                "potential_headline": f"What the ECB decision means for your mortgage ({i})",
+                "urgency_score": self._random.randint(50, 95),
+                "target_keywords": ["mortgage rates"],
+                "recommended_angle": "Practical monthly-cost examples",
+                "competitor_weakness": "Competitors only repeat the press release",
+                "traffic_potential": "high"
+            } for i in range(3)]
+
+        if agent == "content_evaluator":
+            return {
+                "overall_inclusion_probability": self._random.randint(40, 95),
+                "reasoning": "Content covers the main intent but misses sub-intents",
+                "strengths": ["Authoritative source"], "weaknesses": ["No FAQ section"],
+                "optimization_recommendations": [], "competitor_comparison": {},
+                "confidence_level": 80
+            }
+
+        if agent == "inclusion_prediction":
+            target_keywords = _TARGET_KEYWORDS_RE.search(prompt)
+            keywords = [k.strip() for k in target_keywords.group(1).split(",") if k.strip()] if target_keywords else []
+            return {
+                "overall_inclusion_probability": self._random.randint(40, 95),
+                "strengths": ["Authoritative source"], "weaknesses": ["No FAQ section"],
+                "confidence_level": "high",
+                "keywords": {
+                    keyword: {"inclusion_probability": self._random.randint(40, 95), "confidence_level": "high"}
+                    for keyword in keywords
+                }
+            }
+
+        if agent == "content_optimizer":
+            return {
+                "optimized_content": {"title": "Hypotheekrente stijgt: wat nu?", "introduction": "...",
+                                      "main_sections": [], "conclusion": "...", "call_to_action": "..."},
+                "optimization_notes": {"changes_made": ["Added FAQ"]},
+                "expected_improvements": {"ai_overview_probability_increase": "+20%"}
+            }
+
+        if agent == "brand_enforcer":
+            return {"brand_compliance_score": 88, "compliance_details": {}, "compliance_issues": [],
+                    "brand_enhancements": [], "approved_for_publication": True, "revision_notes": ""}
+
+        return {"ok": True}
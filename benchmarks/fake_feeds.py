@@ -0,0 +1,89 @@
+# ================================
+# benchmarks/fake_feeds.py - Synthetic RSS Feeds for Offline Runs
+# ================================
+
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import List
+from xml.sax.saxutils import escape
+from aiohttp import web
+
+TOPICS = [
+    "ECB raises interest rate", "Dutch housing market cools", "DNB warns on mortgage debt",
+    "Savings rates climb at Dutch banks", "Phishing wave targets mobile banking users",
+    "Inflation eases in the eurozone", "Pension reform enters next phase", "AFM fines payment provider",
+    "Tech stocks rally", "Oil prices slip", "Football club reports record revenue",
+    "Sustainable finance rules tightened", "Consumer credit demand rises", "Retail sales flat in March"
+]
+
+@dataclass
+class FakeFeedConfig:
+    feeds: int = 6
+    items_per_feed: int = 30
+    churn: int = 0  # new items appearing per feed on every poll
+    duplicate_fraction: float = 0.3  # share of items that are the same story as another feed's item
+    seed: int = 11
+
+class FakeFeedServer:
+    """Serves `feeds` RSS documents with stable IDs, ETags and optional churn between polls"""
+
+    def __init__(self, config: FakeFeedConfig = None):
+        self.config = config or FakeFeedConfig()
+        self.polls = {i: 0 for i in range(self.config.feeds)}
+        self.requests = 0
+        self.not_modified = 0
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/feeds/{index}.xml", self.feed)
+        return app
+
+    def feed_urls(self, base_url: str) -> dict:
+        return {f"fake_feed_{i}": f"{base_url}/feeds/{i}.xml" for i in range(self.config.feeds)}
+
+    async def feed(self, request: web.Request) -> web.Response:
+        index = int(request.match_info["index"])
+        self.requests += 1
+        offset = self.polls[index] * self.config.churn
+        self.polls[index] += 1
+
+        document = self._render(index, offset)
+        etag = '"' + hashlib.sha1(document.encode()).hexdigest()[:16] + '"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=document, content_type="application/rss+xml", headers={"ETag": etag})
+
+    def _items(self, index: int, offset: int) -> List[dict]:
+        rng = random.Random(self.config.seed)
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        items = []
+        for n in range(offset, offset + self.config.items_per_feed):
+            item_rng = random.Random(hash((self.config.seed, index, n)))
+            # Duplicated stories share a topic and wording with feed 0's item n
+            story_feed = 0 if item_rng.random() < self.config.duplicate_fraction else index
+            story_rng = random.Random(hash((self.config.seed, story_feed, n)))
+            topic = story_rng.choice(TOPICS)
+            detail = " ".join(story_rng.choice(TOPICS).lower().split()[-1] for _ in range(3))
+            items.append({
+                "guid": f"feed{index}-item{n}",
+                "title": f"{topic}: {detail}",
+                "summary": f"<p>{topic}. Analysts say {detail} as markets react across Europe.</p>",
+                "link": f"https://example.test/{index}/{n}",
+                "published": format_datetime(now + timedelta(minutes=n + rng.random()))
+            })
+        return items
+
+    def _render(self, index: int, offset: int) -> str:
+        entries = "".join(
+            f"<item><guid>{item['guid']}</guid><title>{escape(item['title'])}</title>"
+            f"<description>{escape(item['summary'])}</description><link>{item['link']}</link>"
+            f"<pubDate>{item['published']}</pubDate></item>"
+            for item in self._items(index, offset)
+        )
+        return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f"<title>Fake feed {index}</title><link>https://example.test/{index}</link>"
+                f"<description>Synthetic benchmark feed</description>{entries}</channel></rss>")
@@ -0,0 +1,70 @@
+# ================================
+# benchmarks/fake_serp.py - Local Fixture Server for Saved SERP Pages
+# ================================
+
+import asyncio
+import random
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "serp"
+
+def load_pages(directory: Path = FIXTURES_DIR) -> Dict[str, str]:
+    """Saved results pages by file stem (the slug of the query they were saved for)"""
+    return {path.stem: path.read_text(encoding="utf-8") for path in sorted(Path(directory).glob("*.html"))}
+
+def slug(keyword: str) -> str:
+    return "-".join(keyword.lower().split())
+
+@dataclass
+class FakeSerpConfig:
+    latency: float = 0.1  # seconds per page
+    rate_limit_fraction: float = 0.0  # share of requests answered with 429 + Retry-After
+    retry_after: int = 1
+    fixtures_dir: Path = FIXTURES_DIR
+    seed: int = 11
+
+class FakeSerpServer:
+    """aiohttp app answering GET /search?q= with saved pages; unknown queries map to a page by hash"""
+
+    def __init__(self, config: FakeSerpConfig = None):
+        self.config = config or FakeSerpConfig()
+        self.pages = load_pages(self.config.fixtures_dir)
+        self._names = sorted(self.pages)
+        self._random = random.Random(self.config.seed)
+        self.requests = 0
+        self.rate_limited = 0
+        self.request_times: List[float] = []
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/search", self.search)
+        return app
+
+    def page_for(self, keyword: str) -> str:
+        name = slug(keyword)
+        if name not in self.pages:
+            name = self._names[zlib.crc32(name.encode()) % len(self._names)]
+        return self.pages[name]
+
+    async def search(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.request_times.append(time.monotonic())
+        await asyncio.sleep(self.config.latency)
+        if self._random.random() < self.config.rate_limit_fraction:
+            self.rate_limited += 1
+            return web.Response(status=429, headers={"Retry-After": str(self.config.retry_after)})
+        return web.Response(text=self.page_for(request.query.get("q", "")), content_type="text/html")
+
+    def peak_rate(self, window: float = 1.0) -> int:
+        """Most requests seen within any `window` seconds, to check politeness limits"""
+        peak, start = 0, 0
+        for end, at in enumerate(self.request_times):
+            while at - self.request_times[start] > window:
+                start += 1
+            peak = max(peak, end - start + 1)
+        return peak
@@ -0,0 +1,86 @@
+# ================================
+# benchmarks/fake_serpbear.py - Local Stand-in for the SerpBear Keywords API
+# ================================
+
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+from aiohttp import web
+
+KEYWORDS = [
+    "mortgage rates", "digital banking", "savings interest", "investment options", "ecb rate decision",
+    "mortgage calculator", "green mortgage", "sustainable investing", "mobile banking app", "phishing banking",
+    "fixed rate mortgage", "variable rate mortgage", "pension savings", "first home buyer", "credit card fees"
+]
+
+@dataclass
+class FakeSerpBearConfig:
+    latency: float = 0.05  # seconds per response
+    keywords: int = 15
+    history_days: int = 30
+    failure_fraction: float = 0.0  # share of requests answered with 500
+    position_churn: float = 0.0  # share of keywords whose position moves on each request
+    hang: bool = False  # never answer, to exercise client timeouts
+    api_key: str = "benchmark"
+    domain: str = "ing.nl"
+    seed: int = 5
+
+class FakeSerpBear:
+    """aiohttp app serving GET /api/keywords in SerpBear's response shape"""
+
+    def __init__(self, config: FakeSerpBearConfig = None):
+        self.config = config or FakeSerpBearConfig()
+        self._random = random.Random(self.config.seed)
+        self.requests = 0
+        self.failures = 0
+        self.unauthorized = 0
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/keywords", self.keywords)
+        return app
+
+    async def keywords(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if request.headers.get("Authorization") != f"Bearer {self.config.api_key}":
+            self.unauthorized += 1
+            return web.json_response({"error": "Not authorized"}, status=401)
+        if self.config.hang:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(self.config.latency)
+        if self._random.random() < self.config.failure_fraction:
+            self.failures += 1
+            return web.json_response({"error": "Error loading keywords"}, status=500)
+        domain = request.query.get("domain", self.config.domain)
+        return web.json_response({"keywords": self._records(domain)})
+
+    def _records(self, domain: str) -> List[Dict]:
+        today = date(2025, 1, 31)
+        records = []
+        for i in range(self.config.keywords):
+            keyword = KEYWORDS[i % len(KEYWORDS)] + ("" if i < len(KEYWORDS) else f" {i // len(KEYWORDS)}")
+            rng = random.Random(hash((self.config.seed, keyword)))
+            position = rng.randint(1, 40)
+            history = {}
+            for day in range(self.config.history_days, 0, -1):
+                position = max(1, min(100, position + rng.randint(-2, 2)))
+                history[(today - timedelta(days=day)).isoformat()] = position
+            churn_rng = random.Random(hash((self.config.seed, keyword, self.requests)))
+            if churn_rng.random() < self.config.position_churn:
+                position = max(1, min(100, position + churn_rng.randint(-6, 6)))
+            records.append({
+                "ID": i + 1,
+                "keyword": keyword,
+                "device": "desktop",
+                "country": "NL",
+                "domain": domain,
+                "position": position,
+                "history": history,
+                "url": f"https://www.{domain}/{keyword.replace(' ', '-')}",
+                "tags": [],
+                "lastUpdated": today.isoformat(),
+                "volume": rng.choice([90, 320, 880, 1900, 4400, 12100])
+            })
+        return records
@@ -0,0 +1,75 @@
+# ================================
+# benchmarks/keyword_ranking.py - Keyword Prioritization Throughput
+# ================================
+
+"""
+Times KeywordRanker over a synthetic SerpBear portfolio.
+
+    python -m benchmarks.keyword_ranking --keywords 50000 --repeat 5
+"""
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+import numpy as np
+from benchmarks.common import configure_app_environment, latency_summary, write_report
+
+def synthetic_records(count: int, history_days: int, seed: int) -> List[Dict]:
+    """SerpBear-shaped keyword records with random-walk position histories"""
+    rng = np.random.default_rng(seed)
+    start = rng.integers(1, 60, count)
+    steps = rng.integers(-2, 3, (count, history_days)).cumsum(axis=1)
+    positions = np.clip(start[:, None] + steps, 0, 100)
+    volumes = rng.choice([0, 90, 320, 880, 1900, 4400, 12100], count)
+    days = [(date(2025, 1, 31) - timedelta(days=d)).isoformat() for d in range(history_days, 0, -1)]
+    return [{
+        "keyword": f"keyword {i}",
+        "position": int(positions[i, -1]),
+        "history": dict(zip(days, positions[i].tolist())),
+        "volume": int(volumes[i]),
+        "url": f"https://www.ing.nl/keyword-{i}"
+    } for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword ranking throughput")
+    parser.add_argument("--keywords", type=int, default=50000)
+    parser.add_argument("--history-days", type=int, default=30)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="report path (default benchmarks/results/...)")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+
+    configure_app_environment({})
+    from app.services.keyword_ranker import KeywordRanker
+
+    records = synthetic_records(args.keywords, args.history_days, args.seed)
+    ranker = KeywordRanker()
+    build, score, total = [], [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        table = ranker.build_table(records)
+        built = time.perf_counter()
+        ranked = ranker.score(table).nlargest(args.top_n, "priority_score")
+        finished = time.perf_counter()
+        build.append(built - started)
+        score.append(finished - built)
+        total.append(finished - started)
+
+    scenarios = {
+        "build_table": latency_summary(build, 0, sum(build)),
+        "score_and_select": latency_summary(score, 0, sum(score)),
+        "rank_total": latency_summary(total, 0, sum(total))
+    }
+    for name, summary in scenarios.items():
+        print(f"{name:<18} p50={summary['latency_p50_s']}s max={summary['latency_max_s']}s")
+    print(ranked[["keyword", "position", "previous_position", "volume", "priority_score"]].to_string(index=False))
+    path = write_report("keyword-ranking", vars(args), scenarios, args.output)
+    print(f"Report written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# ================================
+# benchmarks/run_benchmarks.py - Offline End-to-End Benchmarks
+# ================================
+
+"""
+Runs the three LangGraph workflows and the dashboard routes against a local fake
+Azure OpenAI endpoint, fake SerpBear, saved SERP pages and synthetic RSS feeds, then
+writes a JSON report.
+
+    python -m benchmarks.run_benchmarks --iterations 5 --concurrency 8
+    python -m benchmarks.compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+from benchmarks.common import configure_app_environment, latency_summary, start_site, write_report
+from benchmarks.fake_azure import FakeAzureConfig, FakeAzureOpenAI
+from benchmarks.fake_feeds import FakeFeedConfig, FakeFeedServer
+from benchmarks.fake_serp import FakeSerpConfig, FakeSerpServer
+from benchmarks.fake_serpbear import FakeSerpBear, FakeSerpBearConfig
+
+ROUTES = [
+    "/api/news-intelligence",
+    "/api/geo-optimization",
+    "/api/competitive-alerts",
+    "/api/dashboard-metrics",
+    "/api/cache-stats"
+]
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline workflow and route benchmarks")
+    parser.add_argument("--iterations", type=int, default=5, help="runs per workflow scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients for route load")
+    parser.add_argument("--route-requests", type=int, default=200, help="total route requests")
+    parser.add_argument("--feeds", type=int, default=6)
+    parser.add_argument("--items-per-feed", type=int, default=30)
+    parser.add_argument("--feed-churn", type=int, default=5, help="new items per feed per poll")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake Azure time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--rate-limit-fraction", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--malformed-fraction", type=float, default=0.0, help="share of fenced/prose JSON answers")
+    parser.add_argument("--serpbear-latency", type=float, default=0.2, help="fake SerpBear response time (s)")
+    parser.add_argument("--serp-latency", type=float, default=0.1, help="fixture SERP page response time (s)")
+    parser.add_argument("--keywords", default="mortgage rates,digital banking,savings interest")
+    parser.add_argument("--scenarios", default="news,geo,content,serpbear,routes")
+    parser.add_argument("--output", help="report path (default benchmarks/results/...)")
+    return parser.parse_args()
+
+async def measure(runs: int, concurrency: int, call: Callable[[int], Awaitable]) -> Dict:
+    """Run `call(i)` `runs` times with bounded concurrency and summarize latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(i)
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    summary = latency_summary(latencies, len(errors), time.perf_counter() - started)
+    if errors:
+        summary["sample_errors"] = sorted(set(errors))[:5]
+    return summary
+
+def llm_delta(before: Dict, after: Dict) -> Dict:
+    return {
+        "llm_requests": after["requests"] - before["requests"],
+        "llm_rate_limited": after["rate_limited"] - before["rate_limited"],
+        "prompt_tokens": after["prompt_tokens"] - before["prompt_tokens"],
+        "completion_tokens": after["completion_tokens"] - before["completion_tokens"]
+    }
+
+async def run(args: argparse.Namespace) -> Dict:
+    fake_azure = FakeAzureOpenAI(FakeAzureConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_fraction=args.rate_limit_fraction,
+        malformed_fraction=args.malformed_fraction
+    ))
+    fake_feeds = FakeFeedServer(FakeFeedConfig(
+        feeds=args.feeds, items_per_feed=args.items_per_feed, churn=args.feed_churn
+    ))
+    fake_serpbear = FakeSerpBear(FakeSerpBearConfig(latency=args.serpbear_latency))
+    azure_runner, azure_url = await start_site(fake_azure.build_app())
+    feeds_runner, feeds_url = await start_site(fake_feeds.build_app())
+    serpbear_runner, serpbear_url = await start_site(fake_serpbear.build_app())
+    fake_serp = FakeSerpServer(FakeSerpConfig(latency=args.serp_latency))
+    serp_runner, serp_url = await start_site(fake_serp.build_app())
+
+    workdir = tempfile.mkdtemp(prefix="ing-bench-")
+    configure_app_environment({
+        "AZURE_OPENAI_ENDPOINT": azure_url,
+        "AZURE_OPENAI_API_KEY": "benchmark",
+        "SERPBEAR_BASE_URL": serpbear_url,
+        "SERPBEAR_API_KEY": fake_serpbear.config.api_key,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "CHECKPOINT_DB_PATH": f"{workdir}/checkpoints.db",
+        "RANKING_STORE_PATH": f"{workdir}/rankings.log",
+        "GEO_RESULT_STORE_PATH": f"{workdir}/geo_results.json",
+        "SERP_SEARCH_URL": f"{serp_url}/search",
+        "SERP_CACHE_DIR": f"{workdir}/serp_cache",
+        "SERP_HOST_RATE": "50",
+        "ENABLE_BACKGROUND_SCHEDULER": "false",
+        "AZURE_ENABLE_HTTP2": "false"
+    })
+
+    # Imported late so module-level settings pick up the environment above
+    import httpx
+    from app import main
+
+    main.rss_service.rss_sources = fake_feeds.feed_urls(feeds_url)
+    await main.startup_services()
+
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    selected = set(args.scenarios.split(","))
+    scenarios = {}
+
+    async def scenario(name: str, runs: int, concurrency: int, call: Callable[[int], Awaitable]):
+        before = fake_azure.stats.snapshot()
+        summary = await measure(runs, concurrency, call)
+        summary.update(llm_delta(before, fake_azure.stats.snapshot()))
+        scenarios[name] = summary
+        print(f"{name:<18} p50={summary.get('latency_p50_s', '-')}s p95={summary.get('latency_p95_s', '-')}s "
+              f"errors={summary['errors']} llm_requests={summary['llm_requests']}")
+
+    try:
+        if "news" in selected:
+            async def news_run(i: int):
+                articles = await main.rss_service.fetch_all_feeds()
+                stories = main.story_clusterer.cluster(articles)
+                # Bypass the single-flight cache so every iteration runs the pipeline
+                main.news_workflow.result_cache.invalidate()
+                await main.news_workflow.analyze_news_opportunities({
+                    "rss_articles": stories,
+                    "tracked_keywords": keywords,
+                    "timestamp": f"bench-{i}"
+                })
+            await scenario("news_workflow", args.iterations, 1, news_run)
+
+        if "geo" in selected:
+            async def geo_run(i: int, reuse: bool = False):
+                if not reuse:
+                    # Forget stored outcomes so every iteration runs the full pipeline
+                    main.geo_result_store.invalidate()
+                result = await main.geo_workflow.optimize_for_ai_overview({
+                    "target_keywords": keywords,
+                    "timestamp": f"bench-{i}",
+                    "workflow_id": f"bench-geo-{i}"
+                })
+                if result["failed_keywords"]:
+                    raise RuntimeError(f"failed keywords: {result['failed_keywords']}")
+            await scenario("geo_workflow", args.iterations, 1, geo_run)
+            # Same SERPs again: every keyword should be skipped as unchanged
+            await scenario("geo_unchanged", args.iterations, 1, lambda i: geo_run(i, reuse=True))
+            scenarios["geo_unchanged"]["serp_pages"] = main.serp_service.get_stats()
+
+        if "content" in selected:
+            async def content_run(i: int):
+                await main.content_workflow.generate_optimized_article({
+                    "opportunity_id": f"bench-{i}",
+                    "timestamp": f"bench-{i}"
+                })
+            await scenario("content_workflow", args.iterations, 1, content_run)
+
+        if "serpbear" in selected:
+            main.serpbear_service.invalidate()
+            async def serpbear_run(i: int):
+                await main.serpbear_service.get_tracked_keywords()
+            # A cold burst: every caller should share one upstream request
+            await scenario("serpbear_keywords", args.route_requests, args.concurrency, serpbear_run)
+            scenarios["serpbear_keywords"]["upstream_requests"] = fake_serpbear.requests
+
+        if "routes" in selected:
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                async def route_run(i: int):
+                    response = await client.get(ROUTES[i % len(ROUTES)])
+                    response.raise_for_status()
+                await scenario("routes", args.route_requests, args.concurrency, route_run)
+    finally:
+        await main.shutdown_services()
+        await azure_runner.cleanup()
+        await feeds_runner.cleanup()
+        await serpbear_runner.cleanup()
+        await serp_runner.cleanup()
+
+    scenarios["fake_services"] = {
+        "azure": fake_azure.stats.snapshot(),
+        "feeds": {"requests": fake_feeds.requests, "not_modified": fake_feeds.not_modified},
+        "serpbear": {"requests": fake_serpbear.requests, "failures": fake_serpbear.failures},
+        "serp": {"requests": fake_serp.requests, "rate_limited": fake_serp.rate_limited}
+    }
+    return scenarios
+
+def main():
+    args = parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    scenarios = asyncio.run(run(args))
+    path = write_report("workflows", vars(args), scenarios, args.output)
+    print(f"Report written to {path}")
+
+if __name__ == "__main__":
+    main()
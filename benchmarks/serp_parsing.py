@@ -0,0 +1,133 @@
+# ================================
+# benchmarks/serp_parsing.py - SERP Parsing and Fetching Throughput
+# ================================
+
+"""
+Parses saved results pages in a tight loop (pages parsed per second), then fetches
+synthetic keywords through SerpService from the local fixture server, cold and from
+the on-disk page cache.
+
+    python -m benchmarks.serp_parsing --repeat 200
+    python -m benchmarks.serp_parsing --pages path/to/saved/serps --keywords 40 --host-rate 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+from benchmarks.common import configure_app_environment, latency_summary, start_site, write_report
+from benchmarks.fake_serp import FIXTURES_DIR, FakeSerpConfig, FakeSerpServer, load_pages
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SERP parsing and fetching throughput")
+    parser.add_argument("--pages", default=str(FIXTURES_DIR), help="directory of saved .html results pages")
+    parser.add_argument("--repeat", type=int, default=200, help="parses per page")
+    parser.add_argument("--keywords", type=int, default=30, help="keywords fetched through SerpService")
+    parser.add_argument("--latency", type=float, default=0.05, help="fixture server time per page (s)")
+    parser.add_argument("--rate-limit-fraction", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--host-rate", type=float, default=10.0, help="SerpService requests/s per host")
+    parser.add_argument("--concurrency", type=int, default=4, help="SerpService concurrent downloads")
+    parser.add_argument("--output", help="report path (default benchmarks/results/...)")
+    return parser.parse_args()
+
+def parse_throughput(pages: Dict[str, str], repeat: int) -> Dict:
+    from app.utils.serp_parser import parse_serp
+
+    latencies = []
+    records = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in pages.items():
+            page_started = time.perf_counter()
+            result = parse_serp(html, name)
+            latencies.append(time.perf_counter() - page_started)
+            records += len(result["organic_results"]) + len(result["ai_overview"].get("sources", []))
+    wall_time = time.perf_counter() - started
+
+    summary = latency_summary(latencies, 0, wall_time)
+    page_bytes = sum(len(html.encode("utf-8")) for html in pages.values()) * repeat
+    summary.update({
+        "pages_per_second": round(len(latencies) / wall_time, 1),
+        "mb_per_second": round(page_bytes / wall_time / 1e6, 2),
+        "records_per_page": round(records / len(latencies), 1)
+    })
+    return summary
+
+async def fetch_throughput(args: argparse.Namespace, workdir: str) -> Dict:
+    fake = FakeSerpServer(FakeSerpConfig(
+        latency=args.latency, rate_limit_fraction=args.rate_limit_fraction, fixtures_dir=Path(args.pages)
+    ))
+    runner, url = await start_site(fake.build_app())
+    from app.config.settings import DashboardSettings
+    from app.services.serp_service import SerpService
+
+    settings = DashboardSettings(
+        serp_search_url=f"{url}/search",
+        serp_cache_dir=f"{workdir}/serp_cache",
+        serp_host_rate=args.host_rate,
+        serp_concurrency=args.concurrency
+    )
+    service = SerpService(settings)
+    keywords = [f"keyword {i}" for i in range(args.keywords)]
+    scenarios = {}
+    try:
+        await service.start()
+        for name in ("cold_fetch", "page_cache"):
+            service.invalidate()
+            latencies, errors = [], []
+
+            async def one(keyword: str):
+                started = time.perf_counter()
+                try:
+                    await service.fetch_serp(keyword)
+                    latencies.append(time.perf_counter() - started)
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+
+            requests_before = fake.requests
+            started = time.perf_counter()
+            await asyncio.gather(*(one(keyword) for keyword in keywords))
+            summary = latency_summary(latencies, len(errors), time.perf_counter() - started)
+            summary["upstream_requests"] = fake.requests - requests_before
+            if errors:
+                summary["sample_errors"] = sorted(set(errors))[:5]
+            scenarios[name] = summary
+        scenarios["cold_fetch"]["peak_requests_per_second"] = fake.peak_rate()
+        scenarios["service_stats"] = service.get_stats()
+    finally:
+        await service.close()
+        await runner.cleanup()
+    return scenarios
+
+def main():
+    args = parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    args.pages = os.path.abspath(args.pages)
+
+    configure_app_environment({})
+    pages = load_pages(Path(args.pages))
+    if not pages:
+        raise SystemExit(f"No .html pages in {args.pages}")
+
+    scenarios = {"parse": parse_throughput(pages, args.repeat)}
+    workdir = tempfile.mkdtemp(prefix="ing-serp-")
+    scenarios.update(asyncio.run(fetch_throughput(args, workdir)))
+
+    parse = scenarios["parse"]
+    print(f"parse              {parse['pages_per_second']} pages/s {parse['mb_per_second']} MB/s "
+          f"p50={parse['latency_p50_s']}s records/page={parse['records_per_page']}")
+    for name in ("cold_fetch", "page_cache"):
+        summary = scenarios[name]
+        print(f"{name:<18} {summary['throughput_rps']} pages/s p95={summary.get('latency_p95_s', '-')}s "
+              f"errors={summary['errors']} upstream={summary['upstream_requests']}")
+    print(f"peak upstream rate {scenarios['cold_fetch']['peak_requests_per_second']}/s "
+          f"(limit {args.host_rate}/s plus a burst of {scenarios['service_stats']['host_burst']})")
+    path = write_report("serp-parsing", vars(args), scenarios, args.output)
+    print(f"Report written to {path}")
+
+if __name__ == "__main__":
+    main()
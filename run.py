@@ -45,10 +45,12 @@ async def test_azure_connection():
         
         # Simple test call
         response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=azure_config.get_model_for_agent("test"),
             messages=[{"role": "user", "content": "Hello"}],
             max_tokens=10
         )
+        # The shared client is bound to this event loop
+        await AzureAIConfig.close_clients()
         
         print("✅ Azure AI Foundry connection successful!")
         return True
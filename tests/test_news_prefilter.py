@@ -0,0 +1,57 @@
+# ================================
+# tests/test_news_prefilter.py - News Pre-filter Cutoff
+# ================================
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import DashboardSettings
+from app.services.news_prefilter import NewsPrefilter
+
+TRACKED_KEYWORDS = ["hypotheek rente", "ecb rente", "sparen"]
+
+def _dominant_story_batch():
+    relevant = [
+        {
+            "id": f"ecb-{i}",
+            "headline": f"ECB decision weighs on mortgage lenders ({i})",
+            "summary": "Lenders expect cheaper mortgage offers after the ECB meeting this week."
+        }
+        for i in range(40)
+    ]
+    unrelated = [
+        {"id": f"other-{i}", "headline": f"Local football club wins derby ({i})",
+         "summary": "The match ended after extra time."}
+        for i in range(5)
+    ]
+    return relevant, unrelated
+
+def test_single_dominant_story_still_reaches_llm():
+    prefilter = NewsPrefilter(DashboardSettings())
+    relevant, unrelated = _dominant_story_batch()
+
+    kept = prefilter.filter(relevant + unrelated, TRACKED_KEYWORDS)
+    kept_ids = {article["id"] for article in kept}
+
+    assert {article["id"] for article in relevant} <= kept_ids
+    assert not kept_ids & {article["id"] for article in unrelated}
+
+def test_dominant_story_scores_above_cutoff():
+    settings = DashboardSettings()
+    relevant, unrelated = _dominant_story_batch()
+
+    scores = NewsPrefilter(settings).score(relevant + unrelated, TRACKED_KEYWORDS)
+
+    assert (scores[:len(relevant)] >= settings.news_prefilter_min_score).all()
+    assert (scores[len(relevant):] == 0).all()
+
+def test_min_candidates_forwarded_below_cutoff():
+    settings = DashboardSettings(news_prefilter_min_score=1000.0, news_prefilter_min_candidates=3)
+    relevant, unrelated = _dominant_story_batch()
+
+    kept = NewsPrefilter(settings).filter(relevant + unrelated, TRACKED_KEYWORDS)
+
+    assert len(kept) == 3
+    assert all(article["id"].startswith("ecb-") for article in kept)